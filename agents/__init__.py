@@ -38,6 +38,10 @@ class ResumeAnalysisAgent(ResumeAnalyzer):
         """Delegate to interview agent."""
         return self.interview_agent.ask_question(question, chat_history)
     
+    def ask_question_stream(self, question, chat_history=None):
+        """Delegate to interview agent."""
+        return self.interview_agent.ask_question_stream(question, chat_history)
+    
     def answer_interview_question(self, question: str) -> str:
         """Delegate to interview agent."""
         return self.interview_agent.answer_interview_question(question)
@@ -50,15 +54,37 @@ class ResumeAnalysisAgent(ResumeAnalyzer):
         """Delegate to improver agent."""
         return self.improver_agent.improve_resume(improvement_areas, target_role)
     
+    def improve_resume_stream(self, improvement_areas, target_role="", result=None):
+        """Delegate to improver agent."""
+        return self.improver_agent.improve_resume_stream(improvement_areas, target_role, result)
+    
     def get_improved_resume(self, target_role="", highlight_skills=""):
         """Delegate to improver agent."""
         return self.improver_agent.get_improved_resume(target_role, highlight_skills)
     
+    def get_improved_resume_stream(self, target_role="", highlight_skills=""):
+        """Delegate to improver agent."""
+        return self.improver_agent.get_improved_resume_stream(target_role, highlight_skills)
+    
     def generate_cover_letter(self, company: str, role: str, job_description: str = "", 
                             tone: str = "professional", length: str = "one-page") -> str:
         """Delegate to improver agent."""
         return self.improver_agent.generate_cover_letter(company, role, job_description, tone, length)
     
+    def generate_cover_letter_stream(self, company: str, role: str, job_description: str = "",
+                                     tone: str = "professional", length: str = "one-page"):
+        """Delegate to improver agent."""
+        return self.improver_agent.generate_cover_letter_stream(company, role, job_description, tone, length)
+    
+    def generate_cover_letter_variants(self, company: str, role: str, job_description: str = "",
+                                       tone: str = "professional", length: str = "one-page", n: int = 3) -> list:
+        """Delegate to improver agent."""
+        return self.improver_agent.generate_cover_letter_variants(company, role, job_description, tone, length, n)
+    
+    def get_improved_resume_variants(self, target_role="", highlight_skills="", n=2):
+        """Delegate to improver agent."""
+        return self.improver_agent.get_improved_resume_variants(target_role, highlight_skills, n)
+    
     def generate_updated_resume_latex(self, latex_source: str, job_description: str) -> str:
         """Delegate to improver agent."""
         return self.improver_agent.generate_updated_resume_latex(latex_source, job_description)
@@ -2,7 +2,37 @@
 
 import re
 import json
-from utils.text_utils import clamp_text
+
+from utils.request_packing import run_packed
+from utils.dispatcher import llm_priority
+from utils.model_cascade import json_object
+from utils.semantic_cache import get_semantic_cache, scope_key
+from utils.text_utils import compute_hash
+from agents.prompts import INTERVIEW_QUESTIONS, INTERVIEW_QUESTIONS_FILL
+
+# Token cap for prompts that are repeated once per interview question
+ANSWER_PROMPT_TOKENS = 800
+
+# Question keywords that add analysis insights to the Q&A prompt
+WEAKNESS_TRIGGERS = ('weakness', 'weak', 'missing', 'lack', 'improve', 'gap', 'need to add')
+STRENGTH_TRIGGERS = ('strength', 'strong', 'skill', 'technology', 'experience', 'good at')
+
+# Questions answered per packed call, and completion tokens reserved for each answer
+ANSWER_PACK_SIZE = 6
+ANSWER_TOKENS_PER_QUESTION = 220
+
+ANSWER_TASK = (
+    "You are a senior candidate crafting concise, strong answers to interview questions. "
+    "Use only the candidate's resume context (and JD if present). "
+    "Keep each answer specific, with impact/metrics where possible, 4-7 sentences max."
+)
+
+
+def _question_list(data) -> list:
+    """Question dicts from a `{"questions": [...]}` reply (bare lists are accepted too)."""
+    if isinstance(data, dict):
+        data = data.get("questions") or []
+    return [q for q in data if isinstance(q, dict)] if isinstance(data, list) else []
 
 
 class InterviewAgent:
@@ -22,6 +52,72 @@ class InterviewAgent:
         if not self.analyzer.resume_text:
             return "Please analyze a resume first."
         
+        cached, store = self._cached_answer(question, chat_history)
+        if cached is not None:
+            return cached
+        prompt = self._qa_prompt(question, chat_history)
+        answer = self.analyzer.llm_chat(messages=[{"role": "user", "content": prompt}], profile="long_form",
+                                        priority="interactive").strip()
+        store(answer)
+        return answer
+
+    def ask_question_stream(self, question, chat_history=None):
+        """Streaming variant of `ask_question` yielding answer tokens as they arrive."""
+        if not self.analyzer.resume_text:
+            yield "Please analyze a resume first."
+            return
+        
+        cached, store = self._cached_answer(question, chat_history)
+        if cached is not None:
+            yield cached
+            return
+        prompt = self._qa_prompt(question, chat_history)
+        chunks = []
+        for token in self.analyzer.llm_chat(messages=[{"role": "user", "content": prompt}], profile="long_form",
+                                            stream=True, priority="interactive"):
+            chunks.append(token)
+            yield token
+        store("".join(chunks).strip())
+
+    def _cached_answer(self, question, chat_history=None):
+        """Look up a near-duplicate question in the semantic cache.
+
+        Returns:
+            (cached answer or None, callable storing the fresh answer on a miss)
+        """
+        cache = get_semantic_cache()
+        if cache is None or not cache.cacheable(chat_history):
+            return None, lambda _answer: None
+
+        analyzer = self.analyzer
+        resume_hash = analyzer.resume_hash or compute_hash(analyzer.resume_text)
+        # Answers draw on the analysis and weaknesses too, so any change to them starts a new scope;
+        # so does the set of insights the prompt adds for this question
+        scope = scope_key(resume_hash, {
+            "model": analyzer.model,
+            "analysis": analyzer.analysis_result,
+            "weaknesses": getattr(analyzer, 'resume_weaknesses', None),
+        }, chat_history, kind="+".join(self._insight_kinds(question)))
+        try:
+            answer, vector = cache.get(resume_hash, scope, question, analyzer._get_embeddings().embed_query)
+        except Exception as e:
+            print(f"Semantic cache lookup failed: {e}")
+            return None, lambda _answer: None
+        return answer, lambda fresh: cache.put(resume_hash, scope, question, fresh, vector)
+
+    @staticmethod
+    def _insight_kinds(question):
+        """Which analysis insights ("weakness", "strength") the Q&A prompt adds for `question`."""
+        q = (question or "").lower()
+        kinds = []
+        if any(word in q for word in WEAKNESS_TRIGGERS):
+            kinds.append("weakness")
+        if any(word in q for word in STRENGTH_TRIGGERS):
+            kinds.append("strength")
+        return kinds
+
+    def _qa_prompt(self, question, chat_history=None):
+        """Build the resume Q&A prompt from RAG context, analysis results and chat history."""
         chat_history = chat_history or []
         
         # Lazily build RAG store on first use
@@ -42,14 +138,14 @@ class InterviewAgent:
             except Exception:
                 pass
         
-        # If no context from RAG or context is too short, use full resume (clamped)
+        # If no context from RAG or context is too short, use full resume (trimmed to budget below)
         if not context or len(context) < 100:
-            context = clamp_text(self.analyzer.resume_text, 2500)
-        else:
-            context = clamp_text(context, 2500)
+            context = self.analyzer.resume_text
         
+        insights = ""
+        kinds = self._insight_kinds(question)
         # Check if asking about weaknesses/analysis results
-        if any(word in question.lower() for word in ['weakness', 'weak', 'missing', 'lack', 'improve', 'gap', 'need to add']):
+        if "weakness" in kinds:
             weakness_info = ""
             if hasattr(self.analyzer, 'resume_weaknesses') and self.analyzer.resume_weaknesses:
                 weakness_info = "\n\nIdentified Weaknesses:\n"
@@ -61,10 +157,10 @@ class InterviewAgent:
                 if missing:
                     weakness_info += f"\nMissing Skills: {', '.join(missing[:10])}\n"
             
-            context += weakness_info
+            insights += weakness_info
         
         # Check if asking about strengths/skills
-        if any(word in question.lower() for word in ['strength', 'strong', 'skill', 'technology', 'experience', 'good at']):
+        if "strength" in kinds:
             strength_info = ""
             if hasattr(self.analyzer, 'analysis_result') and self.analyzer.analysis_result:
                 strengths = self.analyzer.analysis_result.get('strengths', [])
@@ -78,7 +174,7 @@ class InterviewAgent:
                     for skill, score in top_skills:
                         strength_info += f"- {skill}: {score}/10\n"
             
-            context += strength_info
+            insights += strength_info
         
         # Build conversation context from chat history
         conversation_context = ""
@@ -91,82 +187,122 @@ class InterviewAgent:
                 conversation_context += f"{role}: {msg['content']}\n"
             conversation_context += "\n"
         
-        prompt = (
+        instructions = (
             "You are a helpful AI assistant analyzing a resume. Answer the user's question based on the resume content and conversation history provided.\n"
             "Be conversational, friendly, and helpful. Provide specific details from the resume.\n"
             "Use the conversation history to understand context and give relevant follow-up answers.\n"
             "If referring to something mentioned earlier, acknowledge it naturally.\n"
             "If you greet the user (hi/hello), respond warmly and ask how you can help with the resume.\n\n"
+        )
+        fitted = self.analyzer.fit_prompt(
+            {"context": context, "history": conversation_context},
+            reserve_output=2000,
+            fixed_text=instructions + insights + question,
+            weights={"context": 2, "history": 1},
+        )
+        context = fitted["context"] + insights
+        conversation_context = fitted["history"]
+        
+        return (
+            instructions +
             f"Resume Content:\n{context}\n"
             f"{conversation_context}"
             f"Current Question: {question}\n\n"
             "Answer:"
         )
-        return self.analyzer.llm_chat(messages=[{"role": "user", "content": prompt}], max_tokens=2000).strip()
 
-    def answer_interview_question(self, question: str) -> str:
-        """Generate a best-fit model answer to an interview question."""
-        if not self.analyzer.resume_text:
-            return ""
-        
-        jd_context = self.analyzer.jd_text or ""
-        prompt = (
+    def _answer_prompt(self, question: str) -> str:
+        """Build the model-answer prompt for one interview question."""
+        # One prompt per question, so keep the shared context small
+        fitted = self.analyzer.fit_prompt(
+            {"resume": self.analyzer.resume_text, "jd": self.analyzer.jd_text},
+            fixed_text=question,
+            weights={"resume": 3, "jd": 2},
+            limit=ANSWER_PROMPT_TOKENS,
+        )
+        jd_context = fitted["jd"]
+        return (
             "You are a senior candidate crafting a concise, strong answer.\n"
             "Use only the candidate's resume context (and JD if present).\n"
             "Keep it specific, with impact/metrics where possible, 4-7 sentences max.\n\n"
-            f"Resume context (may be partial):\n{clamp_text(self.analyzer.resume_text, 900)}\n\n"
-            + (f"Job description (optional):\n{clamp_text(jd_context, 600)}\n\n" if jd_context else "") +
+            f"Resume context (may be partial):\n{fitted['resume']}\n\n"
+            + (f"Job description (optional):\n{jd_context}\n\n" if jd_context else "") +
             f"Question: {question}\n\nAnswer:"
         )
+
+    def answer_interview_question(self, question: str) -> str:
+        """Generate a best-fit model answer to an interview question."""
+        if not self.analyzer.resume_text:
+            return ""
+        
+        prompt = self._answer_prompt(question)
         try:
-            return self.analyzer.llm_chat(messages=[{"role": "user", "content": prompt}]).strip()
+            return self.analyzer.llm_chat(messages=[{"role": "user", "content": prompt}], profile="answer_brief").strip()
         except Exception:
             return ""
 
+    def answer_interview_questions(self, questions: list) -> list:
+        """Generate model answers for several questions, packed into as few calls as possible.
+
+        The resume/JD context is sent once per pack; questions the packed reply does
+        not answer are retried with one call each.
+        """
+        if not self.analyzer.resume_text or not questions:
+            return ["" for _ in questions]
+
+        fitted = self.analyzer.fit_prompt(
+            {"resume": self.analyzer.resume_text, "jd": self.analyzer.jd_text},
+            reserve_output=ANSWER_TOKENS_PER_QUESTION * min(len(questions), ANSWER_PACK_SIZE),
+            fixed_text=ANSWER_TASK + "\n".join(questions[:ANSWER_PACK_SIZE]),
+            weights={"resume": 3, "jd": 2},
+        )
+        context = f"Resume context (may be partial):\n{fitted['resume']}"
+        if fitted["jd"]:
+            context += f"\n\nJob description (optional):\n{fitted['jd']}"
+
+        # Bulk model answers must not hold up anyone's chat
+        with llm_priority("background"):
+            answers = run_packed(
+                self.analyzer.llm_chat_many,
+                questions,
+                context,
+                ANSWER_TASK,
+                fallback=lambda failed: self._answer_each([questions[i] for i in failed]),
+                item_label="Question",
+                answer_format='"<answer text>"',
+                max_items=ANSWER_PACK_SIZE,
+                tokens_per_item=ANSWER_TOKENS_PER_QUESTION,
+            )
+        return [a or "" for a in answers]
+
+    def _answer_each(self, questions: list) -> list:
+        """One concurrent call per question (fallback for packed answers that failed to parse)."""
+        requests = [{"messages": [{"role": "user", "content": self._answer_prompt(q)}], "profile": "answer_brief"}
+                    for q in questions]
+        responses = self.analyzer.llm_chat_many(requests)
+        return ["" if isinstance(r, Exception) else r.strip() for r in responses]
+
     def generate_interview_questions(self, question_types, difficulty, num_questions):
         """Generate interview questions based on the resume."""
         if not self.analyzer.resume_text or not self.analyzer.extracted_skills:
             return []
 
         try:
-            context = f"""
-    Resume Content:
-    {clamp_text(self.analyzer.resume_text, 1200)}...
-
-    Skills to focus on: {', '.join(self.analyzer.extracted_skills)}
-    Strengths: {', '.join(self.analyzer.analysis_result.get('strengths', []))}
-    Areas for improvement: {', '.join(self.analyzer.analysis_result.get('missing_skills', []))}
-    """
-
-            prompt = f"""
-        Generate exactly {num_questions} personalized {difficulty.lower()} level interview questions
-        for this candidate based on their resume and skills.
-
-        Only include question types from this list: {', '.join(question_types)}.
-
-        Return ONLY valid JSON in this exact format (no backticks, no prefixes/suffixes):
-        [
-            {{
-                "type": "<One type from the list above>",
-                "question": "<A real interview question>",
-                "solution": "<A best-fit, strong answer tailored to the resume in 4-7 sentences>"
-            }}
-        ]
-
-        Requirements:
-        - Output MUST contain exactly {num_questions} items.
-        - "type" must be one of the allowed types exactly.
-        - "question" must be a complete interview question.
-        - "solution" must be a best-fit answer using the resume context.
-        - Do not include any extra commentary.
-        {context}
-        """
-
-            raw_response = self.analyzer.llm_chat(messages=[{"role": "user", "content": prompt}]).strip()
+            resume_excerpt = self.analyzer.fit_prompt({"resume": self.analyzer.resume_text})["resume"]
+            context = {
+                "resume": resume_excerpt,
+                "skills": ", ".join(self.analyzer.extracted_skills),
+                "strengths": ", ".join(self.analyzer.analysis_result.get('strengths', [])),
+                "gaps": ", ".join(self.analyzer.analysis_result.get('missing_skills', [])),
+                "question_types": ", ".join(question_types),
+            }
+            messages = INTERVIEW_QUESTIONS.render(num_questions=num_questions, difficulty=difficulty.lower(), **context)
+            raw_response = self.analyzer.llm_chat(messages=messages, profile="questions_json",
+                                                  validate=json_object(min_items={"questions": num_questions})).strip()
 
             # Try parsing JSON
             try:
-                parsed_questions = json.loads(raw_response)
+                parsed_questions = _question_list(json.loads(raw_response))
             except json.JSONDecodeError:
                 pattern = r'"type"\s*:\s*"([^"]+)"\s*,\s*"question"\s*:\s*"([^"]+)"(?:\s*,\s*"solution"\s*:\s*"([^"]+)")?'
                 matches = re.findall(pattern, raw_response, re.DOTALL)
@@ -180,8 +316,6 @@ class InterviewAgent:
                 q_sol = q.get("solution", "").strip()
 
                 if q_type and q_text and q_type.lower() in [t.lower() for t in question_types]:
-                    if not q_sol:
-                        q_sol = self.answer_interview_question(q_text)
                     cleaned_questions.append({"type": q_type, "question": q_text, "solution": q_sol})
 
             # Deduplicate
@@ -197,17 +331,14 @@ class InterviewAgent:
             # If too few, generate more
             if len(cleaned_questions) < num_questions:
                 remaining = num_questions - len(cleaned_questions)
-                fill_prompt = f"""
-            Generate exactly {remaining} additional interview questions that are DIFFERENT from:
-            {json.dumps([q.get('question','') for q in cleaned_questions])}
-
-            Only include question types from this list: {', '.join(question_types)}.
-            Return ONLY valid JSON list in the same format (type, question, solution).
-            {context}
-            """
-                fill_raw = self.analyzer.llm_chat(messages=[{"role": "user", "content": fill_prompt}]).strip()
+                fill_messages = INTERVIEW_QUESTIONS_FILL.render(
+                    num_questions=remaining,
+                    existing=json.dumps([q.get('question', '') for q in cleaned_questions]),
+                    **context,
+                )
+                fill_raw = self.analyzer.llm_chat(messages=fill_messages, profile="questions_json").strip()
                 try:
-                    fill_parsed = json.loads(fill_raw)
+                    fill_parsed = _question_list(json.loads(fill_raw))
                 except json.JSONDecodeError:
                     pattern = r'"type"\s*:\s*"([^"]+)"\s*,\s*"question"\s*:\s*"([^"]+)"(?:\s*,\s*"solution"\s*:\s*"([^"]+)")?'
                     matches = re.findall(pattern, fill_raw, re.DOTALL)
@@ -218,8 +349,6 @@ class InterviewAgent:
                     q_text = q.get("question", "").strip()
                     q_sol = q.get("solution", "").strip()
                     if q_type and q_text and q_type.lower() in [t.lower() for t in question_types]:
-                        if not q_sol:
-                            q_sol = self.answer_interview_question(q_text)
                         if q_text.lower() not in seen:
                             cleaned_questions.append({"type": q_type, "question": q_text, "solution": q_sol})
                             seen.add(q_text.lower())
@@ -264,13 +393,18 @@ class InterviewAgent:
                     template_fn = templates.get(q_type) or (lambda s: f"Tell me about your experience with {s}.")
                     q_text = template_fn(topic)
                     if q_text.lower() not in [q.get("question","" ).lower() for q in cleaned_questions]:
-                        q_sol = self.answer_interview_question(q_text)
-                        cleaned_questions.append({"type": q_type, "question": q_text, "solution": q_sol})
+                        cleaned_questions.append({"type": q_type, "question": q_text, "solution": ""})
                         remaining -= 1
                     idx += 1
 
-            # Finally, trim to exact number requested
-            return cleaned_questions[:num_questions]
+            # Trim to exact number requested, then fill any missing solutions in one concurrent batch
+            cleaned_questions = cleaned_questions[:num_questions]
+            unanswered = [q for q in cleaned_questions if not q.get("solution")]
+            if unanswered:
+                answers = self.answer_interview_questions([q["question"] for q in unanswered])
+                for q, answer in zip(unanswered, answers):
+                    q["solution"] = answer
+            return cleaned_questions
 
         except Exception as e:
             print(f"Error generating interview questions: {e}")
@@ -1,13 +1,17 @@
 """Job Search Agent - Job board integrations."""
 
 import os
-from utils.llm_providers import SESSION
+from utils.http_client import get_http_client
+from utils.rate_limiter import key_id
+from utils.retry_policy import JOB_API_POLICY, RetryPolicy
 
 
 class JobAgent:
     """Handles job search across multiple platforms."""
     
-    def __init__(self, jooble_api_key: str | None = None):
+    def __init__(self, jooble_api_key: str | None = None, policy: RetryPolicy | None = None):
+        # Retry/backoff, timeouts and circuit breaking shared with other job API callers
+        self.policy = policy or JOB_API_POLICY
         # Adzuna API credentials
         self.app_id = "aea2688c"
         self.app_key = "3d681c98182447e843823a9c9c2d14ee"
@@ -30,8 +34,10 @@ class JobAgent:
         if experience:
             params["experience"] = str(experience)
         
-        response = SESSION.get(url, params=params, timeout=30)
-        response.raise_for_status()
+        response = self.policy.execute(
+            lambda timeout: get_http_client().get(url, params=params, timeout=timeout),
+            breaker_key=f"adzuna:{key_id(self.app_key)}",
+        )
         data = response.json()
         
         jobs = []
@@ -59,8 +65,10 @@ class JobAgent:
             payload["location"] = location
         
         try:
-            resp = SESSION.post(url, json=payload, timeout=30)
-            resp.raise_for_status()
+            resp = self.policy.execute(
+                lambda timeout: get_http_client().post(url, json=payload, timeout=timeout),
+                breaker_key=f"jooble:{key_id(api_key)}",
+            )
             data = resp.json()
             items = data.get("jobs") or data.get("results") or []
             
@@ -0,0 +1,135 @@
+"""Prompt templates for the agents (see `utils.prompt_templates`).
+
+Bump a template's version whenever its wording changes so telemetry and
+cassettes can be compared across prompt revisions.
+"""
+
+from utils.prompt_templates import register_template
+
+# Shared by both question templates so a top-up call reuses the first call's prefix
+_QUESTION_RULES = """
+    You write personalized interview questions for a candidate based on their resume and skills.
+
+    Return ONLY a valid JSON object in this exact format (no backticks, no prefixes/suffixes):
+    {"questions": [
+        {
+            "type": "<One of the allowed question types>",
+            "question": "<A real interview question>",
+            "solution": "<A best-fit, strong answer tailored to the resume in 4-7 sentences>"
+        }
+    ]}
+
+    Requirements:
+    - "type" must be one of the allowed types exactly.
+    - "question" must be a complete interview question.
+    - "solution" must be a best-fit answer using the resume context.
+    - Do not include any extra commentary.
+"""
+
+_QUESTION_CONTEXT = """
+    Resume Content:
+    $resume
+
+    Skills to focus on: $skills
+    Strengths: $strengths
+    Areas for improvement: $gaps
+"""
+
+INTERVIEW_QUESTIONS = register_template(
+    "interview_questions", "2",
+    system=_QUESTION_RULES,
+    user=_QUESTION_CONTEXT + """
+    Generate exactly $num_questions personalized $difficulty level interview questions for this candidate.
+    Only include question types from this list: $question_types
+    "questions" MUST contain exactly $num_questions items.
+    """,
+)
+
+INTERVIEW_QUESTIONS_FILL = register_template(
+    "interview_questions_fill", "2",
+    system=_QUESTION_RULES,
+    user=_QUESTION_CONTEXT + """
+    Generate exactly $num_questions additional interview questions that are DIFFERENT from:
+    $existing
+
+    Only include question types from this list: $question_types
+    """,
+)
+
+RESUME_IMPROVEMENTS = register_template(
+    "resume_improvements", "2",
+    system="""
+    You are an expert resume consultant. Analyze the resume and provide detailed, actionable improvement
+    suggestions for the requested areas.
+
+    For EACH improvement area, provide:
+    1. A clear description explaining what needs improvement (2-3 sentences)
+    2. 3-5 specific, actionable suggestions with concrete examples
+    3. If applicable, a before/after example showing the improvement
+
+    Return ONLY a valid JSON object with this exact structure:
+    {
+      "Area Name": {
+        "description": "What needs improvement and why",
+        "specific": [
+          "First actionable suggestion with specific examples",
+          "Second actionable suggestion with specific examples",
+          "Third actionable suggestion with specific examples"
+        ],
+        "before_after": {
+          "before": "Original text example",
+          "after": "Improved text example"
+        }
+      }
+    }
+
+    Be specific and practical. Reference actual content from the resume in your suggestions.
+    """,
+    user="""
+    Resume Content:
+    $resume
+
+    Extracted Skills: $skills
+
+    Strengths: $strengths
+
+    $weaknesses
+
+    Target role: $target_role
+
+    Provide improvement suggestions for these areas: $areas
+    """,
+)
+
+IMPROVED_RESUME = register_template(
+    "improved_resume", "2",
+    system="""
+    Rewrite and improve the candidate's resume to make it highly optimized for the target job.
+
+    Improve the resume by:
+    1. Adding strong, quantifiable achievements
+    2. Highlighting the specified skills strategically for ATS scanning
+    3. Addressing all the weakness areas identified with the specific suggestions provided
+    4. Incorporating the example improvements provided
+    5. Structuring information in a clear, professional format
+    6. Using industry-standard terminology
+    7. Ensuring all relevant experience is properly emphasized
+    8. Adding measurable outcomes and achievements
+
+    Return only the improved resume text without any additional explanations.
+    Format the resume in a modern, clean style with clear section headings.
+    Make sure to include ALL sections from the original resume (contact info, summary, experience, education, skills, etc.).
+    """,
+    user="""
+    Original Resume:
+    $resume
+
+    $target
+
+    Skills to highlight (in order of priority): $skills
+
+    $weaknesses
+
+    $examples
+    """,
+)
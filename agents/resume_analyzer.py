@@ -3,14 +3,37 @@
 import os
 import re
 import json
+import numpy as np
 from langchain_community.vectorstores import FAISS
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.embeddings.fastembed import FastEmbedEmbeddings
 
-from utils.llm_providers import groq_chat
-from utils.text_utils import clamp_text, compute_hash
+from utils.llm import LLMConfig, llm_chat as _llm_chat, llm_chat_batch as _llm_chat_batch, llm_chat_variants as _llm_chat_variants
+from utils.llm_router import get_router
+from utils.llm_providers import chat_parallel
+from utils.rate_limiter import key_id
+from utils.retry_policy import GROQ_POLICY
+from utils.text_utils import compute_hash
+from utils.prompt_budget import fit_prompt_parts
+from utils.request_packing import run_packed
+from utils.decoding_profiles import resolve_decoding
+from utils.dispatcher import current_dispatch
+from utils.skill_matcher import extract_skills
+from utils.skill_taxonomy import get_taxonomy
+from utils.local_scoring import score_skills as _score_skills_locally
+from utils.skill_evidence import EvidenceMatrix, unit_rows
+from utils.model_cascade import cascade_models_from_env, json_object, covers, min_length, all_of
 from utils.file_handlers import extract_text_from_pdf, extract_text_from_txt, extract_text_from_file
 
+# Token cap for prompts that are repeated once per skill
+SKILL_PROMPT_TOKENS = 600
+
+# Skills scored per packed call in the fallback path
+SKILL_PACK_SIZE = 12
+
+# Analysis intensities: "local" makes no LLM calls at all
+INTENSITIES = ("full", "quick", "local")
+
 
 class ResumeAnalyzer:
     """Handles resume analysis, skill extraction, and job description processing."""
@@ -41,6 +64,9 @@ class ResumeAnalyzer:
         
         # Lazy embeddings cache
         self._embeddings = None
+        # (resume hash, chunk texts, unit chunk vectors) and skill name -> unit vector, for evidence lookup
+        self._chunk_vectors = None
+        self._skill_vector_cache = {}
 
     def _get_embeddings(self):
         """Lazy load embeddings."""
@@ -56,14 +82,90 @@ class ResumeAnalyzer:
         """Compute hash for job description."""
         base = (jd_text or "").strip()
         if not base and skills:
-            base = ",".join(sorted([str(s).strip().lower() for s in skills if s]))
+            taxonomy = get_taxonomy()
+            base = ",".join(sorted({taxonomy.skill_id(s) for s in skills if s}))
         if not base:
             base = "no-jd"
         return compute_hash(base)
 
-    def llm_chat(self, messages: list, temperature: float = 0.2, max_tokens: int = 600) -> str:
-        """Groq-only chat helper."""
-        return groq_chat(self.api_key, messages=messages, model=self.model, temperature=temperature, max_tokens=max_tokens)
+    @property
+    def dispatch_user(self) -> str:
+        """Fair-share identity for the LLM dispatcher: the signed-in user, else this analyzer's session."""
+        return f"user:{self.user_id}" if self.user_id is not None else f"session:{id(self):x}"
+
+    def llm_config(self) -> LLMConfig:
+        """LLM configuration for this analyzer's key and model.
+
+        Calls on the shared server key go through the key/model router when one is configured;
+        a user's own key is never pooled.
+        """
+        router = None
+        if not self.api_key or self.api_key == os.getenv("GROQ_API_KEY"):
+            router = get_router()
+        return LLMConfig(provider="groq", model=self.model, api_key=self.api_key, router=router,
+                         cascade=cascade_models_from_env() or None)
+
+    def llm_chat(self, messages: list, temperature: float | None = None, max_tokens: int | None = None,
+                 stream: bool = False, cache: bool = True, cache_only: bool = False, deadline: float | None = None,
+                 profile: str | None = None, validate=None, priority: str | None = None):
+        """Groq-only chat helper; returns a token iterator when `stream=True`.
+
+        `profile` names a decoding profile (`utils.decoding_profiles`) supplying max_tokens,
+        temperature, stop sequences and JSON mode; explicit arguments override it.
+        `validate` enables the model cascade (`utils.model_cascade`) when LLM_CASCADE_MODELS is set.
+        `priority` is the dispatcher class ("interactive", "standard", "background"; see `utils.dispatcher`).
+        """
+        params = resolve_decoding(profile, temperature=temperature, max_tokens=max_tokens)
+        return _llm_chat(self.llm_config(), messages=messages, stream=stream, cache=cache, cache_only=cache_only,
+                         deadline=deadline, validate=validate, priority=priority, user=self.dispatch_user, **params)
+
+    def fit_prompt(self, parts: dict, reserve_output: int = 600, fixed_text: str = "",
+                   weights: dict | None = None, limit: int | None = None) -> dict:
+        """Trim named prompt parts to this analyzer's model budget (see `utils.prompt_budget`)."""
+        return fit_prompt_parts(parts, model=self.model, reserve_output=reserve_output, fixed_text=fixed_text,
+                                weights=weights, limit=limit)
+
+    def llm_chat_variants(self, messages: list, n: int = 3, profile: str | None = None,
+                          temperature: float | None = 0.7, max_tokens: int | None = None,
+                          deadline: float | None = None, priority: str | None = None) -> list:
+        """`n` alternative replies to one prompt in one round trip (see `utils.llm.llm_chat_variants`).
+
+        Variants default to temperature 0.7 so they actually differ; the profile supplies the rest.
+        """
+        params = resolve_decoding(profile, temperature=temperature, max_tokens=max_tokens)
+        return _llm_chat_variants(self.llm_config(), messages=messages, n=n, deadline=deadline, priority=priority,
+                                  user=self.dispatch_user, **params)
+
+    def llm_chat_many(self, requests: list, max_concurrency: int = 4, batch: bool = False) -> list:
+        """Issue independent chat requests concurrently.
+
+        Args:
+            requests: List of dicts with `messages` and optional `profile`/`temperature`/`max_tokens`/`priority`
+            max_concurrency: Maximum number of requests in flight at once
+            batch: Submit them as one offline batch job instead (bulk re-scoring/screening;
+                slower, but off the interactive rate limits and at batch pricing)
+
+        Returns:
+            Responses in request order; failed requests are returned as exceptions
+        """
+        router = self.llm_config().router
+        chat_requests = [
+            {
+                "messages": r["messages"],
+                "model": self.model,
+                **resolve_decoding(r.get("profile"), temperature=r.get("temperature"), max_tokens=r.get("max_tokens")),
+            }
+            for r in requests
+        ]
+        if batch:
+            return _llm_chat_batch(self.llm_config(), chat_requests)
+        for r, req in zip(requests, chat_requests):
+            req["dispatch"] = current_dispatch(r.get("priority"), self.dispatch_user)
+        if router is not None:
+            return chat_parallel(chat_requests, max_concurrency=max_concurrency, chat_fn=router.chat)
+        for req in chat_requests:
+            req["api_key"] = self.api_key
+        return chat_parallel(chat_requests, max_concurrency=max_concurrency)
 
     def extract_text_from_pdf(self, pdf_file):
         """Extract text from PDF file."""
@@ -77,14 +179,17 @@ class ResumeAnalyzer:
         """Extract text from file (PDF or TXT)."""
         return extract_text_from_file(file)
 
-    def create_rag_vector_store(self, text):
-        """Create or load a cached FAISS vector store for RAG using FastEmbed."""
+    def create_rag_vector_store(self, text, r_hash=None):
+        """Create or load a cached FAISS vector store for RAG using FastEmbed.
+
+        `r_hash` keys the cache; pass it for text other than the loaded resume, whose hash is the default.
+        """
         splitter = RecursiveCharacterTextSplitter(chunk_size=600, chunk_overlap=100)
         chunks = splitter.split_text(text)
         embeddings = self._get_embeddings()
         
         # Determine cache path
-        r_hash = self.resume_hash or self._compute_resume_hash(text)
+        r_hash = r_hash or self.resume_hash or self._compute_resume_hash(text)
         user_part = str(self.user_id or "anon")
         cache_path = os.path.join(self.vector_cache_dir, user_part, r_hash, "rag")
         
@@ -158,7 +263,7 @@ class ResumeAnalyzer:
     def extract_skills_from_jd(self, jd_text):
         """Extract skills from job description using LLM."""
         try:
-            jd_snippet = clamp_text(jd_text, 1500)
+            jd_snippet = self.fit_prompt({"jd": jd_text})["jd"]
             prompt = f"""
             Extract a comprehensive list of technical skills, technologies, and competencies required from this job description.
             Return ONLY a plain comma-separated list of skills.
@@ -166,106 +271,34 @@ class ResumeAnalyzer:
             Job Description:
             {jd_snippet}
             """
-            skills_text = self.llm_chat(messages=[{"role": "user", "content": prompt}]).strip()
+            skills_text = self.llm_chat(messages=[{"role": "user", "content": prompt}], profile="skills_csv",
+                                        validate=min_length(20)).strip()
             skills = [s.strip() for s in re.split(r',|\n|-|\*', skills_text) if s.strip()]
-            return list(dict.fromkeys(skills))
+            return get_taxonomy().normalize(skills)
         except Exception as e:
             print(f"Error extracting skills from job description: {e}")
             return []
 
     def fast_extract_skills_from_jd(self, jd_text: str) -> list:
         """Heuristic skill extraction without LLM for quick mode."""
-        vocab = {
-            # Programming Languages
-            "python","java","javascript","typescript","c","c++","c#","go","golang","rust","kotlin","swift","ruby","php","scala","r","matlab","perl","dart","lua",
-            # Web/Frontend
-            "react","next.js","nextjs","angular","vue","svelte","html","css","html5","css3","sass","scss","less","tailwind","bootstrap","redux","graphql","webpack","vite","parcel","gulp","npm","yarn","pnpm",
-            # Backend/Frameworks
-            "node","node.js","express","django","flask","fastapi","spring","spring boot",".net","dotnet","asp.net","grpc","rest","restful","microservices","soap","laravel","rails","ruby on rails",
-            # Databases
-            "sql","mysql","postgresql","postgres","mongodb","redis","elasticsearch","cassandra","dynamodb","mariadb","oracle","sqlite","neo4j","couchdb","firestore",
-            # Message Queue/Streaming
-            "kafka","rabbitmq","redis","activemq","zeromq","nats","pulsar","kinesis",
-            # Big Data/Analytics
-            "spark","hadoop","hive","airflow","databricks","etl","data warehouse","snowflake","bigquery","redshift","presto","flink",
-            # Machine Learning/AI
-            "machine learning","deep learning","ml","dl","nlp","natural language processing","computer vision","cv","pandas","numpy","scikit-learn","sklearn","tensorflow","pytorch","keras","transformers","hugging face","bert","gpt","llm","generative ai","langchain","llama","rag",
-            # DevOps/Cloud
-            "docker","kubernetes","k8s","terraform","ansible","puppet","chef","jenkins","gitlab","github actions","ci/cd","cicd","git","github","gitlab","bitbucket","linux","unix","bash","shell","aws","azure","gcp","google cloud","cloud","heroku","vercel","netlify","cloudflare",
-            # AWS Services
-            "ec2","s3","lambda","rds","cloudformation","ecs","eks","sqs","sns","cloudwatch","iam","vpc","route53","api gateway",
-            # Azure Services  
-            "azure functions","azure sql","blob storage","cosmos db","aks","azure devops",
-            # GCP Services
-            "compute engine","cloud storage","cloud functions","cloud run","gke","pub/sub",
-            # Mobile
-            "android","ios","react native","flutter","swiftui","kotlin","swift","xamarin","ionic",
-            # Testing/QA
-            "pytest","unittest","selenium","cypress","playwright","junit","jest","mocha","jasmine","testng","postman","jmeter","loadrunner",
-            # Methodologies
-            "agile","scrum","kanban","waterfall","devops","tdd","test driven development","bdd","behavior driven development",
-            # Soft Skills
-            "leadership","communication","teamwork","problem solving","analytical","critical thinking","project management","time management",
-            # Tools
-            "jira","confluence","slack","trello","asana","figma","sketch","postman","insomnia","datadog","new relic","splunk","prometheus","grafana","tableau","power bi","excel","jupyter","vscode","intellij","eclipse","vim",
-            # Security
-            "oauth","jwt","ssl","tls","encryption","authentication","authorization","security","cybersecurity","penetration testing","owasp",
-            # Other Tech
-            "api","json","xml","yaml","websocket","graphql","grpc","protobuf","openapi","swagger","nginx","apache","tomcat","iis","elasticsearch","solr","memcached"
-        }
-        
-        text = jd_text.lower()
-        found = set()
-        for term in vocab:
-            if term in text:
-                found.add(term)
-        
-        # Capture capitalized acronyms
-        caps = set(re.findall(r"\b([A-Z]{2,5})\b", jd_text))
-        for c in caps:
-            if c.lower() not in found:
-                found.add(c.lower())
-        
-        # This part of the code is responsible for cleaning, formatting, and ordering the 
-        # extracted skills so they look professional and readable.
-        norm = []
-        for f in found:
-            if len(f) <= 5 and f.isupper():
-                norm.append(f)
-            elif " " in f:
-                norm.append(" ".join(w.capitalize() for w in f.split()))
-            elif f in {"sql","aws","gcp","nlp","cv","ci/cd","cicd"}:
-                norm.append(f.upper())
-            elif f in {"c#","c++"}:
-                norm.append(f.upper())
-            else:
-                norm.append(f.capitalize())
-        
-        # Keep original order of appearance
-        order = []
-        for m in re.finditer(r"[A-Za-z\+#\.]{2,}(?:\s[A-Za-z\+\.#]{2,})*", jd_text):
-            token = m.group(0).strip().lower()
-            for n in norm:
-                if n.lower() in token and n not in order:
-                    order.append(n)
-        return order or sorted(set(norm), key=lambda s: s.lower())
-
-    def analyze_skill(self, retriever, resume_text, skill):
-        """Analyze a single skill."""
-        try:
-            docs = retriever.get_relevant_documents(skill)
-        except Exception:
-            docs = []
+        return get_taxonomy().normalize(extract_skills(jd_text))
+
+    def _skill_prompt(self, evidence, resume_text, skill):
+        """Build the single-skill scoring prompt from the skill's best resume chunks."""
+        docs = evidence.context(skill, 3) if evidence is not None else []
         
-        context = "\n\n".join([getattr(d, 'page_content', str(d)) for d in docs][:3]) or clamp_text(resume_text, 1200)
-        context = clamp_text(context, 1500)
+        context = "\n\n".join(docs) or (resume_text or "")
+        # Per-skill prompts are issued many times, so keep each one small
+        context = self.fit_prompt({"context": context}, limit=SKILL_PROMPT_TOKENS)["context"]
         
-        user = (
+        return (
             f"Context from resume (may be partial):\n{context}\n\n"
             f"Task: On a scale of 0-10, how clearly does the candidate mention proficiency in '{skill}'? "
-            f"First output ONLY a number (0-10), then a short reasoning sentence."
+            f"First output ONLY a number (0-10), then a short reasoning sentence on the same line."
         )
-        text = self.llm_chat(messages=[{"role": "user", "content": user}])
+
+    def _parse_skill_score(self, skill, text):
+        """Parse a `number + reasoning` reply into (skill, score, reasoning)."""
         match = re.search(r"\b(\d{1,2})\b", text)
         score = int(match.group(1)) if match else 0
         reasoning = text
@@ -275,9 +308,57 @@ class ResumeAnalyzer:
                 reasoning = text[idx + len(match.group(1)):].strip(" -:;\n")
         return skill, min(score, 10), reasoning
 
+    def _score_skills_packed(self, evidence, resume_text, skills):
+        """Score skills via packed requests; returns (skill, score, reasoning) per skill."""
+        chunks = evidence.pooled(skills, 3) if evidence is not None else []
+        context = "\n\n".join(chunks) or (resume_text or "")
+        task = "For each skill, rate 0-10 how clearly the candidate shows proficiency, using ONLY the resume context below."
+        context = self.fit_prompt({"context": context}, reserve_output=60 * SKILL_PACK_SIZE,
+                                  fixed_text=task + ", ".join(skills[:SKILL_PACK_SIZE]))["context"]
+
+        def _parse(i, value):
+            if isinstance(value, dict) and "score" in value:
+                score = max(0, min(10, int(float(value["score"]))))
+                return skills[i], score, str(value.get("reasoning") or "").strip()
+            if isinstance(value, (int, float)):
+                return skills[i], max(0, min(10, int(value))), ""
+            return self._parse_skill_score(skills[i], str(value)) if re.search(r"\b\d{1,2}\b", str(value)) else None
+
+        def _each(failed):
+            requests = [
+                {"messages": [{"role": "user", "content": self._skill_prompt(evidence, resume_text, skills[i])}],
+                 "profile": "score_single"}
+                for i in failed
+            ]
+            results = []
+            for i, text in zip(failed, self.llm_chat_many(requests)):
+                if isinstance(text, Exception):
+                    results.append((skills[i], 0, f"Error scoring skill: {text}"))
+                else:
+                    results.append(self._parse_skill_score(skills[i], text))
+            return results
+
+        return run_packed(
+            self.llm_chat_many,
+            skills,
+            f"Resume context (may be partial):\n{context}",
+            task,
+            parse_item=_parse,
+            fallback=_each,
+            item_label="Skill",
+            answer_format='{"score": <0-10>, "reasoning": "<one sentence>"}',
+            max_items=SKILL_PACK_SIZE,
+            tokens_per_item=60,
+        )
+
+    def analyze_skill(self, evidence, resume_text, skill):
+        """Analyze a single skill; `evidence` is a `skill_evidence()` matrix containing it (or None)."""
+        user = self._skill_prompt(evidence, resume_text, skill)
+        text = self.llm_chat(messages=[{"role": "user", "content": user}], profile="score_single")
+        return self._parse_skill_score(skill, text)
+
     def semantic_skill_analysis(self, resume_text, skills):
         """Batch skill scoring in a single LLM call."""
-        vectorstore = self.create_vector_store(resume_text)
         skill_scores, skill_reasoning, missing_skills, total_score = {}, {}, [], 0
         
         if not skills:
@@ -292,17 +373,17 @@ class ResumeAnalyzer:
                 "improvement_areas": []
             }
         
-        # Use larger resume snippet for better skill detection (increased from 900 to 2000)
-        resume_snippet = clamp_text(resume_text, 2000)
         skills_list = ", ".join(skills)
-        prompt = (
+        instructions = (
             "Rate each skill (0-10) based ONLY on this resume text. Return strict JSON: {\"skill_scores\":{skill:score}, \"skill_reasoning\":{skill:short_reason}}.\n"
-            f"Resume:\n{resume_snippet}\n\nSkills: {skills_list}\n"
         )
+        resume_snippet = self.fit_prompt({"resume": resume_text}, fixed_text=instructions + skills_list)["resume"]
+        prompt = instructions + f"Resume:\n{resume_snippet}\n\nSkills: {skills_list}\n"
         
         parsed_ok = False
         try:
-            resp = self.llm_chat(messages=[{"role": "user", "content": prompt}], temperature=0.1)
+            resp = self.llm_chat(messages=[{"role": "user", "content": prompt}], profile="score_batch_json",
+                                 validate=all_of(json_object(("skill_scores",)), covers(skills, key="skill_scores")))
             data = json.loads(resp)
             ss = data.get("skill_scores", {})
             sr = data.get("skill_reasoning", {})
@@ -325,16 +406,21 @@ class ResumeAnalyzer:
             parsed_ok = False
         
         if not parsed_ok:
-            # Fallback to per-skill analysis
-            retriever = vectorstore.as_retriever()
-            for s in skills:
-                skill, score, reasoning = self.analyze_skill(retriever, resume_text, s)
+            # Fallback: score skills in packed calls over their pooled evidence,
+            # with one call per skill only for those the packed replies miss
+            evidence = self.skill_evidence(skills, resume_text)
+            for skill, score, reasoning in self._score_skills_packed(evidence, resume_text, skills):
                 skill_scores[skill] = score
                 skill_reasoning[skill] = reasoning
                 total_score += score
                 if score <= 5:
                     missing_skills.append(skill)
         
+        return self._analysis_result(skills, skill_scores, skill_reasoning, missing_skills, total_score,
+                                     "Batch skill analysis.")
+
+    def _analysis_result(self, skills, skill_scores, skill_reasoning, missing_skills, total_score, reasoning):
+        """Result dict shared by every scoring mode (the UI and the analysis cache read this schema)."""
         overall_score = int((total_score / (10 * len(skills))) * 100) if skills else 0
         selected = overall_score >= self.cutoff_score
         strengths = [skill for skill, score in skill_scores.items() if score >= 7]
@@ -345,16 +431,113 @@ class ResumeAnalyzer:
             "skill_scores": skill_scores,
             "skill_reasoning": skill_reasoning,
             "selected": selected,
-            "reasoning": "Batch skill analysis.",
+            "reasoning": reasoning,
             "missing_skills": missing_skills,
             "strengths": strengths,
             "improvement_areas": missing_skills if not selected else []
         }
 
-    def analyze_resume(self, resume_file, role_requirements=None, custom_jd=None, quick: bool = False):
-        """Analyze resume from file."""
-        self.resume_text = self.extract_text_from_file(resume_file)
-        self.resume_hash = self._compute_resume_hash(self.resume_text)
+    def _resume_chunks(self, resume_text):
+        """(chunk texts, unit vectors) of the resume's RAG chunks, read back from the (cached) FAISS store."""
+        r_hash = self._compute_resume_hash(resume_text) if resume_text != self.resume_text else self.resume_hash
+        if self._chunk_vectors is None or self._chunk_vectors[0] != r_hash:
+            store = self.create_rag_vector_store(resume_text, r_hash=r_hash)
+            if resume_text == self.resume_text:
+                self.rag_vectorstore = store
+            index = store.index
+            texts = [store.docstore.search(store.index_to_docstore_id[i]).page_content for i in range(index.ntotal)]
+            vectors = unit_rows(index.reconstruct_n(0, index.ntotal)) if index.ntotal else np.zeros((0, 0))
+            self._chunk_vectors = (r_hash, texts, vectors)
+        return self._chunk_vectors[1], self._chunk_vectors[2]
+
+    def _skill_vectors(self, skills):
+        """Unit embeddings of `skills`: stored taxonomy rows for known skills, one batch call for the rest."""
+        cache = self._skill_vector_cache
+        pending = [s for s in dict.fromkeys(skills) if s not in cache]
+        if pending:
+            embeddings = self._get_embeddings()
+            taxonomy = get_taxonomy()
+            known = taxonomy.embeddings(embeddings.embed_documents, getattr(embeddings, "model_name", "default"))
+            unknown = []
+            for skill in pending:
+                entry = taxonomy.lookup(skill)
+                if entry is not None:
+                    cache[skill] = known[entry.index]
+                else:
+                    unknown.append(skill)
+            if unknown:
+                for skill, vector in zip(unknown, unit_rows(embeddings.embed_documents(unknown))):
+                    cache[skill] = vector
+        return np.stack([cache[s] for s in skills])
+
+    def skill_evidence(self, skills, resume_text=None):
+        """Skills x resume-chunks similarity matrix (`utils.skill_evidence`), or None without embeddings.
+
+        Skills are embedded in one batch and resume chunks come from the RAG store, so per-skill
+        context is one matrix multiply instead of one retriever search per skill.
+        """
+        resume_text = resume_text if resume_text is not None else (self.resume_text or "")
+        if not skills or not resume_text:
+            return None
+        try:
+            chunks, chunk_vectors = self._resume_chunks(resume_text)
+            return EvidenceMatrix(skills, chunks, self._skill_vectors(skills), chunk_vectors)
+        except Exception as e:
+            print(f"Skill evidence unavailable: {e}")
+            return None
+
+    def local_skill_analysis(self, resume_text, skills):
+        """Score skills from alias matches and embedding similarity, without any LLM call."""
+        if not skills:
+            return self._analysis_result([], {}, {}, [], 0, "No skills provided.")
+        evidence = self.skill_evidence(skills, resume_text)
+        best = evidence.best_similarity() if evidence is not None and evidence.chunks else None
+        skill_scores, skill_reasoning, missing_skills, total_score = {}, {}, [], 0
+        for skill, score, reasoning in _score_skills_locally(resume_text, skills, best):
+            skill_scores[skill] = score
+            skill_reasoning[skill] = reasoning
+            total_score += score
+            if score <= 5:
+                missing_skills.append(skill)
+        return self._analysis_result(skills, skill_scores, skill_reasoning, missing_skills, total_score,
+                                     "Local analysis (keyword and embedding evidence, no LLM).")
+
+    def _llm_unavailable(self) -> bool:
+        """True when no API key is usable, or every usable key's circuit is open (e.g. after repeated failures)."""
+        router = self.llm_config().router
+        keys = list(router.keys) if router is not None else [self.api_key or os.getenv("GROQ_API_KEY")]
+        if not any(keys):
+            return True
+        states = GROQ_POLICY.breaker_states()
+        return all(states.get(f"groq:{key_id(k)}", {}).get("state") == "open" for k in keys if k)
+
+    def _resolve_intensity(self, intensity, quick):
+        intensity = intensity or ("quick" if quick else "full")
+        if intensity not in INTENSITIES:
+            raise ValueError(f"Unknown analysis intensity {intensity!r}; expected one of {INTENSITIES}")
+        if intensity != "local" and self._llm_unavailable():
+            return "local"
+        return intensity
+
+    def _set_resume(self, text):
+        """Set the resume text and hash.
+
+        Cached Q&A answers are scoped by resume hash, so a replaced resume never gets them; they are
+        left to LRU eviction because other sessions may still be using the same resume.
+        """
+        self.resume_text = text
+        self.resume_hash = self._compute_resume_hash(text)
+
+    def analyze_resume(self, resume_file, role_requirements=None, custom_jd=None, quick: bool = False,
+                       intensity: str | None = None):
+        """Analyze resume from file.
+
+        `intensity` is "full", "quick" or "local" (no LLM calls; see `local_skill_analysis`) and
+        defaults to `quick`. Without a usable API key, or while its circuit is open, "local" is used.
+        """
+        intensity = self._resolve_intensity(intensity, quick)
+        quick = intensity != "full"
+        self._set_resume(self.extract_text_from_file(resume_file))
         
         # Cache check
         try:
@@ -368,13 +551,13 @@ class ResumeAnalyzer:
             self.jd_text = self.clean_job_description(raw_jd_text)
             jd_skills = self.fast_extract_skills_from_jd(self.jd_text) if quick else self.extract_skills_from_jd(self.jd_text)
         else:
-            jd_skills = role_requirements or []
+            jd_skills = get_taxonomy().normalize(role_requirements)
         
         if not jd_skills:
             jd_skills = ["teamwork"]
         
         # In quick mode, limit to 10 skills instead of 5 for better coverage
-        if quick and len(jd_skills) > 10:
+        if intensity == "quick" and len(jd_skills) > 10:
             jd_skills = jd_skills[:10]
         
         self.extracted_skills = jd_skills
@@ -384,21 +567,25 @@ class ResumeAnalyzer:
             jd_hash = self._compute_jd_hash(self.jd_text, jd_skills)
             prov = getattr(self, 'provider', '')
             mdl = getattr(self, 'model', '')
-            intensity = 'quick' if quick else 'full'
             cached = get_cached_analysis(self.user_id, self.resume_hash, jd_hash, prov, mdl, intensity)
             if cached:
                 self.analysis_result = cached
                 self.resume_weaknesses = cached.get("detailed_weaknesses", [])
                 return self.analysis_result
         
-        self.analysis_result = self.semantic_skill_analysis(self.resume_text, jd_skills)
+        if intensity == "local":
+            self.analysis_result = self.local_skill_analysis(self.resume_text, jd_skills)
+        else:
+            self.analysis_result = self.semantic_skill_analysis(self.resume_text, jd_skills)
         
         if not quick:
             self.analyze_resume_weaknesses()
         
         self.analysis_result["detailed_weaknesses"] = getattr(self, "resume_weaknesses", [])
         
-        if quick:
+        if intensity == "local":
+            self.analysis_result["note"] = "Instant local analysis (no AI calls). Click Analyze to run full detailed analysis."
+        elif quick:
             self.analysis_result["note"] = "Quick analysis completed. Click Analyze to run full detailed analysis."
         
         # Save cache
@@ -408,17 +595,18 @@ class ResumeAnalyzer:
                 jd_hash = self._compute_jd_hash(self.jd_text, jd_skills)
                 prov = getattr(self, 'provider', '')
                 mdl = getattr(self, 'model', '')
-                intensity = 'quick' if quick else 'full'
                 save_cached_analysis(self.user_id, self.resume_hash, jd_hash, prov, mdl, intensity, self.analysis_result)
         except Exception:
             pass
         
         return self.analysis_result
 
-    def analyze_resume_text(self, resume_text: str, role_requirements=None, custom_jd=None, quick: bool = False):
-        """Analyze resume from text string."""
-        self.resume_text = resume_text or ""
-        self.resume_hash = self._compute_resume_hash(self.resume_text)
+    def analyze_resume_text(self, resume_text: str, role_requirements=None, custom_jd=None, quick: bool = False,
+                            intensity: str | None = None):
+        """Analyze resume from text string; `intensity` as in `analyze_resume`."""
+        intensity = self._resolve_intensity(intensity, quick)
+        quick = intensity != "full"
+        self._set_resume(resume_text or "")
         try:
             from database import get_cached_analysis, save_cached_analysis
         except Exception:
@@ -430,13 +618,13 @@ class ResumeAnalyzer:
             self.jd_text = self.clean_job_description(custom_jd)
             jd_skills = self.fast_extract_skills_from_jd(self.jd_text) if quick else self.extract_skills_from_jd(self.jd_text)
         else:
-            jd_skills = role_requirements or []
+            jd_skills = get_taxonomy().normalize(role_requirements)
         
         if not jd_skills:
             jd_skills = ["teamwork"]
         
         # In quick mode, limit to 10 skills instead of 5 for better coverage
-        if quick and len(jd_skills) > 10:
+        if intensity == "quick" and len(jd_skills) > 10:
             jd_skills = jd_skills[:10]
         
         self.extracted_skills = jd_skills
@@ -447,21 +635,25 @@ class ResumeAnalyzer:
             jd_hash = self._compute_jd_hash(self.jd_text, jd_skills)
             prov = getattr(self, 'provider', '')
             mdl = getattr(self, 'model', '')
-            intensity = 'quick' if quick else 'full'
             cached = get_cached_analysis(self.user_id, self.resume_hash, jd_hash, prov, mdl, intensity)
             if cached:
                 self.analysis_result = cached
                 self.resume_weaknesses = cached.get("detailed_weaknesses", [])
                 return self.analysis_result
         
-        self.analysis_result = self.semantic_skill_analysis(self.resume_text, jd_skills)
+        if intensity == "local":
+            self.analysis_result = self.local_skill_analysis(self.resume_text, jd_skills)
+        else:
+            self.analysis_result = self.semantic_skill_analysis(self.resume_text, jd_skills)
         
         if not quick:
             self.analyze_resume_weaknesses()
         
         self.analysis_result["detailed_weaknesses"] = getattr(self, "resume_weaknesses", [])
         
-        if quick:
+        if intensity == "local":
+            self.analysis_result["note"] = "Instant local analysis (no AI calls). Click Analyze to run full detailed analysis."
+        elif quick:
             self.analysis_result["note"] = "Quick analysis completed. Click Analyze to run full detailed analysis."
         
         # Save cache
@@ -470,7 +662,6 @@ class ResumeAnalyzer:
                 jd_hash = self._compute_jd_hash(self.jd_text, jd_skills)
                 prov = getattr(self, 'provider', '')
                 mdl = getattr(self, 'model', '')
-                intensity = 'quick' if quick else 'full'
                 save_cached_analysis(self.user_id, self.resume_hash, jd_hash, prov, mdl, intensity, self.analysis_result)
         except Exception:
             pass
@@ -489,16 +680,19 @@ class ResumeAnalyzer:
             self.resume_weaknesses = []
             return []
         
+        # Each missing skill's closest resume chunks, from one skills x chunks similarity matrix
+        evidence = self.skill_evidence(missing)
         try:
-            # Increased from 900 to 1500 characters for better context
-            resume_snip = clamp_text(self.resume_text, 1500)
             skills_csv = ", ".join(missing)
+            excerpt = "\n\n".join(evidence.pooled(missing, 2)) if evidence is not None else ""
+            resume_snip = self.fit_prompt({"resume": excerpt or self.resume_text}, fixed_text=skills_csv)["resume"]
             prompt = (
                 "For each of these skills, analyze why the resume appears weak or missing, and provide 2-3 actionable suggestions and one example bullet. "
                 "Return STRICT JSON of the form {skill:{detail:str, suggestions:[str], example:str}} with only these keys.\n\n"
                 f"Resume (excerpt):\n{resume_snip}\n\nSkills: {skills_csv}\n"
             )
-            resp = self.llm_chat(messages=[{"role": "user", "content": prompt}], temperature=0.2)
+            resp = self.llm_chat(messages=[{"role": "user", "content": prompt}], profile="weakness_json",
+                                 validate=covers(missing, key=""), priority="background")
             data = {}
             try:
                 data = json.loads(resp)
@@ -514,14 +708,28 @@ class ResumeAnalyzer:
                     "example": (entry.get("example") or ""),
                 })
         except Exception:
-            # Fallback to per-skill analysis
-            for skill in missing:
-                try:
-                    prompt = f"Briefly state why '{skill}' seems weak in this resume and give 2 short fixes. Resume: {resume_snip}"
-                    response = self.llm_chat(messages=[{"role": "user", "content": prompt}], temperature=0.2)
-                    weaknesses.append({"skill": skill, "detail": response[:200]})
-                except Exception:
+            # Fallback to per-skill analysis, issued concurrently
+            resume_snip = self.fit_prompt({"resume": self.resume_text}, limit=SKILL_PROMPT_TOKENS)["resume"]
+
+            def _snippet(skill):
+                chunks = evidence.context(skill, 2) if evidence is not None else []
+                if not chunks:
+                    return resume_snip
+                return self.fit_prompt({"resume": "\n\n".join(chunks)}, limit=SKILL_PROMPT_TOKENS)["resume"]
+
+            requests = [
+                {
+                    "messages": [{"role": "user", "content": f"Briefly state why '{skill}' seems weak in this resume and give 2 short fixes. Resume: {_snippet(skill)}"}],
+                    "profile": "weakness_brief",
+                    "priority": "background",
+                }
+                for skill in missing
+            ]
+            for skill, response in zip(missing, self.llm_chat_many(requests)):
+                if isinstance(response, Exception):
                     weaknesses.append({"skill": skill, "detail": "Error generating weakness"})
+                else:
+                    weaknesses.append({"skill": skill, "detail": response[:200]})
         
         self.resume_weaknesses = weaknesses
         return weaknesses
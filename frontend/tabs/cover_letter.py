@@ -12,6 +12,21 @@ def generate_cover_letter(agent: ResumeAnalysisAgent, company: str, role: str, j
         return "Error generating cover letter."
 
 
+def generate_cover_letter_stream(agent: ResumeAnalysisAgent, company: str, role: str, jd: str, tone: str, length: str):
+    try:
+        yield from agent.generate_cover_letter_stream(company=company, role=role, job_description=jd, tone=tone, length=length)
+    except Exception as e:
+        st.error(f"Error generating cover letter: {e}")
+
+
+def generate_cover_letter_variants(agent: ResumeAnalysisAgent, company: str, role: str, jd: str, tone: str, length: str, n: int):
+    try:
+        return agent.generate_cover_letter_variants(company=company, role=role, job_description=jd, tone=tone, length=length, n=n)
+    except Exception as e:
+        st.error(f"Error generating cover letters: {e}")
+        return []
+
+
 def render(agent):
     if st.session_state.resume_analyzed and agent:
         ui.cover_letter_section(
@@ -19,6 +34,12 @@ def render(agent):
             generate_cover_letter_func=lambda company, role, jd, tone, length: generate_cover_letter(
                 agent, company, role, jd, tone, length
             ),
+            generate_cover_letter_stream_func=lambda company, role, jd, tone, length: generate_cover_letter_stream(
+                agent, company, role, jd, tone, length
+            ),
+            generate_cover_letter_variants_func=lambda company, role, jd, tone, length, n: generate_cover_letter_variants(
+                agent, company, role, jd, tone, length, n
+            ),
         )
     else:
         st.warning("Please upload and analyze a resume first in the 'Resume Analysis' tab.")
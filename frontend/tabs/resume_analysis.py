@@ -45,7 +45,14 @@ ROLE_REQUIREMENTS = {
 }
 
 
-def analyze_resume(_client_unused, resume_file, role, custom_jd, quick: bool = False):
+ANALYSIS_MODES = {
+    "Quick (faster, fewer skills, skips deep weaknesses)": "quick",
+    "Full (detailed scoring and weakness analysis)": "full",
+    "Instant (keyword and embedding match, no AI calls)": "local",
+}
+
+
+def analyze_resume(_client_unused, resume_file, role, custom_jd, quick: bool = False, intensity: str | None = None):
     """Analyze resume locally using the ResumeAnalysisAgent (no backend)."""
     if not resume_file:
         st.error("Please upload a resume or select a saved resume.")
@@ -74,6 +81,7 @@ def analyze_resume(_client_unused, resume_file, role, custom_jd, quick: bool = F
                     role_requirements=ROLE_REQUIREMENTS.get(role),
                     custom_jd=custom_jd,
                     quick=quick,
+                    intensity=intensity,
                 )
             else:
                 # Analyze uploaded file
@@ -82,6 +90,7 @@ def analyze_resume(_client_unused, resume_file, role, custom_jd, quick: bool = F
                     role_requirements=ROLE_REQUIREMENTS.get(role),
                     custom_jd=custom_jd,
                     quick=quick,
+                    intensity=intensity,
                 )
                 # Save uploaded resume for reuse if user logged in
                 user = st.session_state.get("user")
@@ -107,18 +116,22 @@ def render(client=None):
     uploaded_resume = ui.resume_upload_section()
     # this will return uploaded resume
 
-    quick_mode = st.checkbox(
-        "Quick analysis (faster, fewer skills, skips deep weaknesses)",
-        value=True,
-        help="Quick mode avoids an extra JD skill extraction call and limits skills to speed up analysis.",
+    mode = st.radio(
+        "Analysis mode",
+        options=list(ANALYSIS_MODES),
+        index=0,
+        help="Quick mode avoids an extra JD skill extraction call and limits skills to speed up analysis. "
+             "Instant mode scores skills on this machine without any AI call.",
     )
+    intensity = ANALYSIS_MODES[mode]
 
     col = st.columns([1, 1, 1])
     with col[1]:
         if st.button("Analyze Resume", type="primary"):
             has_resume = uploaded_resume is not None
             if has_resume:
-                result = analyze_resume(None, uploaded_resume, role, custom_jd, quick=quick_mode)
+                result = analyze_resume(None, uploaded_resume, role, custom_jd,
+                                        quick=intensity != "full", intensity=intensity)
                 if result:
                     st.session_state.analysis_result = result
                     st.session_state.resume_analyzed = True
@@ -20,11 +20,44 @@ def get_improved_resume(_client_unused, target_role: str, highlight_skills: str)
     try:
         agent: ResumeAnalysisAgent = st.session_state.get("resume_agent")
         if not agent:
-            return "Agent not initialized. Configure provider/API key in sidebar."
+            st.error("Agent not initialized. Configure provider/API key in sidebar.")
+            return ""
         with st.spinner("Generating improved resume..."):
             return agent.get_improved_resume(target_role=target_role, highlight_skills=highlight_skills)
-    except Exception:
-        return "Error generating improved resume."
+    except Exception as e:
+        st.error(f"Error generating improved resume: {e}")
+        return ""
+
+
+def _fail(status: dict | None, message: str) -> None:
+    """Show `message` and flag the stream as failed so the caller keeps nothing from it."""
+    st.error(message)
+    if status is not None:
+        status["error"] = message
+
+
+def improve_resume_stream(improvement_areas: list, target_role: str, result: dict, status: dict | None = None):
+    """Stream improvement suggestions; on failure `status["error"]` is set and `result` must be discarded."""
+    agent: ResumeAnalysisAgent = st.session_state.get("resume_agent")
+    if not agent:
+        _fail(status, "Agent not initialized. Configure provider/API key in sidebar.")
+        return
+    try:
+        yield from agent.improve_resume_stream(improvement_areas or [], target_role, result)
+    except Exception as e:
+        _fail(status, f"Error generating improvement suggestions: {e}")
+
+
+def get_improved_resume_stream(target_role: str, highlight_skills: str, status: dict | None = None):
+    """Stream the improved resume; on failure `status["error"]` is set and the streamed text must be discarded."""
+    agent: ResumeAnalysisAgent = st.session_state.get("resume_agent")
+    if not agent:
+        _fail(status, "Agent not initialized. Configure provider/API key in sidebar.")
+        return
+    try:
+        yield from agent.get_improved_resume_stream(target_role=target_role, highlight_skills=highlight_skills)
+    except Exception as e:
+        _fail(status, f"Error generating improved resume: {e}")
 
 
 def render(client=None):
@@ -33,6 +66,8 @@ def render(client=None):
             has_resume=True,
             improve_resume_func=lambda areas, role: improve_resume(None, areas, role),
             get_improved_resume_func=lambda role, skills: get_improved_resume(None, role, skills),
+            improve_resume_stream_func=improve_resume_stream,
+            get_improved_resume_stream_func=get_improved_resume_stream,
         )
     else:
         st.warning("Please upload and analyze a resume first in the 'Resume Analysis' tab.")
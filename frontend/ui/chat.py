@@ -2,7 +2,7 @@ from typing import Callable
 import streamlit as st
 
 
-def resume_qa_section(has_resume: bool, ask_question_func: Callable):
+def resume_qa_section(has_resume: bool, ask_question_func: Callable, ask_question_stream_func: Callable | None = None):
     st.subheader("💬 Resume AI Chatbot")
     st.markdown("Ask me anything about the resume!")
     if has_resume:
@@ -20,8 +20,16 @@ def resume_qa_section(has_resume: bool, ask_question_func: Callable):
         user_question = st.chat_input("Ask a question about the resume...")
         if user_question:
             st.session_state.chat_history.append({'role': 'user', 'content': user_question})
-            with st.spinner("🤔 Thinking..."):
-                response = ask_question_func(user_question, st.session_state.chat_history[:-1])
+            if ask_question_stream_func:
+                # Render tokens as they arrive instead of waiting behind a spinner
+                with chat_container:
+                    with st.chat_message("user", avatar="👤"):
+                        st.markdown(user_question)
+                    with st.chat_message("assistant", avatar="🤖"):
+                        response = st.write_stream(ask_question_stream_func(user_question, st.session_state.chat_history[:-1]))
+            else:
+                with st.spinner("🤔 Thinking..."):
+                    response = ask_question_func(user_question, st.session_state.chat_history[:-1])
             st.session_state.chat_history.append({'role': 'assistant', 'content': response})
             st.rerun()
         if st.session_state.chat_history:
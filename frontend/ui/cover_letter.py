@@ -2,7 +2,8 @@ from typing import Callable
 import streamlit as st
 
 
-def cover_letter_section(has_resume: bool, generate_cover_letter_func: Callable):
+def cover_letter_section(has_resume: bool, generate_cover_letter_func: Callable, generate_cover_letter_stream_func: Callable | None = None,
+                         generate_cover_letter_variants_func: Callable | None = None):
     st.subheader("Generate a Tailored Cover Letter")
     if has_resume:
         col1, col2 = st.columns(2)
@@ -12,15 +13,37 @@ def cover_letter_section(has_resume: bool, generate_cover_letter_func: Callable)
             tone = st.selectbox("Tone", ["professional", "enthusiastic", "confident", "concise"], index=0)
         with col2:
             length = st.selectbox("Length", ["short (~250-300 words)", "one-page (~400-500 words)"], index=0)
+            drafts = st.selectbox("Drafts", [1, 2, 3], index=0, help="Generate several alternative letters at once") if generate_cover_letter_variants_func else 1
         jd = st.text_area("Paste Job Description (optional)", height=200, placeholder="Paste the full JD to tailor the letter more precisely")
         if st.button("Generate Cover Letter", type="primary"):
             if not company or not role:
                 st.warning("Please provide both company and role.")
             else:
-                with st.spinner("Writing your letter..."):
-                    letter = generate_cover_letter_func(company, role, jd, tone, "one-page" if length.startswith("one-page") else "short")
-                if letter and not letter.startswith("Error"):
+                length_opt = "one-page" if length.startswith("one-page") else "short"
+                if drafts > 1:
+                    with st.spinner(f"Writing {drafts} drafts..."):
+                        letters = generate_cover_letter_variants_func(company, role, jd, tone, length_opt, drafts)
+                    letters = [l for l in letters or [] if l and not l.startswith("Error")]
+                    if letters:
+                        st.markdown("### Cover Letter Drafts")
+                        for i, (tab, draft) in enumerate(zip(st.tabs([f"Draft {i + 1}" for i in range(len(letters))]), letters)):
+                            with tab:
+                                st.text_area("Letter", draft, height=500, key=f"cover_letter_output_{i}")
+                                st.download_button(label="Download Cover Letter", data=draft, file_name=f"cover_letter_{i + 1}.txt",
+                                                   mime="text/plain", key=f"cover_letter_download_{i}")
+                    else:
+                        st.error("No letter generated.")
+                    return
+                if generate_cover_letter_stream_func:
                     st.markdown("### Cover Letter")
+                    letter = st.write_stream(generate_cover_letter_stream_func(company, role, jd, tone, length_opt))
+                    letter = (letter or "").strip() if isinstance(letter, str) else ""
+                else:
+                    with st.spinner("Writing your letter..."):
+                        letter = generate_cover_letter_func(company, role, jd, tone, length_opt)
+                if letter and not letter.startswith("Error"):
+                    if not generate_cover_letter_stream_func:
+                        st.markdown("### Cover Letter")
                     st.text_area("Letter", letter, height=500, key="cover_letter_output")
                     st.download_button(label="Download Cover Letter", data=letter, file_name="cover_letter.txt", mime="text/plain")
                 else:
@@ -2,7 +2,9 @@ from typing import Callable
 import streamlit as st
 
 
-def resume_improvement_section(has_resume: bool, improve_resume_func: Callable, get_improved_resume_func: Callable):
+def resume_improvement_section(has_resume: bool, improve_resume_func: Callable, get_improved_resume_func: Callable,
+                               improve_resume_stream_func: Callable | None = None,
+                               get_improved_resume_stream_func: Callable | None = None):
     st.subheader("✨ Resume Improvement Suggestions")
     st.markdown("Get AI-powered suggestions to enhance your resume and make it stand out!")
 
@@ -38,11 +40,23 @@ def resume_improvement_section(has_resume: bool, improve_resume_func: Callable,
         with col_btn2:
             if st.button("🔍 Generate Improvement Suggestions", type="primary", use_container_width=True):
                 if improvement_areas:
-                    with st.spinner("Analyzing your resume and generating personalized suggestions..."):
-                        improvements = improve_resume_func(improvement_areas, target_role or "")
-                        st.session_state['improvement_suggestions'] = improvements
-                        st.success("✅ Improvement suggestions generated!")
-                        st.rerun()
+                    if improve_resume_stream_func:
+                        improvements, status = {}, {}
+                        with st.expander("✍️ Live output", expanded=True):
+                            st.write_stream(improve_resume_stream_func(improvement_areas, target_role or "",
+                                                                       improvements, status=status))
+                        # On failure the error stays on screen and partial output is not kept
+                        if not status.get("error"):
+                            st.session_state['improvement_suggestions'] = improvements
+                            st.success("✅ Improvement suggestions generated!")
+                            st.rerun()
+                    else:
+                        with st.spinner("Analyzing your resume and generating personalized suggestions..."):
+                            improvements = improve_resume_func(improvement_areas, target_role or "")
+                        if improvements:
+                            st.session_state['improvement_suggestions'] = improvements
+                            st.success("✅ Improvement suggestions generated!")
+                            st.rerun()
                 else:
                     st.warning("Please select at least one improvement area.")
 
@@ -161,9 +175,24 @@ def resume_improvement_section(has_resume: bool, improve_resume_func: Callable,
             with col2:
                 st.markdown("")
                 st.markdown("")
-                if st.button("✨ Generate Improved Resume", use_container_width=True):
+                generate_clicked = st.button("✨ Generate Improved Resume", use_container_width=True)
+
+            if generate_clicked:
+                if get_improved_resume_stream_func:
+                    # Stream at full width so the user sees the rewrite as it is produced
+                    status = {}
+                    improved_resume = st.write_stream(get_improved_resume_stream_func(target_role or "", highlight_skills,
+                                                                                      status=status))
+                    improved_resume = (improved_resume or "").strip() if isinstance(improved_resume, str) else ""
+                    # A failed stream keeps its error on screen; partial text is never stored or offered for download
+                    if not status.get("error") and improved_resume:
+                        st.session_state['improved_resume_text'] = improved_resume
+                        st.success("✅ Improved resume generated!")
+                        st.rerun()
+                else:
                     with st.spinner("Generating your improved resume..."):
                         improved_resume = get_improved_resume_func(target_role or "", highlight_skills)
+                    if improved_resume:
                         st.session_state['improved_resume_text'] = improved_resume
                         st.success("✅ Improved resume generated!")
                         st.rerun()
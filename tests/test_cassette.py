@@ -0,0 +1,47 @@
+import pytest
+
+from utils.cassette import Cassette, CassetteMiss, main, summarize
+
+
+def _payload(content="hi", **extra):
+    return {"model": "m", "messages": [{"role": "user", "content": content}], "temperature": 0.2,
+            "max_tokens": 64, **extra}
+
+
+def test_record_then_replay_in_order(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    recorder = Cassette(path, "record")
+    recorder.record(_payload(), "first", 0.5, usage={"prompt_tokens": 10, "completion_tokens": 2})
+    recorder.record(_payload(), "second", 0.7)
+    recorder.record(_payload("stream"), "ab", 0.3, ttfb_s=0.1, chunks=[(0.1, "a"), (0.3, "b")])
+
+    player = Cassette(path, "replay")
+    assert player.replay(_payload()) == "first"
+    assert player.replay(_payload()) == "second"
+    assert player.replay(_payload()) == "second"  # beyond the recording: the last answer repeats
+    assert list(player.replay_stream(_payload("stream"))) == ["a", "b"]
+    assert player.report()["calls"] == 4
+
+
+def test_unrecorded_prompt_is_a_listed_miss(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    Cassette(path, "record").record(_payload(), "first", 0.5)
+    player = Cassette(path, "replay")
+
+    with pytest.raises(CassetteMiss):
+        player.replay(_payload("drifted prompt"))
+    with pytest.raises(CassetteMiss):
+        player.replay(_payload(seed=7))  # decoding fields are part of the match key
+    unmatched = player.report()["unmatched"]
+    assert [u["prompt_head"] for u in unmatched] == ["drifted prompt", "hi"]
+
+
+def test_compare_flags_token_regressions(tmp_path, capsys):
+    base, grown = str(tmp_path / "base.jsonl"), str(tmp_path / "grown.jsonl")
+    Cassette(base, "record").record(_payload(), "x", 0.1, usage={"prompt_tokens": 100, "completion_tokens": 10})
+    Cassette(grown, "record").record(_payload(), "x", 0.1, usage={"prompt_tokens": 150, "completion_tokens": 10})
+
+    assert summarize(base)["prompt_tokens"] == 100
+    assert main(["compare", base, base]) == 0
+    assert main(["compare", base, grown]) == 1
+    assert "prompt_tokens: 100 -> 150  REGRESSION" in capsys.readouterr().out
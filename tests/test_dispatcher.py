@@ -0,0 +1,102 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import utils.dispatcher as dispatcher_module
+from utils.dispatcher import DispatchTag, Dispatcher
+from utils.retry_policy import DeadlineExceeded
+
+
+def _queued(dispatcher: Dispatcher) -> int:
+    return dispatcher.report()["queued"]
+
+
+def _enqueue(dispatcher: Dispatcher, tag: DispatchTag, granted: list, timeout: float = 5.0) -> threading.Thread:
+    """Start a waiter for `tag` and return once it is queued; grants are appended to `granted`."""
+    before = _queued(dispatcher)
+
+    def run():
+        release, _ = dispatcher.acquire(tag, timeout=timeout)
+        granted.append((tag.priority, tag.user))
+        release()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 2
+    while _queued(dispatcher) == before and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert _queued(dispatcher) == before + 1
+    return thread
+
+
+def _drain(threads: list) -> None:
+    for thread in threads:
+        thread.join(2)
+        assert not thread.is_alive()
+
+
+def test_priority_then_round_robin_grant_order():
+    dispatcher = Dispatcher(max_concurrency=1, aging_s=0)
+    release, _ = dispatcher.acquire(DispatchTag("standard", "holder"))
+    granted = []
+    threads = [
+        _enqueue(dispatcher, DispatchTag("background", "a"), granted),
+        _enqueue(dispatcher, DispatchTag("standard", "a"), granted),
+        _enqueue(dispatcher, DispatchTag("standard", "a"), granted),
+        _enqueue(dispatcher, DispatchTag("standard", "b"), granted),
+        _enqueue(dispatcher, DispatchTag("interactive", "c"), granted),
+    ]
+    release()
+    _drain(threads)
+
+    assert granted == [
+        ("interactive", "c"),
+        ("standard", "a"),
+        ("standard", "b"),
+        ("standard", "a"),
+        ("background", "a"),
+    ]
+    assert dispatcher.report()["in_flight"] == 0
+
+
+def test_aged_waiter_is_granted_ahead_of_higher_classes(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(dispatcher_module, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    dispatcher = Dispatcher(max_concurrency=1, aging_s=10)
+    release, _ = dispatcher.acquire(DispatchTag("interactive", "holder"))
+    granted = []
+    threads = [_enqueue(dispatcher, DispatchTag("background", "old"), granted)]
+    clock[0] += 11
+    threads.append(_enqueue(dispatcher, DispatchTag("interactive", "new"), granted))
+    release()
+    _drain(threads)
+
+    assert granted == [("background", "old"), ("interactive", "new")]
+
+
+def test_timed_out_waiter_is_removed_from_queue():
+    dispatcher = Dispatcher(max_concurrency=1, aging_s=0)
+    release, _ = dispatcher.acquire(DispatchTag("standard", "holder"))
+
+    with pytest.raises(DeadlineExceeded):
+        dispatcher.acquire(DispatchTag("standard", "late"), timeout=0.01)
+
+    report = dispatcher.report()
+    assert report["queued"] == 0
+    assert report["users_waiting"] == 0
+    assert report["classes"]["standard"]["timeouts"] == 1
+    release()
+    assert dispatcher.report()["in_flight"] == 0
+    # The slot freed by the holder is not handed to the timed-out waiter
+    release_next, _ = dispatcher.acquire(DispatchTag("standard", "next"), timeout=0.1)
+    release_next()
+
+
+def test_release_is_idempotent():
+    dispatcher = Dispatcher(max_concurrency=2)
+    release, _ = dispatcher.acquire(DispatchTag())
+    release()
+    release()
+    assert dispatcher.report()["in_flight"] == 0
@@ -0,0 +1,93 @@
+import io
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from utils.http_client import HTTPClient, _host_limits_from_env
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "session=abc")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+
+
+def test_sequential_requests_reuse_one_connection_and_keep_no_cookies(server):
+    client = HTTPClient(host_limits={}, default_limit=4, keepalive_idle_s=0)
+    for _ in range(5):
+        assert client.get(f"{server}/", timeout=5).text == "ok"
+    stats = next(iter(client.stats().values()))
+    assert stats["requests"] == 5
+    assert stats["new_connections"] == 1
+    assert stats["reuse_rate"] == 0.8
+    assert len(client.session.cookies) == 0
+
+
+def test_host_cap_bounds_in_flight_requests(monkeypatch):
+    client = HTTPClient(host_limits={"api.test": 2}, keepalive_idle_s=0)
+    gate, started = threading.Event(), []
+
+    def slow_request(method, url, **kwargs):
+        started.append(url)
+        gate.wait(2)
+        return requests.Response()
+
+    monkeypatch.setattr(client.session, "request", slow_request)
+    threads = [threading.Thread(target=client.get, args=("https://api.test/x",), kwargs={"timeout": (5, 5)})
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    assert len(started) == 2
+    gate.set()
+    for thread in threads:
+        thread.join(2)
+    stats = client.stats()["api.test"]
+    assert stats["peak_in_flight"] == 2
+    assert stats["waits"] == 2 and stats["in_flight"] == 0
+
+
+def test_slot_wait_past_the_connect_timeout_raises(monkeypatch):
+    client = HTTPClient(host_limits={"api.test": 1}, keepalive_idle_s=0)
+    def request(method, url, **kwargs):
+        resp = requests.Response()
+        resp.raw = io.BytesIO(b"")
+        return resp
+
+    monkeypatch.setattr(client.session, "request", request)
+    held = client.get("https://api.test/stream", stream=True, timeout=(1, 1))
+    with pytest.raises(requests.ConnectTimeout):
+        client.get("https://api.test/x", timeout=(0.05, 1))
+    # A streamed response keeps its slot until it is closed
+    held.close()
+    client.get("https://api.test/x", timeout=(0.05, 1))
+    assert client.stats()["api.test"]["in_flight"] == 0
+
+
+def test_env_limits_extend_the_defaults(monkeypatch):
+    monkeypatch.setenv("HTTP_HOST_CONCURRENCY", "api.example.com=3, jooble.org=2")
+    limits = _host_limits_from_env()
+    assert limits["api.example.com"] == 3
+    assert limits["jooble.org"] == 2
+    assert limits["api.groq.com"] == 32
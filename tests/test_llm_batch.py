@@ -0,0 +1,111 @@
+import json
+
+import pytest
+import requests
+
+import utils.llm_batch as llm_batch
+from utils.llm_batch import BatchClient, BatchError, BatchQueue
+from utils.retry_policy import RetryPolicy
+
+
+class FakeClient:
+    """In-memory /files + /batches: answers every request except those asking for "fail"."""
+
+    base_url = "http://batch.test/openai/v1"
+
+    def __init__(self, finish=True):
+        self.finish = finish
+        self.uploaded = []
+        self.polls = 0
+
+    def upload(self, path):
+        with open(path, encoding="utf-8") as f:
+            self.uploaded = [json.loads(line) for line in f]
+        return "file-in"
+
+    def create(self, input_file_id, completion_window="24h", metadata=None):
+        return {"id": "batch-1", "status": "validating"}
+
+    def retrieve(self, batch_id):
+        self.polls += 1
+        if not self.finish:
+            return {"id": batch_id, "status": "in_progress"}
+        return {"id": batch_id, "status": "completed", "output_file_id": "file-out", "error_file_id": "file-err"}
+
+    def content(self, file_id):
+        lines = []
+        for line in self.uploaded:
+            prompt = line["body"]["messages"][0]["content"]
+            failed = prompt == "fail"
+            if (file_id == "file-err") != failed:
+                continue
+            if failed:
+                lines.append({"custom_id": line["custom_id"], "error": {"message": "bad request"}})
+            else:
+                body = {"choices": [{"message": {"content": prompt.upper()}, "finish_reason": "stop"}],
+                        "usage": {"prompt_tokens": 5, "completion_tokens": 2}}
+                lines.append({"custom_id": line["custom_id"], "response": {"status_code": 200, "body": body}})
+        return "\n".join(json.dumps(line) for line in lines)
+
+
+def _messages(text):
+    return [{"role": "user", "content": text}]
+
+
+def test_batch_resolves_every_future_in_order(tmp_path):
+    client = FakeClient()
+    queue = BatchQueue(None, client=client, poll_interval=0, workdir=str(tmp_path), cache=False)
+    futures = [queue.submit(_messages(t)) for t in ("one", "fail", "two")]
+    job = queue.flush()
+
+    results = job.results(timeout=5)
+    assert results[0] == "ONE" and results[2] == "TWO"
+    assert isinstance(results[1], BatchError) and "bad request" in str(results[1])
+    assert [f.done() for f in futures] == [True] * 3
+    assert len(client.uploaded) == 3 and client.uploaded[0]["url"] == "/v1/chat/completions"
+    assert queue.flush() is None  # nothing left queued
+
+
+def test_results_respect_their_timeout(tmp_path):
+    client = FakeClient(finish=False)
+    queue = BatchQueue(None, client=client, poll_interval=0.01, workdir=str(tmp_path), cache=False)
+    queue.submit(_messages("one"))
+    job = queue.flush()
+    results = job.results(timeout=0.05)
+    assert isinstance(results[0], TimeoutError)
+    assert not job.done()
+    client.finish = True  # let the poller finish
+    assert job.wait(5)
+
+
+def test_failed_submission_fails_every_future(tmp_path):
+    class Broken(FakeClient):
+        def create(self, *args, **kwargs):
+            raise requests.ConnectionError("down")
+
+    queue = BatchQueue(None, client=Broken(), workdir=str(tmp_path), cache=False)
+    future = queue.submit(_messages("one"))
+    with pytest.raises(requests.ConnectionError):
+        queue.flush()
+    assert isinstance(future.exception(), requests.ConnectionError)
+
+
+def test_upload_is_retry_safe(tmp_path, monkeypatch):
+    bodies = []
+
+    class Http:
+        def request(self, method, url, files=None, **kwargs):
+            bodies.append(files["file"][1])
+            if len(bodies) == 1:
+                raise requests.ConnectionError("reset")
+            resp = requests.Response()
+            resp.status_code = 200
+            resp._content = b'{"id": "file-1"}'
+            return resp
+
+    monkeypatch.setattr(llm_batch, "get_http_client", Http)
+    path = tmp_path / "in.jsonl"
+    path.write_bytes(b'{"a": 1}\n')
+    client = BatchClient("key", "http://batch.test", policy=RetryPolicy(max_attempts=2, base_delay=0))
+    assert client.upload(str(path)) == "file-1"
+    assert bodies == [b'{"a": 1}\n'] * 2
@@ -0,0 +1,74 @@
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+import utils.llm_cache as llm_cache
+from utils.llm_cache import LLMCache, make_cache_key, payload_cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def _payload(**extra):
+    return {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0.2, "max_tokens": 64, **extra}
+
+
+def test_key_is_stable_and_covers_decoding_fields():
+    messages = [{"role": "user", "content": "hi"}]
+    assert make_cache_key("m", messages, 0.2, 64) == make_cache_key("m", list(messages), 0.2, 64)
+    assert make_cache_key("m", messages, 0.2, 64) != make_cache_key("m", messages, 0.3, 64)
+    assert payload_cache_key(_payload()) != payload_cache_key(_payload(seed=1))
+    assert payload_cache_key(_payload()) != payload_cache_key(_payload(response_format={"type": "json_object"}))
+    assert payload_cache_key(_payload(seed=None)) == payload_cache_key(_payload())
+
+
+def test_round_trip_and_ttl_expiry(tmp_path, clock):
+    cache = LLMCache(str(tmp_path / "c.sqlite3"), ttl_seconds=60, max_bytes=10**6)
+    cache.set("k", "value", "m")
+    assert cache.get("k") == "value"
+    clock[0] += 61
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+
+def test_eviction_drops_least_recently_used_first(tmp_path, clock):
+    cache = LLMCache(str(tmp_path / "c.sqlite3"), ttl_seconds=0, max_bytes=350)
+    for name in ("a", "b", "c"):
+        cache.set(name, "x" * 100)
+        clock[0] += 1
+    assert cache.get("a") == "x" * 100  # "a" is now the most recently used
+    clock[0] += 1
+    cache.set("d", "x" * 100)
+    cache.evict()
+
+    assert cache.get("b") is None
+    assert all(cache.get(k) for k in ("a", "c", "d"))
+    assert cache.stats()["bytes"] <= 350
+
+
+def test_store_errors_are_misses_and_skipped_writes(tmp_path):
+    path = tmp_path / "c.sqlite3"
+    LLMCache(str(path)).set("k", "value")
+    cache = LLMCache(str(path))
+    cache._conn.close()
+    cache._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+
+    cache.set("other", "value")  # read-only database: the write is skipped, not raised
+    assert cache.get("other") is None
+    cache._conn.execute("PRAGMA query_only = ON")
+    assert cache.get("k") is None  # last_access update fails: treated as a miss
+    assert cache.stats()["errors"] == 2
+
+
+def test_missing_table_reads_as_miss(tmp_path):
+    cache = LLMCache(str(tmp_path / "c.sqlite3"))
+    cache._conn.execute("DROP TABLE responses")
+    assert cache.get("k") is None
+    cache.set("k", "value")
+    assert cache.errors == 2
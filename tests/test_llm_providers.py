@@ -0,0 +1,152 @@
+import json
+from datetime import timedelta
+
+import pytest
+
+import utils.llm_providers as providers
+from utils.dispatcher import DispatchTag
+from utils.retry_policy import RetryPolicy
+
+
+class _Response:
+    status_code = 200
+    headers = {}
+
+    def close(self):
+        pass
+
+
+def test_rate_limit_pacing_happens_before_taking_a_dispatch_slot(monkeypatch):
+    calls = []
+
+    class Limiter:
+        def acquire(self, api_key, tokens, max_wait_s=None):
+            calls.append("pace")
+            return 0.0
+
+        def update_from_headers(self, api_key, headers):
+            calls.append("headers")
+
+    class Dispatcher:
+        def acquire(self, tag, timeout=None):
+            calls.append("slot")
+            return (lambda: calls.append("release")), 0.0
+
+    def post(url, headers=None, json=None, timeout=None, stream=False):
+        calls.append("post")
+        return _Response()
+
+    monkeypatch.setattr(providers, "get_rate_limiter", Limiter)
+    monkeypatch.setattr(providers, "get_dispatcher", Dispatcher)
+    monkeypatch.setattr(providers.SESSION, "post", post)
+
+    resp = providers._post_with_retries("http://groq.test/chat", {}, {"messages": [], "model": "m"},
+                                        api_key="key", policy=RetryPolicy(max_attempts=1), dispatch=DispatchTag())
+
+    assert isinstance(resp, _Response)
+    assert calls == ["pace", "slot", "post", "headers", "release"]
+
+
+class _JSONResponse(_Response):
+    def __init__(self, body, status_code=200):
+        self._body = body
+        self.status_code = status_code
+        self.elapsed = timedelta(seconds=0.01)
+
+    def json(self):
+        return self._body
+
+
+def test_groq_chat_refunds_unused_max_tokens(monkeypatch):
+    refunds = []
+
+    class Limiter:
+        def acquire(self, api_key, tokens, max_wait_s=None):
+            return 0.0
+
+        def update_from_headers(self, api_key, headers):
+            pass
+
+        def refund(self, api_key, tokens):
+            refunds.append(tokens)
+
+    body = {"choices": [{"message": {"content": "short"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": 20, "completion_tokens": 96}}
+    monkeypatch.setenv("LLM_CACHE_DISABLED", "1")
+    monkeypatch.setattr(providers, "get_rate_limiter", Limiter)
+    monkeypatch.setattr(providers, "get_dispatcher", lambda: None)
+    monkeypatch.setattr(providers, "get_output_sizer", lambda: None)
+    monkeypatch.setattr(providers.SESSION, "post", lambda *a, **k: _JSONResponse(body))
+
+    assert providers.groq_chat("key", [{"role": "user", "content": "hi"}], max_tokens=4096) == "short"
+    assert refunds == [4000]
+
+
+class _Sizer:
+    """Learned cap of 64 tokens for every site."""
+
+    def suggest(self, site, prompt_tokens, ceiling):
+        return min(ceiling, 64)
+
+    def record(self, site, prompt_tokens, completion_tokens):
+        pass
+
+
+class _StreamResponse(_Response):
+    def __init__(self, pieces, finish_reason):
+        self.elapsed = timedelta(seconds=0.01)
+        chunks = [{"choices": [{"delta": {"content": p}}]} for p in pieces]
+        chunks.append({"choices": [{"delta": {}, "finish_reason": finish_reason}],
+                       "x_groq": {"usage": {"prompt_tokens": 10, "completion_tokens": 64}}})
+        self._lines = [f"data: {json.dumps(c)}" for c in chunks] + ["data: [DONE]"]
+
+    def iter_lines(self, decode_unicode=False):
+        return iter(self._lines)
+
+
+@pytest.fixture
+def truncating_transport(monkeypatch):
+    """Every reply stops at its cap ("length"); returns the payloads sent."""
+    sent = []
+
+    def post(url, headers=None, json=None, timeout=None, stream=False):
+        sent.append(json)
+        if stream:
+            return _StreamResponse(['{"a": ', '"b'], "length")
+        body = {"choices": [{"message": {"content": '{"a": "b'}, "finish_reason": "length"}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 64}}
+        return _JSONResponse(body)
+
+    monkeypatch.setenv("LLM_CACHE_DISABLED", "1")
+    monkeypatch.setattr(providers, "get_rate_limiter", lambda: None)
+    monkeypatch.setattr(providers, "get_dispatcher", lambda: None)
+    monkeypatch.setattr(providers, "get_output_sizer", _Sizer)
+    monkeypatch.setattr(providers.SESSION, "post", post)
+    return sent
+
+
+MESSAGES = [{"role": "user", "content": "Return JSON"}]
+
+
+def test_json_reply_is_neither_capped_nor_continued(truncating_transport):
+    providers.groq_chat("key", MESSAGES, max_tokens=2000, response_format={"type": "json_object"})
+    assert [p["max_tokens"] for p in truncating_transport] == [2000]
+
+    truncating_transport.clear()
+    providers.groq_chat("key", MESSAGES, max_tokens=2000)
+    # Free text goes out at the learned cap and is continued after hitting it
+    assert truncating_transport[0]["max_tokens"] == 64
+    assert len(truncating_transport) == 3
+
+
+def test_streamed_json_reply_is_neither_capped_nor_continued(truncating_transport):
+    text = "".join(providers.groq_chat_stream("key", MESSAGES, max_tokens=2000,
+                                              response_format={"type": "json_object"}))
+    assert text == '{"a": "b'
+    assert [p["max_tokens"] for p in truncating_transport] == [2000]
+    assert "response_format" not in truncating_transport[0]
+
+    truncating_transport.clear()
+    list(providers.groq_chat_stream("key", MESSAGES, max_tokens=2000))
+    assert truncating_transport[0]["max_tokens"] == 64
+    assert len(truncating_transport) == 3
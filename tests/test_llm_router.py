@@ -0,0 +1,94 @@
+import pytest
+import requests
+
+import utils.llm_router as llm_router
+from utils.llm_router import LLMRouter, parse_weighted
+from utils.retry_policy import GROQ_POLICY, Deadline
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.headers = {}
+        self.text = ""
+
+
+def _http_error(status):
+    return requests.HTTPError(f"{status}", response=_Response(status))
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Replace the transport: `outcomes[(key, model)]` is raised or returned; calls are logged."""
+    log, outcomes = [], {}
+
+    def fake_chat(api_key, messages, model, temperature, max_tokens, policy=None, base_url=None, **kwargs):
+        log.append({"key": api_key, "model": model, "policy": policy, "deadline": kwargs.get("deadline")})
+        outcome = outcomes.get((api_key, model), f"ok from {api_key}/{model}")
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(llm_router, "groq_chat", fake_chat)
+    monkeypatch.setattr(llm_router, "get_rate_limiter", lambda: None)
+    # Weighted picks take the first usable route, so failover order is deterministic
+    monkeypatch.setattr(llm_router.random, "uniform", lambda a, b: a)
+    return log, outcomes
+
+
+def test_parse_weighted():
+    assert parse_weighted("a:2, b ,c:0.5,,") == {"a": 2.0, "b": 1.0, "c": 0.5}
+    assert parse_weighted("http://x:8080") == {"http://x": 8080.0}
+    assert parse_weighted(None) == {}
+
+
+def test_every_route_is_tried_once_on_one_deadline(calls):
+    log, outcomes = calls
+    router = LLMRouter({"router-k1": 1.0, "router-k2": 1.0}, {"m1": 1.0})
+    outcomes[("router-k1", "m1")] = _http_error(429)
+    outcomes[("router-k2", "m1")] = _http_error(503)
+    with pytest.raises(requests.HTTPError):
+        router.chat([{"role": "user", "content": "hi"}], deadline=30)
+
+    assert [c["key"] for c in log] == ["router-k1", "router-k2"]
+    # Only the last route runs with the full retry policy
+    assert log[0]["policy"] is router.failover_policy and log[1]["policy"] is GROQ_POLICY
+    assert isinstance(log[0]["deadline"], Deadline)
+    assert log[0]["deadline"] is log[1]["deadline"]
+    assert sum(s["failures"] for s in router.stats()) == 2
+
+
+def test_fails_over_and_cools_down_the_failed_route(calls):
+    log, outcomes = calls
+    router = LLMRouter({"router-k7": 1.0, "router-k8": 1.0}, {"m1": 1.0})
+    outcomes[("router-k7", "m1")] = _http_error(429)
+    assert router.chat([{"role": "user", "content": "hi"}]) == "ok from router-k8/m1"
+    assert [c["key"] for c in log] == ["router-k7", "router-k8"]
+
+    log.clear()
+    for _ in range(5):
+        assert router.chat([{"role": "user", "content": "hi"}]) == "ok from router-k8/m1"
+    # router-k7 is cooling down after its 429 and is no longer picked
+    assert {c["key"] for c in log} == {"router-k8"}
+
+
+def test_falls_back_to_the_next_model_when_every_key_fails(calls):
+    log, outcomes = calls
+    router = LLMRouter({"router-k3": 1.0}, {"big": 1.0, "small": 1.0})
+    outcomes[("router-k3", "big")] = _http_error(404)
+    assert router.chat([{"role": "user", "content": "hi"}]) == "ok from router-k3/small"
+    assert [c["model"] for c in log] == ["big", "small"]
+
+
+def test_caller_errors_are_not_failed_over(calls):
+    log, outcomes = calls
+    router = LLMRouter({"router-k4": 1.0, "router-k5": 1.0}, {"m1": 1.0})
+    outcomes[("router-k4", "m1")] = outcomes[("router-k5", "m1")] = _http_error(400)
+    with pytest.raises(requests.HTTPError):
+        router.chat([{"role": "user", "content": "hi"}])
+    assert len(log) == 1
+
+
+def test_shared_breakers_with_the_groq_policy():
+    router = LLMRouter({"router-k6": 1.0}, {"m1": 1.0})
+    assert router.failover_policy.breaker("groq:x") is GROQ_POLICY.breaker("groq:x")
@@ -0,0 +1,49 @@
+from utils.local_scoring import SEMANTIC_ONLY_MAX, lexical_evidence, score_skills, split_sections
+
+RESUME = """Jane Doe
+Backend engineer.
+
+Skills
+Python, Kubernetes, Go
+
+Work Experience
+Built Python services on k8s and migrated them to Go.
+"""
+
+
+def test_split_sections_at_headings():
+    sections = [name for name, _ in split_sections(RESUME)]
+    assert sections == ["summary", "skills", "experience"]
+    assert split_sections("Just some text\nwith no headings") == [("other", "Just some text\nwith no headings")]
+
+
+def test_ordinary_prose_is_not_skill_evidence():
+    prose = "Built the next version of our shell tools. We go to the torch relay, then express thanks to ts fans."
+    skills = ["Next.js", "Bash", "Go", "PyTorch", "Express.js", "TypeScript", "Next", "Shell", "Torch"]
+    assert lexical_evidence(prose, skills) == {skill: {} for skill in skills}
+    assert all(score == 0 for _, score, _ in score_skills(prose, skills))
+
+
+def test_capitalized_short_spellings_still_count():
+    hits = lexical_evidence("Shipped services in Go and TS, trained models with Torch.", ["Go", "TypeScript", "PyTorch"])
+    assert hits == {"Go": {"other": 1}, "TypeScript": {"other": 1}, "PyTorch": {"other": 1}}
+
+
+def test_aliases_count_per_section():
+    hits = lexical_evidence(RESUME, ["Kubernetes", "Python", "Docker"])
+    assert hits == {"Kubernetes": {"skills": 1, "experience": 1}, "Python": {"skills": 1, "experience": 1},
+                    "Docker": {}}
+
+
+def test_applied_use_outscores_a_listing():
+    resume = "Skills\nRedis\n\nExperience\nBuilt Kafka pipelines; tuned Kafka consumers.\n"
+    scores = {skill: score for skill, score, _ in score_skills(resume, ["Redis", "Kafka", "Python"])}
+    assert scores == {"Redis": 6, "Kafka": 8, "Python": 0}
+
+
+def test_semantic_evidence_alone_is_capped():
+    scored = score_skills("Experience\nWrote data pipelines.", ["Airflow", "Kafka"], best_similarity=[0.95, 0.65],
+                          low=0.6, high=0.85)
+    assert [score for _, score, _ in scored] == [SEMANTIC_ONLY_MAX, 2]
+    mentioned = score_skills("Experience\nRan Airflow.", ["Airflow"], best_similarity=[0.95], low=0.6, high=0.85)
+    assert mentioned[0][1] == 8
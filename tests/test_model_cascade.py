@@ -0,0 +1,62 @@
+import pytest
+
+from utils.model_cascade import (
+    all_of, cascade_chat, cascade_tiers, covers, get_cascade_stats, json_object, load_json, min_length,
+)
+from utils.retry_policy import DeadlineExceeded
+
+MODELS = ["small", "medium", "large"]
+
+
+def _chat(replies: dict, log: list):
+    def chat(messages, model=None, **kwargs):
+        log.append(model)
+        reply = replies[model]
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+    return chat
+
+
+def test_tiers_stop_at_the_selected_model():
+    assert cascade_tiers(MODELS, "medium") == ["small", "medium"]
+    assert cascade_tiers(MODELS, "other") == MODELS + ["other"]
+    assert cascade_tiers(MODELS, None) == MODELS
+
+
+def test_validators():
+    assert load_json('Here:\n```json\n{"a": 1}\n```') == {"a": 1}
+    check = json_object(("skills",), {"skills": 2})
+    assert check('{"skills": ["a", "b"]}') is None
+    assert check('{"skills": ["a"]}') == "skills: fewer than 2 items"
+    assert check("prose") == "not a JSON object"
+    assert covers(["Python", "SQL"], key="scores")('{"scores": {"python": 7}}') == "covers 1/2 items"
+    assert all_of(min_length(3), covers(["x"]))("ab") == "too short (2 < 3 chars)"
+
+
+def test_small_model_answer_is_kept_when_valid():
+    log = []
+    text = cascade_chat(_chat({"small": '{"ok": 1}'}, log), [], MODELS, json_object(("ok",)), site="cascade-valid")
+    assert text == '{"ok": 1}'
+    assert log == ["small"]
+    assert get_cascade_stats().report()["cascade-valid"]["escalation_rate"] == 0.0
+
+
+def test_escalates_on_invalid_or_failed_replies_and_returns_the_last_tier_as_is():
+    log = []
+    replies = {"small": "prose", "medium": RuntimeError("503"), "large": "still prose"}
+    text = cascade_chat(_chat(replies, log), [], MODELS, json_object(), site="cascade-escalate")
+
+    assert text == "still prose"
+    assert log == MODELS
+    report = get_cascade_stats().report()["cascade-escalate"]
+    assert report["escalation_rate"] == 1.0
+    assert report["answered_by"] == {"large": 1}
+    assert report["reasons"] == {"not a JSON object": 1, "error": 1}
+
+
+def test_spent_deadline_is_not_escalated():
+    log = []
+    with pytest.raises(DeadlineExceeded):
+        cascade_chat(_chat({"small": DeadlineExceeded("late")}, log), [], MODELS, json_object(), site="cascade-late")
+    assert log == ["small"]
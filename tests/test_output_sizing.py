@@ -0,0 +1,36 @@
+from utils.output_sizing import OutputSizer, input_bucket
+
+
+def test_input_buckets_are_powers_of_two():
+    assert [input_bucket(n) for n in (0, 256, 257, 1500)] == [256, 256, 512, 2048]
+
+
+def test_caller_cap_is_kept_until_enough_samples():
+    sizer = OutputSizer(min_samples=5)
+    for _ in range(4):
+        sizer.record("rewrite", 400, 300)
+    assert sizer.suggest("rewrite", 400, 4000) == 4000
+    sizer.record("rewrite", 400, 300)
+    # p99 300 * 1.15 + 16 = 361 -> next step 384
+    assert sizer.suggest("rewrite", 400, 4000) == 384
+
+
+def test_suggestion_never_exceeds_the_caller_cap_and_is_per_bucket():
+    sizer = OutputSizer(min_samples=3)
+    for _ in range(3):
+        sizer.record("letter", 100, 900)
+    assert sizer.suggest("letter", 100, 600) == 600
+    assert sizer.suggest("letter", 100, 4000) == 1536
+    assert sizer.suggest("letter", 5000, 4000) == 4000  # other input-size bucket: no samples yet
+    assert sizer.suggest("other", 100, 4000) == 4000
+
+
+def test_report_lists_quantiles_and_suggestions():
+    sizer = OutputSizer(min_samples=2)
+    sizer.record("qa", 10, 100)
+    sizer.record("qa", 10, 200)
+    sizer.record("qa", 10, 0)  # nothing generated: not a sample
+    report = sizer.report()["qa/256"]
+    assert report["samples"] == 2
+    assert report["p99_tokens"] == 200
+    assert report["suggested_max_tokens"] == 256
@@ -0,0 +1,39 @@
+from utils.prompt_budget import (
+    DEFAULT_CONTEXT_WINDOW, SAFETY_TOKENS, allocate, count_tokens, fit_prompt_parts, prompt_budget, trim_to_tokens,
+)
+
+MODEL = "llama-3.1-8b-instant"
+
+
+def test_trim_cuts_on_token_boundaries():
+    text = "word " * 500
+    trimmed = trim_to_tokens(text, 50, MODEL)
+    assert count_tokens(trimmed, MODEL) <= 50
+    assert text.startswith(trimmed)
+    assert trim_to_tokens("short", 50, MODEL) == "short"
+    assert trim_to_tokens(text, 0, MODEL) == ""
+
+
+def test_budget_is_bounded_by_window_and_limit():
+    assert prompt_budget(MODEL, 600, fixed_tokens=100, limit=3000) == 2900
+    unknown = prompt_budget("unknown-model", 8000, limit=100000)
+    assert unknown == DEFAULT_CONTEXT_WINDOW - 8000 - SAFETY_TOKENS
+    assert prompt_budget("unknown-model", 10**6) == 0
+
+
+def test_allocate_hands_unused_share_to_longer_parts():
+    assert allocate({"jd": 100, "resume": 5000}, 1000) == {"jd": 100, "resume": 900}
+    alloc = allocate({"a": 5000, "b": 5000}, 1000, weights={"a": 3, "b": 1})
+    assert alloc == {"a": 750, "b": 250}
+    assert allocate({"empty": 0, "x": 10}, 100) == {"empty": 0, "x": 10}
+
+
+def test_fit_prompt_parts_trims_only_what_is_needed():
+    parts = {"resume": "experience " * 2000, "jd": "python role", "history": None}
+    fitted = fit_prompt_parts(parts, MODEL, reserve_output=600, fixed_text="Instructions", limit=500)
+
+    assert fitted["jd"] == "python role"
+    assert fitted["history"] == ""
+    total = sum(count_tokens(t, MODEL) for t in fitted.values()) + count_tokens("Instructions", MODEL)
+    assert total <= 500
+    assert fit_prompt_parts({"jd": "python role"}, MODEL, limit=500) == {"jd": "python role"}
@@ -0,0 +1,64 @@
+import threading
+
+from utils.rate_limiter import RateLimiter
+
+
+def _acquire_concurrently(limiter: RateLimiter, key: str, count: int) -> list:
+    waits, barrier = [], threading.Barrier(count)
+
+    def acquire():
+        barrier.wait()
+        waits.append(limiter.acquire(key))
+
+    threads = [threading.Thread(target=acquire) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(2)
+    return waits
+
+
+def test_concurrent_acquires_spend_the_budget_exactly_once_each():
+    limiter = RateLimiter(rpm=5, tpm=100000, max_wait_s=5)
+    waits = _acquire_concurrently(limiter, "key", 5)
+
+    assert len(waits) == 5 and max(waits) < 0.05
+    stats = limiter.stats()
+    assert stats["acquired"] == 5
+    assert stats["queue_depth"] == 0
+    assert stats["keys"][next(iter(stats["keys"]))]["requests_available"] < 0.1
+    # The budget is gone: the next caller waits out its own cap, then is let through
+    assert limiter.acquire("key", max_wait_s=0.05) >= 0.04
+
+
+def test_penalty_holds_back_waiters_up_to_their_cap():
+    limiter = RateLimiter(rpm=60, tpm=100000, max_wait_s=5)
+    limiter.penalize("key", 0.2)
+    waited = limiter.acquire("key", max_wait_s=0.05)
+    assert 0.04 <= waited < 0.2
+
+
+def test_keys_are_paced_independently():
+    limiter = RateLimiter(rpm=1, tpm=100000, max_wait_s=5)
+    limiter.penalize("a", 10)
+    assert limiter.acquire("b") < 0.01
+    assert limiter.acquire("b", max_wait_s=0.01) >= 0.005
+    assert limiter.stats()["queue_depth"] == 0
+
+
+def test_refund_returns_unused_completion_reservation():
+    limiter = RateLimiter(rpm=100, tpm=6000, max_wait_s=0.05)
+    limiter.acquire("key", tokens=4096 + 200)
+    limiter.refund("key", 4096 - 300)
+    available = limiter.stats()["keys"][next(iter(limiter.stats()["keys"]))]["tokens_available"]
+    assert 5400 <= available <= 5600
+    # A second large reservation fits without waiting out the minute
+    assert limiter.acquire("key", tokens=4096 + 200) < 0.01
+    assert limiter.stats()["tokens_refunded"] == 3796
+
+
+def test_refund_never_exceeds_capacity_and_ignores_overruns():
+    limiter = RateLimiter(rpm=100, tpm=6000)
+    limiter.refund("key", 10_000)
+    limiter.refund("key", -50)
+    assert limiter.stats()["keys"][next(iter(limiter.stats()["keys"]))]["tokens_available"] == 6000
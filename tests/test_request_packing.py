@@ -0,0 +1,57 @@
+import json
+
+from utils.request_packing import build_packed_prompt, parse_packed_response, run_packed
+
+
+def test_prompt_numbers_items_and_sends_context_once():
+    prompt = build_packed_prompt(["Python", "SQL"], "Resume: ...", "Rate each skill.", item_label="Skill")
+    assert prompt.count("Resume: ...") == 1
+    assert "1. Python\n2. SQL" in prompt
+    assert "with exactly 2 keys" in prompt
+
+
+def test_parse_accepts_fenced_keyed_and_list_replies():
+    assert parse_packed_response('```json\n{"1": "a", "2": "b"}\n```', 2) == {0: "a", 1: "b"}
+    assert parse_packed_response('Sure! {"item 2": "b", "9": "out of range"} Done.', 2) == {1: "b"}
+    listed = '{"answers": [{"id": 2, "answer": "b"}, {"id": 1, "answer": "a"}]}'
+    assert parse_packed_response(listed, 2) == {0: "a", 1: "b"}
+    assert parse_packed_response('["a", "b", "c"]', 2) == {0: "a", 1: "b"}
+    assert parse_packed_response("not json", 2) == {}
+
+
+def test_run_packed_splits_into_packs_and_falls_back_per_missing_item():
+    sent = []
+
+    def chat_many(requests):
+        sent.extend(requests)
+        replies = []
+        for request in requests:
+            prompt = request["messages"][0]["content"]
+            count = int(prompt.split("with exactly ")[1].split()[0])
+            # The model drops the last item of every pack
+            replies.append(json.dumps({str(i): f"answer {i}" for i in range(1, count)}))
+        return replies
+
+    fallback_calls = []
+
+    def fallback(failed):
+        fallback_calls.append(list(failed))
+        return [f"single {i}" for i in failed]
+
+    results = run_packed(chat_many, [f"q{i}" for i in range(5)], "ctx", "Answer.", fallback=fallback, max_items=3)
+
+    assert len(sent) == 2
+    assert [r["max_tokens"] for r in sent] == [3 * 250 + 32, 2 * 250 + 32]
+    assert results == ["answer 1", "answer 2", "single 2", "answer 1", "single 4"]
+    assert fallback_calls == [[2, 4]]
+
+
+def test_failed_pack_and_rejected_items_use_the_fallback():
+    def parse_item(i, value):
+        if value == "bad":
+            raise ValueError("unparseable")
+        return value
+
+    results = run_packed(lambda reqs: [RuntimeError("429"), '{"1": "bad"}'], ["a", "b"], "", "Answer.",
+                         parse_item=parse_item, fallback=lambda failed: [f"single {i}" for i in failed], max_items=1)
+    assert results == ["single 0", "single 1"]
@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+import requests
+
+import utils.retry_policy as retry_policy
+from utils.retry_policy import CircuitBreaker, CircuitOpenError, RetryPolicy
+
+
+def test_breaker_opens_after_threshold_and_allows_one_half_open_probe():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+    breaker.record_failure("503")
+    assert breaker.state == "closed"
+    breaker.record_failure("503")
+    assert breaker.state == "half_open"
+
+    passed, rejected = [], []
+    barrier = threading.Barrier(8)
+
+    def call():
+        barrier.wait()
+        try:
+            breaker.before_call()
+            passed.append(1)
+        except CircuitOpenError:
+            rejected.append(1)
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(2)
+
+    assert len(passed) == 1
+    assert len(rejected) == 7
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure("timeout")
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_concurrent_lookups_share_one_breaker_per_key():
+    policy = RetryPolicy()
+    seen = []
+    barrier = threading.Barrier(16)
+
+    def lookup():
+        barrier.wait()
+        seen.append(policy.breaker("groq:abc"))
+
+    threads = [threading.Thread(target=lookup) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(2)
+
+    assert len({id(b) for b in seen}) == 1
+    assert list(policy.breaker_states()) == ["groq:abc"]
+
+
+class _Response:
+    def __init__(self, status_code, headers=None, text=""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+        self.reason = "Too Many Requests" if status_code == 429 else "Error"
+
+    def close(self):
+        pass
+
+
+def test_backoff_clamps_server_hint_to_max_delay():
+    policy = RetryPolicy(max_delay=8.0, base_delay=0.5, jitter=0.5)
+    delay = policy.backoff(0, _Response(429, {"retry-after": "5"}))
+    assert 5.0 <= delay <= 5.25
+    assert policy.backoff(0, _Response(429, {"x-ratelimit-remaining-requests": "0",
+                                             "x-ratelimit-reset-requests": "2h"})) <= 8.25
+
+
+def test_long_retry_after_fails_at_once_without_sleeping(monkeypatch):
+    sleeps, retries, sends = [], [], []
+    monkeypatch.setattr(retry_policy.time, "sleep", sleeps.append)
+    policy = RetryPolicy(max_attempts=3, max_delay=8.0)
+
+    def send(timeout):
+        sends.append(timeout)
+        return _Response(429, {"retry-after": "3600"})
+
+    with pytest.raises(requests.HTTPError, match="3600s"):
+        policy.execute(send, breaker_key="groq:k", on_retry=lambda resp, delay: retries.append(delay))
+    assert len(sends) == 1
+    assert sleeps == [] and retries == []
+
+
+def test_short_retry_after_is_retried(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(retry_policy.time, "sleep", sleeps.append)
+    responses = iter([_Response(429, {"retry-after": "2"}), _Response(200)])
+    resp = RetryPolicy(max_attempts=3, max_delay=8.0).execute(lambda timeout: next(responses))
+    assert resp.status_code == 200
+    assert len(sleeps) == 1 and 2.0 <= sleeps[0] <= 2.5
@@ -0,0 +1,62 @@
+import numpy as np
+
+from utils.semantic_cache import SemanticCache, normalize_question, scope_key
+
+VECTORS = {
+    "what are weaknesses": [1.0, 0.0, 0.0],
+    "what are biggest weaknesses resume": [1.0, 0.0, 0.0],
+    "what are biggest weak points resume": [0.95, 0.31, 0.0],
+    "what are biggest strengths resume": [0.0, 1.0, 0.0],
+    "python": [0.0, 0.0, 1.0],
+    "java": [0.0, 0.2, 0.98],
+}
+
+
+def embed(text):
+    return np.asarray(VECTORS[text], dtype=np.float32)
+
+
+def test_normalize_drops_filler_and_punctuation():
+    assert normalize_question("Hey, can you tell me: what are my weaknesses?") == "what are weaknesses"
+    assert normalize_question("the") == "the"
+
+
+def test_paraphrase_hits_within_a_scope_only():
+    cache = SemanticCache(threshold=0.9)
+    scope = scope_key("r1", kind="weakness")
+    answer, vector = cache.get("r1", scope, "What are my biggest weaknesses in the resume?", embed)
+    assert answer is None
+    cache.put("r1", scope, "What are my biggest weaknesses in the resume?", "Testing.", vector)
+
+    assert cache.get("r1", scope, "what are the biggest weak points in my resume", embed)[0] == "Testing."
+    assert cache.get("r1", scope_key("r1", kind="strength"), "what are the biggest weak points in my resume", embed)[0] is None
+    assert cache.get("r2", scope_key("r2", kind="weakness"), "what are the biggest weak points in my resume", embed)[0] is None
+    assert cache.get("r1", scope, "What are my biggest strengths in the resume?", embed)[0] is None
+
+
+def test_short_questions_need_the_stricter_threshold():
+    cache = SemanticCache(threshold=0.9, short_threshold=0.99)
+    scope = scope_key("r1")
+    _, vector = cache.get("r1", scope, "Python?", embed)
+    cache.put("r1", scope, "Python?", "Five years.", vector)
+    assert cache.get("r1", scope, "Java?", embed)[0] is None  # cosine 0.98: close, but a different skill
+    assert cache.get("r1", scope, "python", embed)[0] == "Five years."
+
+
+def test_scope_changes_with_analysis_and_history():
+    assert scope_key("r1", {"score": 1}) != scope_key("r1", {"score": 2})
+    assert scope_key("r1", history=[{"role": "user", "content": "hi"}]) != scope_key("r1")
+
+
+def test_lru_bounds_per_resume_and_across_resumes():
+    cache = SemanticCache(max_entries=2, max_resumes=2, short_threshold=0.99)
+    for question in ("python", "java", "what are weaknesses"):
+        cache.put("r1", "s", question, question.upper(), embed(question))
+    assert cache.stats()["entries"] == 2
+    assert cache.get("r1", "s", "python", embed)[0] is None
+    cache.put("r2", "s", "python", "P", embed("python"))
+    cache.put("r3", "s", "python", "P", embed("python"))
+    assert cache.stats()["resumes"] == 2
+    assert cache.get("r1", "s", "java", embed)[0] is None
+    cache.invalidate("r3")
+    assert cache.stats()["resumes"] == 1
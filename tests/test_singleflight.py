@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from utils.retry_policy import DeadlineExceeded
+from utils.singleflight import SingleFlight
+
+
+def _start_leader(flight: SingleFlight, key: str, fn, results: list) -> threading.Thread:
+    thread = threading.Thread(target=lambda: results.append(flight.do(key, fn)), daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 2
+    while flight.stats()["in_flight"] == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    assert flight.stats()["in_flight"] == 1
+    return thread
+
+
+def test_concurrent_callers_share_one_call():
+    flight, gate, calls, results = SingleFlight(), threading.Event(), [], []
+
+    def fn():
+        calls.append(1)
+        gate.wait(2)
+        return "value"
+
+    leader = _start_leader(flight, "k", fn, results)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", fn)), daemon=True) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    while flight.stats()["coalesced"] < 4:
+        time.sleep(0.001)
+    gate.set()
+    for thread in [leader] + followers:
+        thread.join(2)
+
+    assert calls == [1]
+    assert results == ["value"] * 5
+    assert flight.stats() == {"in_flight": 0, "leaders": 1, "coalesced": 4}
+
+
+def test_leader_exception_reaches_followers():
+    flight, gate, errors = SingleFlight(), threading.Event(), []
+
+    def fn():
+        gate.wait(2)
+        raise ValueError("boom")
+
+    def follow():
+        try:
+            flight.do("k", fn)
+        except ValueError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=follow, daemon=True)
+    leader.start()
+    while flight.stats()["in_flight"] == 0:
+        time.sleep(0.001)
+    follower = threading.Thread(target=follow, daemon=True)
+    follower.start()
+    while flight.stats()["coalesced"] == 0:
+        time.sleep(0.001)
+    gate.set()
+    leader.join(2)
+    follower.join(2)
+
+    assert errors == ["boom", "boom"]
+
+
+def test_follower_gives_up_at_its_deadline():
+    flight, gate, results = SingleFlight(), threading.Event(), []
+    leader = _start_leader(flight, "k", lambda: gate.wait(2) and "value", results)
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        flight.do("k", lambda: "unused", deadline=0.05)
+    assert time.monotonic() - start < 1
+
+    gate.set()
+    leader.join(2)
+    assert results == ["value"]
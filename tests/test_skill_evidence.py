@@ -0,0 +1,43 @@
+import numpy as np
+
+from utils.skill_evidence import EvidenceMatrix, unit_rows
+
+CHUNKS = ["python chunk", "kafka chunk", "mixed chunk", "other chunk"]
+CHUNK_VECTORS = [[1, 0, 0], [0, 1, 0], [1, 1, 0], [0, 0, 1]]
+
+
+def _matrix():
+    return EvidenceMatrix(["Python", "Kafka"], CHUNKS, [[2, 0, 0], [0, 3, 0]], CHUNK_VECTORS)
+
+
+def test_unit_rows_leaves_zero_rows_alone():
+    assert np.allclose(unit_rows([[3, 4], [0, 0]]), [[0.6, 0.8], [0, 0]])
+    assert unit_rows([1, 0]).shape == (1, 2)
+
+
+def test_top_k_orders_chunks_by_similarity():
+    m = _matrix()
+    top = m.top_k("Python", 2)
+    assert [text for text, _ in top] == ["python chunk", "mixed chunk"]
+    assert np.isclose(top[0][1], 1.0) and np.isclose(top[1][1], np.sqrt(0.5))
+    assert m.context("Kafka", 1) == ["kafka chunk"]
+    assert m.top_indices(10).shape == (2, 4)
+
+
+def test_unknown_skill_has_no_evidence():
+    assert _matrix().top_k("Rust") == []
+
+
+def test_pooled_drops_shared_chunks():
+    assert _matrix().pooled(k=2) == ["python chunk", "mixed chunk", "kafka chunk"]
+    assert _matrix().pooled(["Kafka"], k=1) == ["kafka chunk"]
+
+
+def test_best_similarity_per_skill():
+    assert np.allclose(_matrix().best_similarity(), [1.0, 1.0])
+
+
+def test_no_chunks():
+    m = EvidenceMatrix(["Python"], [], [[1, 0]], [])
+    assert m.top_k("Python") == [] and m.pooled() == []
+    assert m.best_similarity().tolist() == [0.0]
@@ -0,0 +1,39 @@
+from utils.skill_matcher import CAPITALIZED_ONLY, SkillMatcher, display_name, extract_skills
+
+MATCHER = SkillMatcher(["go", "r", "c", "c++", "node", "node.js", ".net", "ci/cd", "machine learning", "java"],
+                       CAPITALIZED_ONLY)
+
+
+def _terms(text):
+    return [term for term, _ in MATCHER.scan(text)]
+
+
+def test_terms_match_on_word_boundaries_only():
+    assert _terms("a good formula for javascript") == []
+    assert _terms("Go, R and C services") == ["go", "r", "c"]
+
+
+def test_longest_term_wins_and_punctuation_terms_match():
+    assert _terms("Node.js and node") == ["node.js", "node"]
+    assert _terms("C++ on .NET with CI/CD") == ["c++", ".net", "ci/cd"]
+    assert _terms("machine   learning") == ["machine learning"]
+
+
+def test_common_words_need_a_capital():
+    assert _terms("we go to the C-level R&D team") == []
+    assert _terms("Built in Go") == ["go"]
+
+
+def test_scan_reports_first_occurrence_in_order():
+    assert MATCHER.scan("java, Go, java") == [("java", 0), ("go", 6)]
+
+
+def test_extract_skills_keeps_written_casing_and_adds_acronyms():
+    skills = extract_skills("Shipped FastAPI services on aws with PostgreSQL, GRPC and some HIPAA work")
+    assert skills == ["FastAPI", "AWS", "PostgreSQL", "GRPC", "HIPAA"]
+    assert extract_skills("CI/CD on .NET") == ["CI/CD", ".NET"]
+
+
+def test_display_names():
+    assert [display_name(t) for t in ("machine learning", "aws", "python", "SQL")] == [
+        "Machine Learning", "AWS", "Python", "SQL"]
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from utils.skill_taxonomy import SkillTaxonomy, get_taxonomy, skill_key
+
+
+def test_skill_key_ignores_spelling():
+    assert skill_key("Node.js") == skill_key("nodejs") == skill_key("node js") == "nodejs"
+    assert skill_key("C++") == "c++" and skill_key("C#") == "c#"
+    assert skill_key("R&D") == "randd"
+
+
+def test_aliases_map_to_canonical_skill():
+    taxonomy = get_taxonomy()
+    assert taxonomy.canonical("k8s") == "Kubernetes"
+    assert taxonomy.canonical("nodejs") == "Node.js"
+    assert taxonomy.skill_id("sklearn") == "scikit_learn"
+    assert taxonomy.canonical("Natural Language Processing (NLP)") == "Natural Language Processing"
+    assert taxonomy.canonical("  Quantum   Basket Weaving ") == "Quantum Basket Weaving"
+
+
+def test_normalize_keeps_distinct_tools_distinct():
+    taxonomy = get_taxonomy()
+    assert taxonomy.normalize(["Plotly", "Matplotlib", "Seaborn", "Data Visualization"]) == [
+        "Plotly", "Matplotlib", "Seaborn", "Data Visualization"]
+    assert taxonomy.normalize(["MLflow", "DVC", "Experiment Tracking"]) == ["MLflow", "DVC", "Experiment Tracking"]
+    assert taxonomy.normalize(["Node", "node.js", "", "Kubernetes", "k8s", "Foo", "foo"]) == [
+        "Node.js", "Kubernetes", "Foo"]
+
+
+@pytest.mark.parametrize("word", ["next", "shell", "express", "containers", "collaboration"])
+def test_common_words_are_not_aliases(word):
+    assert get_taxonomy().lookup(word) is None
+
+
+def test_shared_spelling_is_rejected():
+    with pytest.raises(ValueError):
+        SkillTaxonomy([{"id": "a", "name": "A", "aliases": ["x"]}, {"id": "b", "name": "B", "aliases": ["x"]}])
+
+
+def test_embeddings_are_computed_once_and_cached_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setenv("SKILL_EMBEDDINGS_DIR", str(tmp_path))
+    entries = [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}]
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return [[3.0, 4.0], [0.0, 2.0]]
+
+    matrix = SkillTaxonomy(entries, version="1").embeddings(embed, model="m")
+    assert np.allclose(matrix, [[0.6, 0.8], [0.0, 1.0]])
+    assert calls == [["A", "B"]] and len(list(tmp_path.iterdir())) == 1
+
+    again = SkillTaxonomy(entries, version="1").embeddings(embed, model="m")
+    assert np.allclose(again, matrix) and len(calls) == 1
@@ -0,0 +1,31 @@
+from utils.telemetry import call_site, resolve_call_site
+
+
+class _Agent:
+    """Mimics the analyzer's wrappers: the site is the method that asked for the text."""
+
+    def llm_chat_variants(self, messages):
+        return resolve_call_site()
+
+    def llm_chat_many(self, requests):
+        return [resolve_call_site() for _ in requests]
+
+    def generate_cover_letter(self):
+        return self.llm_chat_variants([])
+
+    def score_skills_packed(self):
+        def _each(failed):
+            return self.llm_chat_many(failed)
+
+        return _each([1])
+
+
+def test_wrappers_are_skipped_when_inferring_the_call_site():
+    agent = _Agent()
+    assert agent.generate_cover_letter() == "generate_cover_letter"
+    assert agent.score_skills_packed() == ["score_skills_packed"]
+
+
+def test_explicit_call_site_wins():
+    with call_site("interview_questions"):
+        assert _Agent().generate_cover_letter() == "interview_questions"
@@ -1,12 +1,77 @@
 """Utility modules for Resume Tracking and AI Mock Interview system."""
 
-from .llm_providers import groq_chat, SESSION
+from .llm_providers import groq_chat, groq_chat_stream, agroq_chat, gather_chat, chat_parallel, chat_variants, SESSION
+from .llm_cache import LLMCache, CacheMiss, get_cache
+from .http_client import HTTPClient, get_http_client
+from .dispatcher import Dispatcher, get_dispatcher, llm_priority, llm_user
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .llm_router import LLMRouter, get_router
+from .cassette import Cassette, CassetteMiss, use_cassette
+from .retry_policy import RetryPolicy, CircuitOpenError, DeadlineExceeded
+from .telemetry import Telemetry, JsonlExporter, PrometheusExporter, call_site, get_telemetry
+from .model_cascade import cascade_chat, get_cascade_stats
+from .semantic_cache import SemanticCache, get_semantic_cache
+from .decoding_profiles import DecodingProfile, get_profile, register_profile
+from .prompt_templates import PromptTemplate, register_template, template_report
+from .output_sizing import OutputSizer, get_output_sizer
+from .skill_matcher import SkillMatcher, extract_skills
+from .skill_taxonomy import SkillTaxonomy, get_taxonomy, skill_key
+from .prompt_budget import count_tokens, trim_to_tokens, fit_prompt_parts
 from .text_utils import clamp_text, compute_hash
 from .file_handlers import extract_text_from_pdf, extract_text_from_txt, extract_text_from_file
 
 __all__ = [
     'groq_chat',
+    'groq_chat_stream',
+    'agroq_chat',
+    'gather_chat',
+    'chat_parallel',
+    'chat_variants',
     'SESSION',
+    'LLMCache',
+    'CacheMiss',
+    'get_cache',
+    'HTTPClient',
+    'get_http_client',
+    'Dispatcher',
+    'get_dispatcher',
+    'llm_priority',
+    'llm_user',
+    'RateLimiter',
+    'get_rate_limiter',
+    'LLMRouter',
+    'get_router',
+    'Cassette',
+    'CassetteMiss',
+    'use_cassette',
+    'RetryPolicy',
+    'CircuitOpenError',
+    'DeadlineExceeded',
+    'Telemetry',
+    'JsonlExporter',
+    'PrometheusExporter',
+    'call_site',
+    'get_telemetry',
+    'cascade_chat',
+    'get_cascade_stats',
+    'SemanticCache',
+    'get_semantic_cache',
+    'DecodingProfile',
+    'get_profile',
+    'register_profile',
+    'PromptTemplate',
+    'register_template',
+    'template_report',
+    'OutputSizer',
+    'get_output_sizer',
+    'SkillMatcher',
+    'extract_skills',
+    'SkillTaxonomy',
+    'get_taxonomy',
+    'skill_key',
+    'count_tokens',
+    'trim_to_tokens',
+    'fit_prompt_parts',
     'clamp_text',
     'compute_hash',
     'extract_text_from_pdf',
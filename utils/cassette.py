@@ -0,0 +1,236 @@
+"""Record/replay cassettes for deterministic LLM performance runs.
+
+In record mode every real chat call (request, response, timings) is appended
+to a JSONL cassette. In replay mode calls are answered from the cassette with
+either the recorded latencies or instantly, and nothing goes to the network:
+a prompt that is not on the cassette raises `CassetteMiss` and is listed in
+`report()` so prompt drift shows up instead of being hidden.
+
+Configuration comes from the environment (or `use_cassette()`):
+
+- LLM_CASSETTE_MODE: record | replay (unset = off)
+- LLM_CASSETTE_PATH: cassette file (default .cache/llm/cassette.jsonl)
+- LLM_CASSETTE_TIMING: original | instant (replay only, default instant)
+
+Compare two runs with `python -m utils.cassette compare base.jsonl new.jsonl`.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import defaultdict, deque
+
+from .llm_cache import payload_cache_key
+from .prompt_budget import count_message_tokens, count_tokens
+
+DEFAULT_CASSETTE_PATH = os.path.join(".cache", "llm", "cassette.jsonl")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode when a request is not on the cassette."""
+
+
+def request_key(payload: dict) -> str:
+    """Match key for a chat payload (same fields as the response cache)."""
+    return payload_cache_key(payload)
+
+
+class Cassette:
+    """One cassette file in record or replay mode."""
+
+    def __init__(self, path: str, mode: str, timing: str = "instant"):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.timing = timing
+        self._lock = threading.Lock()
+        self._entries = defaultdict(deque)
+        self._last = {}
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.llm_seconds = 0.0
+        self.unmatched = []
+
+        if mode == "replay":
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"Cassette not found: {path}")
+            for entry in load_entries(path):
+                self._entries[entry["key"]].append(entry)
+        else:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def _take(self, payload: dict) -> dict:
+        key = request_key(payload)
+        with self._lock:
+            queue = self._entries.get(key)
+            if queue:
+                entry = queue.popleft()
+                self._last[key] = entry
+            else:
+                # Repeated identical prompts beyond what was recorded reuse the last answer
+                entry = self._last.get(key)
+            if entry is None:
+                last_user = next((m.get("content") for m in reversed(payload["messages"]) if m.get("role") == "user"), "")
+                self.unmatched.append({
+                    "key": key,
+                    "model": payload["model"],
+                    "prompt_tokens": count_message_tokens(payload["messages"], payload["model"]),
+                    "prompt_head": str(last_user or "")[:160],
+                })
+                raise CassetteMiss(f"Request {key[:12]} for {payload['model']} is not on cassette {self.path}")
+            self.calls += 1
+            self.prompt_tokens += entry.get("prompt_tokens", 0)
+            self.completion_tokens += entry.get("completion_tokens", 0)
+            self.llm_seconds += entry.get("latency_s", 0.0)
+        return entry
+
+    def replay(self, payload: dict) -> str:
+        """Recorded response for `payload`, honouring the timing mode."""
+        entry = self._take(payload)
+        if self.timing == "original":
+            time.sleep(entry.get("latency_s", 0.0))
+        return entry["response"]
+
+    def replay_stream(self, payload: dict):
+        """Yield recorded stream chunks for `payload`, honouring the timing mode."""
+        entry = self._take(payload)
+        chunks = entry.get("chunks") or [[entry.get("latency_s", 0.0), entry["response"]]]
+        elapsed = 0.0
+        for offset, text in chunks:
+            if self.timing == "original" and offset > elapsed:
+                time.sleep(offset - elapsed)
+                elapsed = offset
+            yield text
+
+    def record(self, payload: dict, response: str, latency_s: float, ttfb_s: float | None = None,
+               chunks: list | None = None, usage: dict | None = None) -> None:
+        """Append one interaction to the cassette."""
+        usage = usage or {}
+        entry = {
+            "key": request_key(payload),
+            "model": payload["model"],
+            "messages": payload["messages"],
+            "temperature": payload["temperature"],
+            "max_tokens": payload["max_tokens"],
+            "stop": payload.get("stop"),
+            "response_format": payload.get("response_format"),
+            "stream": bool(payload.get("stream")),
+            "response": response,
+            "latency_s": round(latency_s, 4),
+            "ttfb_s": round(ttfb_s if ttfb_s is not None else latency_s, 4),
+            "prompt_tokens": usage.get("prompt_tokens") or count_message_tokens(payload["messages"], payload["model"]),
+            "completion_tokens": usage.get("completion_tokens") or count_tokens(response, payload["model"]),
+            "recorded_at": time.time(),
+        }
+        if chunks:
+            entry["chunks"] = [[round(offset, 4), text] for offset, text in chunks]
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self.calls += 1
+            self.prompt_tokens += entry["prompt_tokens"]
+            self.completion_tokens += entry["completion_tokens"]
+            self.llm_seconds += latency_s
+
+    def report(self) -> dict:
+        """Calls, token totals, replayed LLM time and unmatched prompts for this run."""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "path": self.path,
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "llm_seconds": round(self.llm_seconds, 3),
+                "unmatched": list(self.unmatched),
+            }
+
+
+def load_entries(path: str) -> list:
+    """All interactions stored in a cassette file."""
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    return entries
+
+
+def summarize(path: str) -> dict:
+    """Per-cassette totals: call count, prompt/completion tokens and recorded latency."""
+    entries = load_entries(path)
+    latencies = sorted(e.get("latency_s", 0.0) for e in entries)
+    return {
+        "calls": len(entries),
+        "prompt_tokens": sum(e.get("prompt_tokens", 0) for e in entries),
+        "completion_tokens": sum(e.get("completion_tokens", 0) for e in entries),
+        "llm_seconds": round(sum(latencies), 3),
+        "p50_latency_s": latencies[len(latencies) // 2] if latencies else 0.0,
+        "max_prompt_tokens": max((e.get("prompt_tokens", 0) for e in entries), default=0),
+    }
+
+
+_CASSETTE = None
+_CASSETTE_LOCK = threading.Lock()
+_CASSETTE_CONFIGURED = False
+
+
+def use_cassette(path: str | None, mode: str | None = None, timing: str = "instant") -> Cassette | None:
+    """Activate a cassette for this process (mode None turns cassettes off)."""
+    global _CASSETTE, _CASSETTE_CONFIGURED
+    with _CASSETTE_LOCK:
+        _CASSETTE = Cassette(path or DEFAULT_CASSETTE_PATH, mode, timing) if mode else None
+        _CASSETTE_CONFIGURED = True
+    return _CASSETTE
+
+
+def get_cassette() -> Cassette | None:
+    """The active cassette, configured from the environment on first use."""
+    if _CASSETTE_CONFIGURED:
+        return _CASSETTE
+    mode = (os.getenv("LLM_CASSETTE_MODE") or "").strip().lower() or None
+    return use_cassette(os.getenv("LLM_CASSETTE_PATH"), mode, (os.getenv("LLM_CASSETTE_TIMING") or "instant").strip().lower())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and compare LLM cassettes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="Summarize a cassette")
+    report.add_argument("path")
+    compare = sub.add_parser("compare", help="Compare a new cassette against a baseline")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--tolerance", type=float, default=0.05, help="allowed relative growth (default 5%%)")
+    args = parser.parse_args(argv)
+
+    if args.command == "report":
+        print(json.dumps(summarize(args.path), indent=2))
+        return 0
+
+    base, cur = summarize(args.baseline), summarize(args.current)
+    regressed = False
+    for metric in ("calls", "prompt_tokens", "completion_tokens", "max_prompt_tokens"):
+        b, c = base[metric], cur[metric]
+        flag = ""
+        if c > b * (1 + args.tolerance):
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"{metric:>18}: {b} -> {c}{flag}")
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
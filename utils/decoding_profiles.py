@@ -0,0 +1,76 @@
+"""Named decoding profiles for LLM call sites.
+
+Each call site picks a profile instead of inheriting the 600-token default:
+the profile sets max_tokens, temperature, stop sequences and JSON mode
+(`response_format={"type": "json_object"}`). Shorter caps cut latency and TPM
+reservations; JSON mode cuts parse failures and the fallback calls they cause.
+Explicit arguments at the call site still override the profile.
+"""
+
+from dataclasses import dataclass
+
+JSON_OBJECT = {"type": "json_object"}
+
+
+@dataclass(frozen=True)
+class DecodingProfile:
+    """Decoding parameters for one kind of call."""
+
+    name: str
+    max_tokens: int = 600
+    temperature: float = 0.2
+    stop: tuple | None = None
+    json_mode: bool = False
+
+    def params(self) -> dict:
+        """Keyword arguments for `groq_chat` / `llm_chat`."""
+        return {
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "stop": list(self.stop) if self.stop else None,
+            "response_format": JSON_OBJECT if self.json_mode else None,
+        }
+
+
+PROFILES = {}
+
+
+def register_profile(profile: DecodingProfile) -> DecodingProfile:
+    """Add or replace a profile in the registry."""
+    PROFILES[profile.name] = profile
+    return profile
+
+
+for _profile in (
+    DecodingProfile("default"),
+    # A number and one sentence
+    DecodingProfile("score_single", max_tokens=60, temperature=0.0, stop=("\n\n",)),
+    # {"skill_scores": {...}, "skill_reasoning": {...}} for every skill at once
+    DecodingProfile("score_batch_json", max_tokens=1200, temperature=0.1, json_mode=True),
+    # Packed per-item answers keyed by item number; callers size max_tokens per pack
+    DecodingProfile("packed_json", max_tokens=1500, temperature=0.2, json_mode=True),
+    DecodingProfile("skills_csv", max_tokens=300, temperature=0.0),
+    DecodingProfile("weakness_json", max_tokens=1500, temperature=0.2, json_mode=True),
+    DecodingProfile("weakness_brief", max_tokens=150, temperature=0.2),
+    DecodingProfile("questions_json", max_tokens=3000, temperature=0.2, json_mode=True),
+    DecodingProfile("answer_brief", max_tokens=300, temperature=0.2),
+    DecodingProfile("improvements_json", max_tokens=2000, temperature=0.3, json_mode=True),
+    # Chat answers, cover letters and other free-form prose
+    DecodingProfile("long_form", max_tokens=2000, temperature=0.2),
+    DecodingProfile("cover_letter", max_tokens=1000, temperature=0.2),
+    DecodingProfile("resume_rewrite", max_tokens=4000, temperature=0.3),
+    DecodingProfile("latex", max_tokens=4000, temperature=0.2),
+):
+    register_profile(_profile)
+
+
+def get_profile(name: str | None) -> DecodingProfile:
+    """Profile by name; unknown or empty names fall back to `default`."""
+    return PROFILES.get(name or "default") or PROFILES["default"]
+
+
+def resolve_decoding(profile: str | None = None, **overrides) -> dict:
+    """Profile parameters with any non-None `overrides` applied on top."""
+    params = get_profile(profile).params()
+    params.update({k: v for k, v in overrides.items() if v is not None})
+    return params
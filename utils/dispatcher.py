@@ -0,0 +1,249 @@
+"""Priority and fair-share dispatch of outbound LLM calls.
+
+Every chat request takes one of a bounded number of dispatch slots before it
+goes on the wire. When all slots are busy, waiting requests are granted in
+order of:
+
+1. priority class: `interactive` (a user is watching, e.g. chat answers),
+   then `standard`, then `background` (weakness analysis, pre-generation)
+2. per-user round robin within a class, so one user's burst of parallel calls
+   cannot starve everyone else
+3. arrival order within one user's queue
+
+A request that has waited longer than `aging_s` goes next regardless of its
+class, so background work is delayed but never starved. Call sites tag their
+class with `llm_priority(...)` (or the `priority` argument of the chat
+helpers); the user comes from `llm_user(...)` or the helper's `user` argument.
+
+Configuration from the environment:
+
+- LLM_DISPATCH_DISABLED: 1/true turns the dispatcher off
+- LLM_MAX_CONCURRENCY: concurrent outbound calls (default 16)
+- LLM_DISPATCH_AGING_S: wait after which any request goes next (default 15)
+"""
+
+import os
+import time
+import threading
+import contextvars
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from .retry_policy import DeadlineExceeded
+
+PRIORITIES = ("interactive", "standard", "background")
+
+_PRIORITY = contextvars.ContextVar("llm_priority", default=None)
+_USER = contextvars.ContextVar("llm_user", default=None)
+
+
+@dataclass(frozen=True)
+class DispatchTag:
+    """Priority class and fair-share user of one LLM call."""
+
+    priority: str = "standard"
+    user: str = "anonymous"
+
+
+@contextmanager
+def llm_priority(name: str):
+    """Run LLM calls made inside this block in priority class `name`."""
+    if name not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority {name!r}; expected one of {PRIORITIES}")
+    token = _PRIORITY.set(name)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+@contextmanager
+def llm_user(user: str):
+    """Attribute LLM calls made inside this block to `user` for fair queuing."""
+    token = _USER.set(str(user))
+    try:
+        yield
+    finally:
+        _USER.reset(token)
+
+
+def current_dispatch(priority: str | None = None, user: str | None = None) -> DispatchTag:
+    """Tag for a call made now: explicit arguments, then the enclosing blocks, then the defaults."""
+    priority = priority or _PRIORITY.get() or "standard"
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority {priority!r}; expected one of {PRIORITIES}")
+    return DispatchTag(priority, str(user or _USER.get() or "anonymous"))
+
+
+def _quantile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class _Waiter:
+    __slots__ = ("tag", "enqueued", "event", "granted")
+
+    def __init__(self, tag: DispatchTag):
+        self.tag = tag
+        self.enqueued = time.monotonic()
+        self.event = threading.Event()
+        self.granted = False
+
+
+class Dispatcher:
+    """Bounded outbound concurrency with priority classes and per-user round robin."""
+
+    def __init__(self, max_concurrency: int = 16, aging_s: float = 15.0):
+        """
+        Args:
+            max_concurrency: Outbound calls allowed in flight at once
+            aging_s: Wait after which a request is granted ahead of higher classes (0 disables)
+        """
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.aging_s = aging_s
+        self._lock = threading.Lock()
+        # priority -> OrderedDict[user -> deque of waiters]; users rotate to the back after each grant
+        self._queues = {p: OrderedDict() for p in PRIORITIES}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._granted = {p: 0 for p in PRIORITIES}
+        self._timeouts = {p: 0 for p in PRIORITIES}
+        self._waits = {p: deque(maxlen=500) for p in PRIORITIES}
+        self._max_depth = 0
+
+    def _depth_locked(self) -> int:
+        return sum(len(q) for users in self._queues.values() for q in users.values())
+
+    def acquire(self, tag: DispatchTag, timeout: float | None = None):
+        """Wait for a slot.
+
+        Args:
+            tag: The call's priority class and user
+            timeout: Longest wait in seconds (None waits indefinitely)
+
+        Returns:
+            (release callable, seconds waited); call `release()` exactly once when the call is done
+
+        Raises:
+            DeadlineExceeded: No slot became free within `timeout`
+        """
+        waiter = _Waiter(tag)
+        with self._lock:
+            if self.in_flight < self.max_concurrency and not self._depth_locked():
+                self._grant_locked(waiter)
+            else:
+                self._queues[tag.priority].setdefault(tag.user, deque()).append(waiter)
+                self._max_depth = max(self._max_depth, self._depth_locked())
+        if not waiter.event.wait(timeout):
+            with self._lock:
+                if not waiter.granted:
+                    users = self._queues[tag.priority]
+                    queue = users.get(tag.user)
+                    if queue is not None and waiter in queue:
+                        queue.remove(waiter)
+                        if not queue:
+                            del users[tag.user]
+                    self._timeouts[tag.priority] += 1
+                    raise DeadlineExceeded(f"Waited {timeout:.1f}s for an LLM dispatch slot "
+                                           f"({self.in_flight} calls in flight)")
+        waited = time.monotonic() - waiter.enqueued
+        released = threading.Lock()
+
+        def release():
+            if released.acquire(blocking=False):
+                self._release()
+
+        return release, waited
+
+    def _grant_locked(self, waiter: _Waiter) -> None:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self._granted[waiter.tag.priority] += 1
+        self._waits[waiter.tag.priority].append(time.monotonic() - waiter.enqueued)
+        waiter.granted = True
+        waiter.event.set()
+
+    def _next_locked(self) -> _Waiter | None:
+        if self.aging_s:
+            # Longest-waiting head of any user's queue, if it has aged past the limit
+            cutoff = time.monotonic() - self.aging_s
+            heads = [(q[0].enqueued, p, user) for p in PRIORITIES for user, q in self._queues[p].items()]
+            oldest = min(heads, default=None)
+            if oldest is not None and oldest[0] <= cutoff:
+                return self._pop_locked(oldest[1], oldest[2])
+        for priority in PRIORITIES:
+            users = self._queues[priority]
+            if users:
+                return self._pop_locked(priority, next(iter(users)))
+        return None
+
+    def _pop_locked(self, priority: str, user: str) -> _Waiter:
+        users = self._queues[priority]
+        queue = users[user]
+        waiter = queue.popleft()
+        if queue:
+            users.move_to_end(user)
+        else:
+            del users[user]
+        return waiter
+
+    def _release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            while self.in_flight < self.max_concurrency:
+                waiter = self._next_locked()
+                if waiter is None:
+                    break
+                self._grant_locked(waiter)
+
+    def report(self) -> dict:
+        """Slots in use, queue depth and per-class grants, timeouts and wait quantiles."""
+        with self._lock:
+            queued = {p: sum(len(q) for q in self._queues[p].values()) for p in PRIORITIES}
+            users_waiting = len({u for p in PRIORITIES for u in self._queues[p]})
+            classes = {
+                p: {
+                    "queued": queued[p],
+                    "granted": self._granted[p],
+                    "timeouts": self._timeouts[p],
+                    "waits": sorted(self._waits[p]),
+                }
+                for p in PRIORITIES
+            }
+            out = {
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "queued": sum(queued.values()),
+                "max_queued": self._max_depth,
+                "users_waiting": users_waiting,
+            }
+        for stats in classes.values():
+            waits = stats.pop("waits")
+            stats["p50_wait_s"] = round(_quantile(waits, 0.5), 4)
+            stats["p95_wait_s"] = round(_quantile(waits, 0.95), 4)
+            stats["max_wait_s"] = round(waits[-1], 4) if waits else 0.0
+        out["classes"] = classes
+        return out
+
+
+_DISPATCHER = None
+_DISPATCHER_LOCK = threading.Lock()
+
+
+def get_dispatcher() -> Dispatcher | None:
+    """Process-wide dispatcher, or None when LLM_DISPATCH_DISABLED is set."""
+    global _DISPATCHER
+    if (os.getenv("LLM_DISPATCH_DISABLED") or "").strip().lower() in ("1", "true", "yes"):
+        return None
+    if _DISPATCHER is None:
+        with _DISPATCHER_LOCK:
+            if _DISPATCHER is None:
+                _DISPATCHER = Dispatcher(
+                    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY") or 16),
+                    aging_s=float(os.getenv("LLM_DISPATCH_AGING_S") or 15),
+                )
+    return _DISPATCHER
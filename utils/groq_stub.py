@@ -0,0 +1,491 @@
+"""Local Groq-compatible stub server for load and latency testing.
+
+Implements `POST /openai/v1/chat/completions` (plain and SSE streaming) with
+configurable latency, token throughput, 429/5xx injection and realistic
+`x-ratelimit-*` headers, plus the `/files` and `/batches` endpoints used by
+`utils.llm_batch` (batch jobs complete after `--batch-latency-ms` and are not
+charged against the simulated rate limits). Replies are canned payloads shaped like what the
+agents parse: skill_scores JSON, weakness maps, interview question lists,
+improvement suggestions, comma-separated skills and 0-10 skill ratings.
+
+Run it and point the app at it:
+
+    python -m utils.groq_stub --port 8765 --latency-ms 400 --tps 250 --rate-429 0.05
+    GROQ_BASE_URL=http://127.0.0.1:8765/openai/v1 streamlit run app.py
+
+Benchmarks can start it in-process with `start_stub_server()`.
+"""
+
+import re
+import json
+import math
+import time
+import random
+import uuid
+import argparse
+import threading
+from dataclasses import dataclass
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub server."""
+
+    latency_ms: float = 300.0          # median time to first byte
+    latency_dist: str = "lognormal"    # fixed | uniform | lognormal
+    latency_spread: float = 0.5        # uniform: +/- fraction; lognormal: sigma
+    tokens_per_s: float = 250.0        # completion throughput (0 = instant)
+    rate_429: float = 0.0              # probability of an injected 429
+    rate_5xx: float = 0.0              # probability of an injected 500/503
+    rpm: int = 30                      # per-minute request budget reported in headers
+    tpm: int = 6000                    # per-minute token budget reported in headers
+    rpd: int = 14400                   # per-day request budget reported in headers
+    enforce_limits: bool = False       # return 429 when the simulated TPM/RPM budget is exhausted
+    max_n: int = 1                     # largest `n` accepted (Groq currently rejects n > 1)
+    batch_latency_ms: float = 2000.0   # time for a batch job to go from created to completed
+    seed: int | None = None
+
+
+class _StubState:
+    """Simulated per-minute buckets and counters shared by handler threads."""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.lock = threading.Lock()
+        self.tokens = float(config.tpm)
+        self.requests = float(config.rpm)
+        self.daily_used = 0
+        self.updated = time.monotonic()
+        self.day_started = time.monotonic()
+        self.counts = {"requests": 0, "ok": 0, "429": 0, "5xx": 0, "stream": 0, "batch_requests": 0}
+        self.files = {}    # file id -> (purpose, bytes)
+        self.batches = {}  # batch id -> batch object
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        self.tokens = min(self.config.tpm, self.tokens + elapsed * self.config.tpm / 60.0)
+        self.requests = min(self.config.rpm, self.requests + elapsed * self.config.rpm / 60.0)
+        self.updated = now
+
+    def admit(self, tokens: int) -> tuple:
+        """Decide the outcome of one request: ("ok" | "429" | "5xx", headers)."""
+        cfg = self.config
+        with self.lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.counts["requests"] += 1
+            outcome = "ok"
+            roll = self.rng.random()
+            if roll < cfg.rate_5xx:
+                outcome = "5xx"
+            elif roll < cfg.rate_5xx + cfg.rate_429:
+                outcome = "429"
+            elif cfg.enforce_limits and (self.requests < 1 or self.tokens < tokens):
+                outcome = "429"
+            if outcome == "ok":
+                self.requests = max(0.0, self.requests - 1)
+                self.tokens = max(0.0, self.tokens - tokens)
+                self.daily_used += 1
+            self.counts[outcome] += 1
+            return outcome, self._headers(now, tokens if outcome == "429" else 0)
+
+    def _headers(self, now: float, wanted_tokens: int) -> dict:
+        cfg = self.config
+        tokens_short = max(0.0, wanted_tokens - self.tokens)
+        reset_tokens = (cfg.tpm - self.tokens) * 60.0 / cfg.tpm if cfg.tpm else 0.0
+        reset_requests = max(0.0, 86400 - (now - self.day_started))
+        headers = {
+            "x-ratelimit-limit-requests": str(cfg.rpd),
+            "x-ratelimit-limit-tokens": str(cfg.tpm),
+            "x-ratelimit-remaining-requests": str(max(0, cfg.rpd - self.daily_used)),
+            "x-ratelimit-remaining-tokens": str(int(self.tokens)),
+            "x-ratelimit-reset-requests": _format_duration(reset_requests),
+            "x-ratelimit-reset-tokens": _format_duration(reset_tokens),
+        }
+        if wanted_tokens:
+            retry = max(tokens_short * 60.0 / cfg.tpm if cfg.tpm else 1.0, 60.0 / cfg.rpm if cfg.rpm else 1.0)
+            headers["retry-after"] = str(max(1, math.ceil(retry)))
+        return headers
+
+    def latency_s(self) -> float:
+        cfg = self.config
+        base = max(0.0, cfg.latency_ms) / 1000.0
+        with self.lock:
+            if cfg.latency_dist == "uniform":
+                return max(0.0, self.rng.uniform(base * (1 - cfg.latency_spread), base * (1 + cfg.latency_spread)))
+            if cfg.latency_dist == "lognormal" and base > 0:
+                return self.rng.lognormvariate(math.log(base), cfg.latency_spread)
+        return base
+
+
+def _format_duration(seconds: float) -> str:
+    """Format seconds the way Groq does ('2m59.56s', '7.66s', '250ms')."""
+    if seconds < 1:
+        return f"{int(seconds * 1000)}ms"
+    minutes, secs = divmod(seconds, 60)
+    hours, minutes = divmod(int(minutes), 60)
+    out = ""
+    if hours:
+        out += f"{hours}h"
+    if minutes or hours:
+        out += f"{minutes}m"
+    return out + f"{secs:.2f}s"
+
+
+def _count_tokens(text: str) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def _csv_after(label: str, text: str) -> list:
+    """Items of a comma-separated list that follows `label` on one line."""
+    m = re.search(re.escape(label) + r"\s*([^\n]+)", text)
+    if not m:
+        return []
+    return [s.strip(" .") for s in m.group(1).split(",") if s.strip(" .")]
+
+
+_SAMPLE_SKILLS = ["Python", "SQL", "Docker", "AWS", "React", "Machine Learning", "Git", "REST APIs"]
+
+
+def canned_reply(prompt: str, max_tokens: int, rng: random.Random | None = None) -> str:
+    """Reply shaped like what the agents expect for `prompt`."""
+    rng = rng or random.Random(0)
+    packed = re.search(r"Return ONLY a JSON object keyed by the \w+ number.*?with exactly (\d+) keys", prompt)
+    if packed:
+        count = int(packed.group(1))
+        if '"score"' in prompt:
+            return json.dumps({str(i): {"score": rng.randint(2, 9), "reasoning": "Mentioned in the experience section."}
+                               for i in range(1, count + 1)})
+        return json.dumps({str(i): "I led the work end to end, chose the approach, and measured a 30% improvement."
+                           for i in range(1, count + 1)})
+    if '"skill_scores"' in prompt:
+        skills = _csv_after("Skills:", prompt) or _SAMPLE_SKILLS[:4]
+        return json.dumps({
+            "skill_scores": {s: rng.randint(3, 9) for s in skills},
+            "skill_reasoning": {s: f"The resume mentions {s} in project and experience sections." for s in skills},
+        })
+    if "{skill:{detail:str" in prompt:
+        skills = _csv_after("Skills:", prompt) or _SAMPLE_SKILLS[:2]
+        return json.dumps({
+            s: {
+                "detail": f"{s} is not demonstrated with concrete, measurable work.",
+                "suggestions": [f"Add a project that uses {s}", f"Quantify the impact of your {s} work"],
+                "example": f"Built a {s} pipeline that cut processing time by 40%.",
+            }
+            for s in skills
+        })
+    if '"question"' in prompt and '"type"' in prompt:
+        m = re.search(r"Generate exactly (\d+)", prompt)
+        count = int(m.group(1)) if m else 3
+        types = _csv_after("from this list:", prompt) or ["Technical"]
+        return json.dumps({"questions": [
+            {
+                "type": types[i % len(types)],
+                "question": f"Stub question {i + 1}: describe a project where you applied {_SAMPLE_SKILLS[i % len(_SAMPLE_SKILLS)]}.",
+                "solution": "I led the design, chose the tooling, measured the outcome and shared what I learned with the team.",
+            }
+            for i in range(count)
+        ]})
+    if '"specific"' in prompt and '"before_after"' in prompt:
+        areas = _csv_after("for these areas:", prompt) or ["Content"]
+        return json.dumps({
+            a: {
+                "description": f"The {a.lower()} section could be more specific and results-oriented.",
+                "specific": [f"Lead {a.lower()} bullets with strong action verbs", "Quantify outcomes with metrics", "Remove generic phrases"],
+                "before_after": {"before": "Worked on backend services", "after": "Built 5 backend services handling 2M requests/day"},
+            }
+            for a in areas
+        })
+    if "comma-separated list of skills" in prompt:
+        return ", ".join(_SAMPLE_SKILLS)
+    if "On a scale of 0-10" in prompt:
+        return f"{rng.randint(2, 9)} The resume references this skill in its experience section."
+    words = ("This is a stub response from the local Groq-compatible server used for load and latency testing. ").split()
+    n = max(8, min(int(max_tokens or 200), 200))
+    return " ".join(words[i % len(words)] for i in range(n))
+
+
+def _reply(req: dict, rng: random.Random) -> tuple:
+    """(content, finish_reason, prompt_tokens, completion_tokens) for a chat-completions request."""
+    messages = req.get("messages") or []
+    max_tokens = int(req.get("max_tokens") or 600)
+    prompt_tokens = sum(_count_tokens(str(m.get("content") or "")) + 4 for m in messages) + 3
+    prompt = "\n".join(str(m.get("content") or "") for m in messages)
+    content = canned_reply(prompt, max_tokens, rng)
+    finish_reason = "stop"
+    if _count_tokens(content) > max_tokens:
+        content, finish_reason = content[:max_tokens * CHARS_PER_TOKEN], "length"
+    return content, finish_reason, prompt_tokens, _count_tokens(content)
+
+
+def _completion(model: str, content: str, finish_reason: str, prompt_tokens: int, completion_tokens: int,
+                n: int = 1) -> dict:
+    return {
+        "id": "chatcmpl-stub",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": i, "message": {"role": "assistant", "content": content},
+                     "finish_reason": finish_reason} for i in range(n)],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens * n,
+                  "total_tokens": prompt_tokens + completion_tokens * n},
+    }
+
+
+def _run_batch(state: _StubState, batch_id: str) -> None:
+    """Answer every line of a batch's input file once the simulated batch latency has passed."""
+    with state.lock:
+        batch = state.batches[batch_id]
+        batch["status"] = "in_progress"
+        _, data = state.files[batch["input_file_id"]]
+    time.sleep(max(0.0, state.config.batch_latency_ms) / 1000.0)
+    output, errors = [], []
+    for raw in data.decode("utf-8").splitlines():
+        if not raw.strip():
+            continue
+        line = json.loads(raw)
+        body = line.get("body") or {}
+        item = {"id": f"batch_req_{uuid.uuid4().hex[:12]}", "custom_id": line.get("custom_id")}
+        if not body.get("messages"):
+            errors.append({**item, "response": None,
+                           "error": {"code": "invalid_request", "message": "'messages' is required"}})
+            continue
+        with state.lock:
+            content, finish_reason, prompt_tokens, completion_tokens = _reply(body, state.rng)
+        item["response"] = {"status_code": 200, "request_id": item["id"],
+                            "body": _completion(body.get("model") or "stub-model", content, finish_reason,
+                                                prompt_tokens, completion_tokens)}
+        item["error"] = None
+        output.append(item)
+    with state.lock:
+        for name, items in (("output_file_id", output), ("error_file_id", errors)):
+            if items:
+                file_id = f"file_{uuid.uuid4().hex[:12]}"
+                state.files[file_id] = ("batch_output", "".join(json.dumps(i) + "\n" for i in items).encode("utf-8"))
+                batch[name] = file_id
+        state.counts["batch_requests"] += len(output) + len(errors)
+        batch["request_counts"] = {"total": len(output) + len(errors), "completed": len(output), "failed": len(errors)}
+        batch["status"] = "completed"
+        batch["completed_at"] = int(time.time())
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "GroqStub/1.0"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def state(self) -> _StubState:
+        return self.server.stub_state
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: dict | None = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/health", "/stats"):
+            with self.state.lock:
+                self._send_json(200, dict(self.state.counts))
+        elif "/batches/" in self.path or "/files/" in self.path:
+            self._batch_get(self.path.rstrip("/"))
+        elif self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "stub-model", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def _batch_get(self, path: str) -> None:
+        state = self.state
+        with state.lock:
+            if path.endswith("/content"):
+                file_id = path.split("/files/")[-1][:-len("/content")]
+                entry = state.files.get(file_id)
+                if entry is not None:
+                    data = entry[1]
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/jsonl")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+            elif "/batches/" in path and path.split("/batches/")[-1] in state.batches:
+                self._send_json(200, dict(state.batches[path.split("/batches/")[-1]]))
+                return
+        self._send_json(404, {"error": {"message": "not found"}})
+
+    def _upload_file(self, body: bytes) -> None:
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode("utf-8") + body)
+        fields = {part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+                  for part in message.iter_parts()} if message.is_multipart() else {}
+        if not fields.get("file"):
+            self._send_json(400, {"error": {"message": "multipart 'file' is required", "type": "invalid_request_error"}})
+            return
+        file_id = f"file_{uuid.uuid4().hex[:12]}"
+        purpose = (fields.get("purpose") or b"batch").decode("utf-8")
+        with self.state.lock:
+            self.state.files[file_id] = (purpose, fields["file"])
+        self._send_json(200, {"id": file_id, "object": "file", "bytes": len(fields["file"]), "purpose": purpose,
+                              "created_at": int(time.time())})
+
+    def _create_batch(self, req: dict) -> None:
+        state = self.state
+        with state.lock:
+            if req.get("input_file_id") not in state.files:
+                self._send_json(400, {"error": {"message": "input_file_id not found", "type": "invalid_request_error"}})
+                return
+            batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+            state.batches[batch_id] = {
+                "id": batch_id, "object": "batch", "endpoint": req.get("endpoint"), "status": "validating",
+                "input_file_id": req["input_file_id"], "completion_window": req.get("completion_window") or "24h",
+                "created_at": int(time.time()), "output_file_id": None, "error_file_id": None,
+                "metadata": req.get("metadata"),
+            }
+            batch = dict(state.batches[batch_id])
+        threading.Thread(target=_run_batch, args=(state, batch_id), name=f"stub-{batch_id}", daemon=True).start()
+        self._send_json(200, batch)
+
+    def do_POST(self):
+        path = self.path.rstrip("/")
+        length = int(self.headers.get("Content-Length") or 0)
+        if path.endswith("/files"):
+            self._upload_file(self.rfile.read(length))
+            return
+        if not path.endswith(("/chat/completions", "/batches")):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        try:
+            req = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "invalid JSON body", "type": "invalid_request_error"}})
+            return
+        if path.endswith("/batches"):
+            self._create_batch(req)
+            return
+
+        max_tokens = int(req.get("max_tokens") or 600)
+        n = int(req.get("n") or 1)
+        if n > self.state.config.max_n:
+            self._send_json(400, {"error": {"message": f"'n' : number must be at most {self.state.config.max_n}",
+                                            "type": "invalid_request_error"}})
+            return
+        with self.state.lock:
+            content, finish_reason, prompt_tokens, completion_tokens = _reply(req, self.state.rng)
+        outcome, headers = self.state.admit(prompt_tokens + max_tokens)
+
+        time.sleep(self.state.latency_s())
+        if outcome == "429":
+            wait = headers.get("retry-after", "1")
+            self._send_json(429, {"error": {
+                "message": f"Rate limit reached for model `{req.get('model')}` on tokens per minute (TPM). Please try again in {wait}s.",
+                "type": "tokens", "code": "rate_limit_exceeded",
+            }}, headers)
+            return
+        if outcome == "5xx":
+            status = self.state.rng.choice((500, 503))
+            self._send_json(status, {"error": {"message": "stub injected server error", "type": "internal_server_error"}}, headers)
+            return
+
+        model = req.get("model") or "stub-model"
+        created = int(time.time())
+        tps = self.state.config.tokens_per_s
+
+        if req.get("stream"):
+            with self.state.lock:
+                self.state.counts["stream"] += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            for k, v in headers.items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.close_connection = True
+            step = CHARS_PER_TOKEN * 4
+            for i in range(0, len(content), step):
+                chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [{"index": 0, "delta": {"content": content[i:i + step]}, "finish_reason": None}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                if tps > 0:
+                    time.sleep(4 / tps)
+            done = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": finish_reason}],
+                    "x_groq": {"usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                                         "total_tokens": prompt_tokens + completion_tokens}}}
+            self.wfile.write(f"data: {json.dumps(done)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+            self.wfile.flush()
+            return
+
+        if tps > 0:
+            time.sleep(completion_tokens / tps)
+        self._send_json(200, _completion(model, content, finish_reason, prompt_tokens, completion_tokens, n), headers)
+
+
+def start_stub_server(config: StubConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+    """Start the stub on a background thread.
+
+    Args:
+        config: Stub behaviour (defaults to `StubConfig()`)
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+
+    Returns:
+        (server, base_url) - call `server.shutdown()` when done; pass `base_url` as GROQ_BASE_URL
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.stub_state = _StubState(config or StubConfig())
+    threading.Thread(target=server.serve_forever, name="groq-stub", daemon=True).start()
+    bound_host, bound_port = server.server_address[:2]
+    return server, f"http://{bound_host}:{bound_port}/openai/v1"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local Groq-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--latency-dist", choices=("fixed", "uniform", "lognormal"), default="lognormal")
+    parser.add_argument("--latency-spread", type=float, default=0.5)
+    parser.add_argument("--tps", type=float, default=250.0, help="completion tokens per second (0 = instant)")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--rpm", type=int, default=30)
+    parser.add_argument("--tpm", type=int, default=6000)
+    parser.add_argument("--enforce-limits", action="store_true")
+    parser.add_argument("--max-n", type=int, default=1, help="largest `n` accepted per request")
+    parser.add_argument("--batch-latency-ms", type=float, default=2000.0, help="time for a batch job to complete")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = StubConfig(
+        latency_ms=args.latency_ms, latency_dist=args.latency_dist, latency_spread=args.latency_spread,
+        tokens_per_s=args.tps, rate_429=args.rate_429, rate_5xx=args.rate_5xx, rpm=args.rpm, tpm=args.tpm,
+        enforce_limits=args.enforce_limits, max_n=args.max_n,
+        batch_latency_ms=args.batch_latency_ms, seed=args.seed,
+    )
+    server, base_url = start_stub_server(config, args.host, args.port)
+    print(f"Groq stub listening; set GROQ_BASE_URL={base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
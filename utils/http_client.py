@@ -0,0 +1,249 @@
+"""Shared pooled HTTP client for every outbound call (LLM providers, job boards).
+
+A bare `requests.Session` keeps at most 10 idle connections per host; under
+concurrent Streamlit sessions the extra connections are opened, used once and
+dropped ("Connection pool is full, discarding connection"), so bursts keep
+paying for new TLS handshakes. `HTTPClient` instead:
+
+- mounts one adapter per known upstream with a pool as large as that host's
+  concurrency cap, and a default adapter for any other host
+- caps in-flight requests per host with a semaphore, so a pool never has to
+  open more connections than it can keep
+- enables TCP keep-alive probes so idle pooled connections survive NAT and
+  load-balancer idle timeouts
+- ignores cookies, so one session is safe to share across threads
+- counts requests, new connections, slot waits and peak concurrency per host
+  (`stats()`)
+
+Configuration from the environment:
+
+- HTTP_HOST_CONCURRENCY: per-host caps as "host=N,host=N" (added to the defaults)
+- HTTP_DEFAULT_CONCURRENCY: cap for hosts without their own (default 8)
+- HTTP_KEEPALIVE_IDLE_S: idle seconds before keep-alive probes start (default 60; 0 disables)
+"""
+
+import os
+import socket
+import threading
+import time
+import weakref
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+# Concurrency cap (and pool size) per upstream host
+UPSTREAM_CONCURRENCY = {
+    "api.groq.com": 32,
+    "api.openai.com": 16,
+    "api.adzuna.com": 4,
+    "jooble.org": 4,
+}
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _host_limits_from_env() -> dict:
+    limits = dict(UPSTREAM_CONCURRENCY)
+    for item in (os.getenv("HTTP_HOST_CONCURRENCY") or "").split(","):
+        host, _, value = item.partition("=")
+        if host.strip() and value.strip():
+            limits[host.strip().lower()] = max(1, int(value))
+    return limits
+
+
+def _keepalive_options(idle_s: int) -> list:
+    """urllib3 socket options with TCP keep-alive probes after `idle_s` idle seconds."""
+    options = list(HTTPConnection.default_socket_options)
+    if idle_s <= 0:
+        return options
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    # Probe timing is platform-specific; keep whatever this OS supports
+    for name, value in (("TCP_KEEPIDLE", idle_s), ("TCP_KEEPINTVL", 15), ("TCP_KEEPCNT", 4)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections use the given socket options."""
+
+    def __init__(self, socket_options: list, **kwargs):
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+class _HostSlot:
+    """Concurrency cap and counters for one host."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphore = threading.BoundedSemaphore(limit)
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.waits = 0
+        self.wait_s = 0.0
+
+    def acquire(self, timeout: float | None) -> None:
+        start = time.perf_counter()
+        if not self.semaphore.acquire(blocking=False):
+            if not self.semaphore.acquire(timeout=timeout):
+                raise requests.ConnectTimeout(f"No free connection slot within {timeout:.1f}s ({self.limit} in flight)")
+            with self.lock:
+                self.waits += 1
+                self.wait_s += time.perf_counter() - start
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def release(self) -> None:
+        with self.lock:
+            self.in_flight -= 1
+        self.semaphore.release()
+
+
+def _connect_timeout(timeout) -> float | None:
+    """Connect part of a requests `timeout` (a number or a (connect, read) tuple)."""
+    if isinstance(timeout, (tuple, list)):
+        return timeout[0]
+    return timeout
+
+
+def release_on_close(resp: requests.Response, release) -> requests.Response:
+    """Call `release()` exactly once: when a streamed `resp` is closed, or garbage-collected unclosed."""
+    finalizer = weakref.finalize(resp, release)
+    close = resp.close
+
+    def _close():
+        try:
+            close()
+        finally:
+            finalizer()
+
+    resp.close = _close
+    return resp
+
+
+class HTTPClient:
+    """Thread-safe `requests` wrapper with per-host pools, concurrency caps and reuse metrics."""
+
+    def __init__(self, host_limits: dict | None = None, default_limit: int | None = None,
+                 keepalive_idle_s: int | None = None):
+        """
+        Args:
+            host_limits: Concurrency cap (and pool size) per host name
+            default_limit: Cap for every other host (HTTP_DEFAULT_CONCURRENCY, default 8)
+            keepalive_idle_s: Idle seconds before TCP keep-alive probes (HTTP_KEEPALIVE_IDLE_S, default 60)
+        """
+        self.host_limits = {h.lower(): n for h, n in (host_limits or _host_limits_from_env()).items()}
+        self.default_limit = int(default_limit or os.getenv("HTTP_DEFAULT_CONCURRENCY") or 8)
+        idle = keepalive_idle_s if keepalive_idle_s is not None else int(os.getenv("HTTP_KEEPALIVE_IDLE_S") or 60)
+        options = _keepalive_options(idle)
+
+        self.session = requests.Session()
+        # Cookies are per-user state; a session shared by all threads must not keep any
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self._adapters = []
+        # Mounted once here: Session.mount is not safe while other threads send
+        default = _KeepAliveAdapter(options, pool_connections=16, pool_maxsize=self.default_limit)
+        for scheme in ("https://", "http://"):
+            self.session.mount(scheme, default)
+        self._adapters.append(default)
+        for host, limit in self.host_limits.items():
+            adapter = _KeepAliveAdapter(options, pool_connections=1, pool_maxsize=limit)
+            self.session.mount(f"https://{host}/", adapter)
+            self._adapters.append(adapter)
+
+        self._lock = threading.Lock()
+        self._slots = {}
+
+    def _slot(self, url: str) -> tuple:
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        key = host if parts.port in (None, _DEFAULT_PORTS.get(parts.scheme)) else f"{host}:{parts.port}"
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._slots[key] = _HostSlot(self.host_limits.get(host, self.default_limit))
+        return key, slot
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """`requests.Session.request` under the host's concurrency cap.
+
+        Waiting longer than the connect timeout for a free slot raises `requests.ConnectTimeout`
+        (retried like any other connect timeout). A streamed response holds its slot until it
+        is closed.
+        """
+        _, slot = self._slot(url)
+        slot.acquire(_connect_timeout(kwargs.get("timeout")))
+        try:
+            resp = self.session.request(method, url, **kwargs)
+        except BaseException:
+            slot.release()
+            raise
+        if not kwargs.get("stream"):
+            slot.release()
+            return resp
+        return release_on_close(resp, slot.release)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        """Per host: cap, requests, new vs reused connections, in-flight/peak and slot waits."""
+        connections = {}
+        for adapter in self._adapters:
+            pools = adapter.poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools.get(pool_key)
+                if pool is None:
+                    continue
+                key = pool.host if pool.port in (None, _DEFAULT_PORTS.get(pool.scheme)) else f"{pool.host}:{pool.port}"
+                connections[key] = connections.get(key, 0) + pool.num_connections
+        with self._lock:
+            slots = dict(self._slots)
+        out = {}
+        for key, slot in sorted(slots.items()):
+            with slot.lock:
+                requests_, new = slot.requests, connections.get(key, 0)
+                out[key] = {
+                    "limit": slot.limit,
+                    "requests": requests_,
+                    "new_connections": new,
+                    "reused_connections": max(0, requests_ - new),
+                    "reuse_rate": round(max(0, requests_ - new) / requests_, 3) if requests_ else 0.0,
+                    "in_flight": slot.in_flight,
+                    "peak_in_flight": slot.peak_in_flight,
+                    "waits": slot.waits,
+                    "wait_s": round(slot.wait_s, 3),
+                }
+        return out
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """Process-wide HTTP client shared by every outbound call."""
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = HTTPClient()
+    return _CLIENT
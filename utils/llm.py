@@ -8,9 +8,15 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from functools import partial
+from typing import Optional, List, Dict, Any, Iterator, Union, Callable
 
-from .llm_providers import groq_chat as _groq_chat
+from .llm_providers import groq_chat as _groq_chat, groq_chat_stream as _groq_chat_stream, chat_variants
+from .llm_batch import batch_chat
+from .dispatcher import current_dispatch
+from .llm_router import LLMRouter, get_router
+from .model_cascade import cascade_chat, cascade_models_from_env, cascade_tiers
+from .retry_policy import Deadline
 
 # Catalog of commonly used models per provider
 AVAILABLE_MODELS: Dict[str, List[str]] = {
@@ -31,6 +37,9 @@ class LLMConfig:
     provider: str = "groq"
     model: Optional[str] = None
     api_key: Optional[str] = None  # required for groq
+    base_url: Optional[str] = None  # OpenAI-compatible endpoint; defaults to GROQ_BASE_URL or Groq
+    router: Optional[LLMRouter] = None  # key/model pool; when set, api_key is ignored
+    cascade: Optional[List[str]] = None  # small-to-large models tried in turn for validated calls
 
     def resolved_model(self) -> str:
         if self.model:
@@ -45,6 +54,8 @@ class LLMConfig:
                 provider="groq",
                 model=os.getenv("GROQ_MODEL") or DEFAULTS["groq"],
                 api_key=os.getenv("GROQ_API_KEY") or None,
+                router=get_router(),
+                cascade=cascade_models_from_env() or None,
             )
         else:
             # Fallback to groq
@@ -55,20 +66,100 @@ class LLMConfig:
             )
 
 
-def llm_chat(config: LLMConfig, messages: List[Dict[str, Any]], temperature: float = 0.2, max_tokens: int = 600) -> str:
+def llm_chat(config: LLMConfig, messages: List[Dict[str, Any]], temperature: float = 0.2, max_tokens: int = 600,
+             stream: bool = False, cache: bool = True, cache_only: bool = False,
+             deadline: Optional[float] = None, stop: Optional[List[str]] = None,
+             response_format: Optional[Dict[str, Any]] = None,
+             validate: Optional[Callable[[str], Optional[str]]] = None,
+             priority: Optional[str] = None, user: Optional[str] = None) -> Union[str, Iterator[str]]:
     """Unified chat interface.
 
     - For provider == "groq": uses `_groq_chat(api_key, messages, model, temperature, max_tokens)`.
+    - With `stream=True` returns an iterator of content tokens instead of the full text.
+    - `cache=False` bypasses the response cache; `cache_only=True` raises `CacheMiss` on a miss.
+    - `deadline` (seconds) bounds the call including retries; `DeadlineExceeded` is raised when it runs out.
+    - With `config.router` set, the call is spread over the router's key/model pool.
+    - `stop` / `response_format` come from the call site's decoding profile (`utils.decoding_profiles`);
+      streams do not send JSON mode, but a JSON profile still keeps the stream at its full cap, uncontinued.
+    - With `config.cascade` and a `validate` callable (see `utils.model_cascade`), non-streaming calls
+      start on the smallest cascade model and escalate only while `validate` rejects the reply.
+    - `priority` ("interactive", "standard", "background") and `user` tag the call for the
+      dispatcher (`utils.dispatcher`); unset values come from the enclosing `llm_priority`/`llm_user`.
     """
-    prov = (config.provider or "groq").lower()
     model = config.resolved_model()
+    # Resolved here so a lazily consumed stream keeps the caller's tag
+    dispatch = current_dispatch(priority, user)
+    # One deadline for the whole call: cascade tiers, router failover and continuations share it
+    deadline = Deadline.coerce(deadline)
 
-    # default to groq
-    api_key = config.api_key or os.getenv("GROQ_API_KEY")
-    return _groq_chat(api_key, messages=messages, model=model, temperature=temperature, max_tokens=max_tokens)
+    if stream:
+        if config.router is not None:
+            return config.router.chat_stream(messages, model=model, temperature=temperature, max_tokens=max_tokens,
+                                             cache=cache, cache_only=cache_only, deadline=deadline, stop=stop,
+                                             response_format=response_format, dispatch=dispatch)
+        return _groq_chat_stream(config.api_key or os.getenv("GROQ_API_KEY"), messages=messages, model=model,
+                                 temperature=temperature, max_tokens=max_tokens, cache=cache, cache_only=cache_only,
+                                 deadline=deadline, base_url=config.base_url, stop=stop,
+                                 response_format=response_format, dispatch=dispatch)
+
+    def _chat(msgs: List[Dict[str, Any]], model: str, **kwargs) -> str:
+        if config.router is not None:
+            return config.router.chat(msgs, model=model, **kwargs)
+        # default to groq
+        return _groq_chat(config.api_key or os.getenv("GROQ_API_KEY"), messages=msgs, model=model,
+                          base_url=config.base_url, **kwargs)
+
+    params = dict(temperature=temperature, max_tokens=max_tokens, cache=cache, cache_only=cache_only,
+                  stop=stop, response_format=response_format, dispatch=dispatch)
+    if config.cascade and validate is not None:
+        return cascade_chat(_chat, messages, cascade_tiers(config.cascade, model), validate,
+                            deadline=deadline, **params)
+    return _chat(messages, model, deadline=deadline, **params)
+
+
+def llm_chat_variants(config: LLMConfig, messages: List[Dict[str, Any]], n: int = 3, temperature: float = 0.7,
+                      max_tokens: int = 600, cache: bool = True, deadline: Optional[float] = None,
+                      stop: Optional[List[str]] = None,
+                      response_format: Optional[Dict[str, Any]] = None,
+                      priority: Optional[str] = None, user: Optional[str] = None) -> List[str]:
+    """`n` alternative replies to one prompt from a single round trip.
+
+    Uses the chat-completions `n` parameter, or `n` concurrent requests with distinct
+    seeds on endpoints that reject it (see `utils.llm_providers.chat_variants`).
+    """
+    model = config.resolved_model()
+    if config.router is not None:
+        chat = partial(config.router.chat, model=model)
+        endpoint = config.router.base_url
+    else:
+        chat = partial(_groq_chat, config.api_key or os.getenv("GROQ_API_KEY"), model=model, base_url=config.base_url)
+        endpoint = config.base_url
+    return chat_variants(chat, messages, n, endpoint=endpoint, temperature=temperature, max_tokens=max_tokens,
+                         cache=cache, deadline=Deadline.coerce(deadline), stop=stop, response_format=response_format,
+                         dispatch=current_dispatch(priority, user))
+
+
+def llm_chat_batch(config: LLMConfig, chat_requests: List[Dict[str, Any]], timeout: Optional[float] = None) -> List[Any]:
+    """Run bulk chat requests as one offline batch job (see `utils.llm_batch`) and wait for it.
+
+    Requests without a `model` use the config's model; with a router the batch is billed
+    to the pool's first key. Failed requests are returned as exceptions, in request order.
+    """
+    model = config.resolved_model()
+    if config.router is not None:
+        api_key, base_url = next(iter(config.router.keys)), config.router.base_url
+    else:
+        api_key, base_url = config.api_key or os.getenv("GROQ_API_KEY"), config.base_url
+    return batch_chat([{"model": model, **req} for req in chat_requests], api_key, base_url, timeout=timeout)
 
 
 def list_models(provider: Optional[str] = None) -> List[str]:
     """Return available model names for a given provider, or for the default provider.
-    This does not query remote; it returns our local catalog.
+    This does not query remote; it returns our local catalog plus any router pool models.
     """
+    prov = (provider or os.getenv("PROVIDER") or "groq").lower()
+    models = list(AVAILABLE_MODELS.get(prov) or AVAILABLE_MODELS["groq"])
+    router = get_router()
+    if router is not None:
+        models += [m for m in router.models if m not in models]
+    return models
@@ -0,0 +1,306 @@
+"""Offline batch submission for bulk LLM workloads.
+
+Nightly jobs (re-scoring every stored resume after a model change, screening
+hundreds of resumes) should not compete with live users for the interactive
+rate limits. A `BatchQueue` instead:
+
+- collects chat requests, each answered by a `concurrent.futures.Future`
+- serves requests already in the response cache immediately
+- writes the rest to a JSONL batch file, uploads it to the OpenAI-compatible
+  `/files` endpoint and creates a `/batches` job (Groq and the local stub
+  implement both)
+- polls the job on a background thread and resolves every future from the
+  output and error files, storing successful replies in the response cache
+
+Batch jobs bypass the client-side rate limiter: providers meter them against
+a separate batch quota at batch pricing. `batch_chat()` is the blocking
+counterpart of `chat_parallel` for scripts, and
+
+    python -m utils.llm_batch requests.jsonl results.jsonl
+
+runs a file of `groq_chat` keyword-argument dicts as one batch.
+
+Configuration from the environment:
+
+- LLM_BATCH_POLL_S: seconds between status polls (default 30)
+- LLM_BATCH_WINDOW: completion window requested from the provider (default 24h)
+- LLM_BATCH_DIR: where batch input files are kept (default .cache/llm/batches)
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import threading
+from concurrent.futures import Future
+
+import requests
+
+from .http_client import get_http_client
+from .llm_cache import get_cache
+from .llm_providers import _cache_lookup, _groq_request, groq_base_url
+from .rate_limiter import key_id
+from .retry_policy import GROQ_POLICY, RetryPolicy
+from .telemetry import LLMCallEvent, get_telemetry, resolve_call_site
+
+DEFAULT_BATCH_DIR = os.path.join(".cache", "llm", "batches")
+
+# Terminal job states; anything else is still queued or running
+FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class BatchError(RuntimeError):
+    """A batch job, or one request inside it, did not produce a reply."""
+
+
+class BatchClient:
+    """Thin client for the OpenAI-compatible `/files` and `/batches` endpoints."""
+
+    def __init__(self, api_key: str | None, base_url: str | None = None, policy: RetryPolicy | None = None):
+        self.api_key = api_key
+        self.base_url = groq_base_url(base_url)
+        self.policy = policy or GROQ_POLICY
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+
+        def _send(timeout):
+            return get_http_client().request(method, f"{self.base_url}{path}", headers=headers, timeout=timeout, **kwargs)
+
+        return self.policy.execute(_send, breaker_key=f"groq-batch:{key_id(self.api_key)}")
+
+    def upload(self, path: str) -> str:
+        """Upload a JSONL input file; returns its file id."""
+        # Bytes, not a file handle: a retried attempt must upload the whole file again
+        with open(path, "rb") as f:
+            body = f.read()
+        resp = self._request("POST", "/files", data={"purpose": "batch"},
+                             files={"file": (os.path.basename(path), body, "application/jsonl")})
+        return resp.json()["id"]
+
+    def create(self, input_file_id: str, completion_window: str = "24h", metadata: dict | None = None) -> dict:
+        """Start a chat-completions batch over an uploaded file."""
+        body = {"input_file_id": input_file_id, "endpoint": "/v1/chat/completions",
+                "completion_window": completion_window}
+        if metadata:
+            body["metadata"] = metadata
+        return self._request("POST", "/batches", json=body).json()
+
+    def retrieve(self, batch_id: str) -> dict:
+        return self._request("GET", f"/batches/{batch_id}").json()
+
+    def cancel(self, batch_id: str) -> dict:
+        return self._request("POST", f"/batches/{batch_id}/cancel").json()
+
+    def content(self, file_id: str) -> str:
+        """Raw text of an output or error file."""
+        return self._request("GET", f"/files/{file_id}/content").text
+
+
+class BatchJob:
+    """One submitted batch: its provider id, input file and the futures it resolves."""
+
+    def __init__(self, batch_id: str, input_path: str, futures: list):
+        self.id = batch_id
+        self.input_path = input_path
+        self.futures = futures
+        self.status = "validating"
+        self.submitted_at = time.time()
+        self.finished_at = None
+        self._done = threading.Event()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until every future is resolved; False if `timeout` passed first."""
+        return self._done.wait(timeout)
+
+    def results(self, timeout: float | None = None) -> list:
+        """Replies in submission order, with exceptions in place of failed requests.
+
+        Requests still unresolved when `timeout` passes come back as `TimeoutError`.
+        """
+        self.wait(timeout)
+        return [(f.exception() or f.result()) if f.done() else TimeoutError(f"Batch {self.id} still {self.status}")
+                for f in self.futures]
+
+
+def _reply_text(body: dict) -> str:
+    message = ((body.get("choices") or [{}])[0].get("message") or {})
+    return message.get("content") or ""
+
+
+class BatchQueue:
+    """Collects chat requests and submits them as one provider batch job."""
+
+    def __init__(self, api_key: str | None, base_url: str | None = None, poll_interval: float | None = None,
+                 completion_window: str | None = None, workdir: str | None = None, cache: bool = True,
+                 client: BatchClient | None = None):
+        """
+        Args:
+            api_key: Key the batch is billed to
+            base_url: OpenAI-compatible endpoint (defaults to GROQ_BASE_URL or Groq)
+            poll_interval: Seconds between status polls (LLM_BATCH_POLL_S, default 30)
+            completion_window: Provider completion window (LLM_BATCH_WINDOW, default "24h")
+            workdir: Directory for JSONL input files (LLM_BATCH_DIR)
+            cache: Serve cached replies without batching them, and cache the batch's replies
+            client: Pre-built client (tests, custom retry policy)
+        """
+        self.client = client or BatchClient(api_key, base_url)
+        self.poll_interval = float(poll_interval if poll_interval is not None else os.getenv("LLM_BATCH_POLL_S") or 30)
+        self.completion_window = completion_window or os.getenv("LLM_BATCH_WINDOW") or "24h"
+        self.workdir = workdir or os.getenv("LLM_BATCH_DIR") or DEFAULT_BATCH_DIR
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._pending = []  # (custom_id, payload, cache key, call site, future)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def submit(self, messages: list, model: str | None = None, temperature: float = 0.2, max_tokens: int = 600,
+               stop=None, response_format: dict | None = None, seed: int | None = None) -> Future:
+        """Queue one chat request; the future resolves to its reply text once the batch finishes."""
+        url, _, payload = _groq_request(None, messages, model, temperature, max_tokens, require_key=False,
+                                        base_url=self.client.base_url, stop=stop, response_format=response_format,
+                                        seed=seed)
+        future = Future()
+        # Same key as an interactive `groq_chat` call, so either path reuses the other's replies
+        _, key, cached = _cache_lookup(url, payload, self.cache, False)
+        if cached is not None:
+            future.set_result(cached)
+            return future
+        with self._lock:
+            self._pending.append((f"req-{len(self._pending)}-{uuid.uuid4().hex[:8]}", payload, key,
+                                  resolve_call_site(), future))
+        return future
+
+    def flush(self, metadata: dict | None = None) -> BatchJob | None:
+        """Submit everything queued so far as one batch job; None when nothing needed a call."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return None
+        os.makedirs(self.workdir, exist_ok=True)
+        path = os.path.join(self.workdir, f"batch-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            for custom_id, payload, _, _, _ in pending:
+                line = {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": payload}
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        try:
+            batch = self.client.create(self.client.upload(path), self.completion_window, metadata)
+        except Exception as e:
+            for *_, future in pending:
+                future.set_exception(e)
+            raise
+        job = BatchJob(batch["id"], path, [future for *_, future in pending])
+        job.status = batch.get("status") or job.status
+        threading.Thread(target=self._poll, args=(job, pending), name=f"llm-batch-{job.id}", daemon=True).start()
+        return job
+
+    def _poll(self, job: BatchJob, pending: list) -> None:
+        try:
+            while True:
+                batch = self.client.retrieve(job.id)
+                job.status = batch.get("status") or job.status
+                if job.status in FINAL_STATUSES:
+                    break
+                time.sleep(self.poll_interval)
+            job.finished_at = time.time()
+            lines = {}
+            for file_key in ("output_file_id", "error_file_id"):
+                if batch.get(file_key):
+                    for raw in self.client.content(batch[file_key]).splitlines():
+                        if raw.strip():
+                            item = json.loads(raw)
+                            lines.setdefault(item.get("custom_id"), item)
+            for custom_id, payload, key, site, future in pending:
+                self._resolve(job, lines.get(custom_id), payload, key, site, future)
+        except Exception as e:
+            for future in job.futures:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            job._done.set()
+
+    def _resolve(self, job: BatchJob, item: dict | None, payload: dict, key: str, site: str, future: Future) -> None:
+        if future.done():  # cancelled by the caller
+            return
+        event = LLMCallEvent(call_site=site, model=payload["model"], cache="batch", max_tokens=payload["max_tokens"])
+        event.latency_s = event.ttfb_s = (job.finished_at or time.time()) - job.submitted_at
+        response = (item or {}).get("response") or {}
+        body = response.get("body") or {}
+        if response.get("status_code") == 200 and body.get("choices"):
+            content = _reply_text(body)
+            usage = body.get("usage") or {}
+            event.prompt_tokens = int(usage.get("prompt_tokens") or 0)
+            event.completion_tokens = int(usage.get("completion_tokens") or 0)
+            event.finish_reason = body["choices"][0].get("finish_reason")
+            store = get_cache() if self.cache else None
+            if store is not None:
+                store.set(key, content, model=payload["model"])
+            future.set_result(content)
+        else:
+            error = (item or {}).get("error") or body.get("error") or {}
+            message = error.get("message") if isinstance(error, dict) else str(error)
+            event.ok = False
+            event.error = message or f"no result (batch {job.status})"
+            future.set_exception(BatchError(f"Batch {job.id} request failed: {event.error}"))
+        get_telemetry().record(event)
+
+
+def batch_chat(chat_requests: list, api_key: str | None, base_url: str | None = None,
+               timeout: float | None = None, **queue_kwargs) -> list:
+    """Run `groq_chat`-style keyword dicts as one batch job and wait for it.
+
+    Args:
+        chat_requests: Dicts with `messages` and optional `model`/`temperature`/`max_tokens`/`stop`/
+            `response_format`/`seed`
+        api_key: Key the batch is billed to
+        base_url: OpenAI-compatible endpoint
+        timeout: Seconds to wait for the job; unfinished requests come back as `TimeoutError`
+        **queue_kwargs: Passed to `BatchQueue`
+
+    Returns:
+        Replies in request order, with exceptions in place of failed requests
+    """
+    queue = BatchQueue(api_key, base_url, **queue_kwargs)
+    futures = [queue.submit(**req) for req in chat_requests]
+    job = queue.flush()
+    if job is not None:
+        job.wait(timeout)
+    # Cache hits resolve at submit and are not part of the job
+    return [(f.exception() or f.result()) if f.done() else TimeoutError(f"Batch {job.id} still {job.status}")
+            for f in futures]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a JSONL file of chat requests as one LLM batch job")
+    parser.add_argument("requests", help="JSONL file; one dict of groq_chat keyword arguments per line")
+    parser.add_argument("output", help="JSONL file to write results to, in input order")
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--poll-s", type=float, default=None)
+    parser.add_argument("--timeout-s", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    with open(args.requests, encoding="utf-8") as f:
+        chat_requests = [json.loads(line) for line in f if line.strip()]
+    results = batch_chat(chat_requests, os.getenv("GROQ_API_KEY"), args.base_url, timeout=args.timeout_s,
+                         poll_interval=args.poll_s)
+    failed = 0
+    with open(args.output, "w", encoding="utf-8") as f:
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                failed += 1
+                f.write(json.dumps({"index": i, "error": str(result)}) + "\n")
+            else:
+                f.write(json.dumps({"index": i, "content": result}, ensure_ascii=False) + "\n")
+    print(f"{len(results) - failed}/{len(results)} requests answered; results in {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""Persistent, content-addressed cache for LLM responses.
+
+Responses are keyed by a SHA-256 of (model, messages, temperature, max_tokens)
+and stored in a local SQLite file with TTL expiry, LRU eviction and a size cap.
+Configuration comes from the environment:
+
+- LLM_CACHE_DISABLED: set to 1/true to turn the cache off
+- LLM_CACHE_PATH: SQLite file (default .cache/llm/responses.sqlite3)
+- LLM_CACHE_TTL: entry lifetime in seconds (default 7 days)
+- LLM_CACHE_MAX_MB: total payload size cap in megabytes (default 64)
+
+The cache is an optimisation: a SQLite error on read or write (locked or
+corrupt file, full disk, schema mismatch) is logged and treated as a miss or a
+skipped write, never raised into the LLM call.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm", "responses.sqlite3")
+
+
+class CacheMiss(LookupError):
+    """Raised in cache-only mode when no cached response exists."""
+
+
+def make_cache_key(model: str, messages: list, temperature: float, max_tokens: int, **extra) -> str:
+    """Stable content hash for a chat request."""
+    blob = json.dumps(
+        {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens, **extra},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# Optional payload fields that change the response and so belong in the key
+KEYED_PAYLOAD_FIELDS = ("stop", "response_format", "n", "seed")
+
+
+def payload_cache_key(payload: dict, **extra) -> str:
+    """Cache key for a chat-completions payload, including optional decoding fields when set."""
+    for name in KEYED_PAYLOAD_FIELDS:
+        if payload.get(name) is not None:
+            extra.setdefault(name, payload[name])
+    return make_cache_key(payload["model"], payload["messages"], payload["temperature"], payload["max_tokens"], **extra)
+
+
+class LLMCache:
+    """SQLite-backed response cache with TTL, LRU eviction and a size cap."""
+
+    def __init__(self, path: str | None = None, ttl_seconds: float | None = None, max_bytes: int | None = None):
+        self.path = path or os.getenv("LLM_CACHE_PATH") or DEFAULT_CACHE_PATH
+        self.ttl_seconds = float(ttl_seconds if ttl_seconds is not None else os.getenv("LLM_CACHE_TTL") or 7 * 24 * 3600)
+        self.max_bytes = int(max_bytes if max_bytes is not None else float(os.getenv("LLM_CACHE_MAX_MB") or 64) * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._writes_since_evict = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT,"
+            " value TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached value for `key`, or None on miss/expiry (or when the store fails)."""
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                value, created_at = row
+                if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.misses += 1
+                    return None
+                self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+            except sqlite3.Error as e:
+                print(f"LLM cache read failed: {e}")
+                self.errors += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str, model: str | None = None) -> None:
+        """Store `value` under `key`, evicting old entries when over the size cap."""
+        if value is None:
+            return
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, value, size, now, now),
+                )
+                self._conn.commit()
+                self._writes_since_evict += 1
+                if self._writes_since_evict >= 20:
+                    self._evict_locked()
+            except sqlite3.Error as e:
+                print(f"LLM cache write failed: {e}")
+                self.errors += 1
+
+    def evict(self) -> None:
+        """Drop expired entries, then least-recently-used ones until under the size cap."""
+        with self._lock:
+            self._evict_locked()
+
+    def _evict_locked(self) -> None:
+        self._writes_since_evict = 0
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if self.max_bytes and total > self.max_bytes:
+            # Trim to 90% of the cap so we do not evict on every write
+            target = int(self.max_bytes * 0.9)
+            cursor = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC")
+            doomed = []
+            for key, size in cursor:
+                if total <= target:
+                    break
+                doomed.append((key,))
+                total -= size
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """Entry count, stored bytes and hit/miss/error counters."""
+        with self._lock:
+            entries, total = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        return {"entries": entries, "bytes": total, "hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+
+_CACHE = None
+_CACHE_LOCK = threading.Lock()
+_CACHE_FAILED = False
+
+
+def get_cache() -> LLMCache | None:
+    """Return the process-wide cache, or None when disabled or unavailable."""
+    global _CACHE, _CACHE_FAILED
+    if (os.getenv("LLM_CACHE_DISABLED") or "").strip().lower() in ("1", "true", "yes"):
+        return None
+    if _CACHE is not None or _CACHE_FAILED:
+        return _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None and not _CACHE_FAILED:
+            try:
+                _CACHE = LLMCache()
+            except Exception as e:
+                # Caching is an optimisation; never block LLM calls on it
+                print(f"LLM cache unavailable: {e}")
+                _CACHE_FAILED = True
+    return _CACHE
@@ -1,62 +1,508 @@
 """LLM Provider utilities for Groq."""
 
 import os
-import re
 import json
 import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import requests
 
-# Reuse a single HTTP session for all outbound requests
-SESSION = requests.Session()
+from .cassette import get_cassette
+from .dispatcher import DispatchTag, current_dispatch, get_dispatcher
+from .http_client import get_http_client, release_on_close
+from .llm_cache import CacheMiss, get_cache, payload_cache_key
+from .output_sizing import CONTINUE_PROMPT, MAX_CONTINUATIONS, get_output_sizer
+from .rate_limiter import estimate_tokens, get_rate_limiter, key_id
+from .retry_policy import GROQ_POLICY, Deadline, RetryPolicy
+from .singleflight import SingleFlight
+from .prompt_budget import count_message_tokens, count_tokens
+from .telemetry import LLMCallEvent, call_site, resolve_call_site, track_llm_call
 
+# Every outbound request shares one pooled, per-host capped client
+SESSION = get_http_client()
 
-def groq_chat(api_key: str, messages: list, model: str = None, temperature: float = 0.2, max_tokens: int = 600) -> str:
-    """Minimal Groq chat-completions helper returning assistant content as text.
+# Identical requests already in flight (double-clicks, Streamlit reruns) share one HTTP call
+INFLIGHT = SingleFlight()
 
-    Token-optimized: enforce a single model (llama-3.1-8b-instant) with no fallbacks.
+
+DEFAULT_GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+
+def groq_base_url(base_url: str | None = None) -> str:
+    """Resolve the OpenAI-compatible base URL (argument, then GROQ_BASE_URL, then Groq)."""
+    return (base_url or os.getenv("GROQ_BASE_URL") or DEFAULT_GROQ_BASE_URL).rstrip("/")
+
+
+def _post_with_retries(url: str, headers: dict, payload: dict, stream: bool = False, api_key: str | None = None,
+                       deadline=None, policy: RetryPolicy | None = None,
+                       event: LLMCallEvent | None = None, dispatch: DispatchTag | None = None) -> requests.Response:
+    """POST with client-side pacing, then retry/backoff, deadline and circuit breaking from `policy`.
+
+    Each attempt first paces in the per-key rate limiter, then waits for a dispatch slot
+    (`utils.dispatcher`) in the priority class and user of `dispatch`, so a slot is only held
+    while a request is actually on the wire; a streamed response keeps its slot until it is closed.
+    Retries, dispatch queue and rate-limit waits are added to `event` when given.
     """
-    if not api_key:
+    policy = policy or GROQ_POLICY
+    deadline = Deadline.coerce(deadline)
+    limiter = get_rate_limiter()
+    dispatcher = get_dispatcher()
+    dispatch = dispatch or current_dispatch()
+    est_tokens = estimate_tokens(payload.get("messages") or [], payload.get("max_tokens") or 0, payload.get("model"))
+
+    def _send(timeout):
+        # Pace before queueing for a slot: a request sleeping out its key's RPM/TPM window
+        # must not keep a slot from requests on other keys
+        if limiter is not None:
+            waited = limiter.acquire(api_key, est_tokens, max_wait_s=deadline.remaining() if deadline is not None else None)
+            if event is not None:
+                event.rate_limit_wait_s += waited
+        release = None
+        if dispatcher is not None:
+            release, queued = dispatcher.acquire(dispatch, timeout=deadline.remaining() if deadline is not None else None)
+            if event is not None:
+                event.queue_wait_s += queued
+        try:
+            resp = SESSION.post(url, headers=headers, json=payload, timeout=timeout, stream=stream)
+            if limiter is not None:
+                limiter.update_from_headers(api_key, resp.headers)
+                if resp.status_code >= 400:
+                    # Nothing was generated: the completion part of the reservation is free again
+                    limiter.refund(api_key, int(payload.get("max_tokens") or 0))
+        except BaseException:
+            if release is not None:
+                release()
+            raise
+        if release is not None:
+            if stream:
+                release_on_close(resp, release)
+            else:
+                release()
+        return resp
+
+    def _on_retry(resp, delay):
+        if event is not None:
+            event.retries += 1
+            if resp is not None and resp.status_code == 429:
+                event.rate_limit_wait_s += delay
+        if limiter is not None and resp is not None and resp.status_code == 429:
+            # Hold back other threads on this key too, rather than letting them pile into 429s
+            limiter.penalize(api_key, delay)
+
+    return policy.execute(_send, breaker_key=f"groq:{key_id(api_key)}", deadline=deadline, on_retry=_on_retry)
+
+
+def _groq_request(api_key: str, messages: list, model: str | None, temperature: float, max_tokens: int,
+                  require_key: bool = True, base_url: str | None = None, stop=None, response_format: dict | None = None,
+                  n: int = 1, seed: int | None = None):
+    """Build URL, headers and payload for a Groq chat-completions call."""
+    if not api_key and require_key:
         raise RuntimeError("Groq API key missing")
-    url = "https://api.groq.com/openai/v1/chat/completions"
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
     model = (model or os.getenv("GROQ_MODEL") or "llama-3.1-8b-instant")
     payload = {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens}
-    # Simple retry/backoff for rate limits and transient errors
-    attempts = 0
-    last_err = None
-    while attempts < 2:
-        resp = SESSION.post(url, headers=headers, json=payload, timeout=30)
-        if resp.status_code == 429:
-            # Parse suggested wait from message, else sleep a small backoff
-            wait_s = 2.5
+    if stop:
+        payload["stop"] = list(stop) if isinstance(stop, (list, tuple)) else stop
+    if response_format:
+        payload["response_format"] = response_format
+    if n > 1:
+        payload["n"] = n
+    if seed is not None:
+        payload["seed"] = seed
+    return f"{groq_base_url(base_url)}/chat/completions", headers, payload
+
+
+def _cache_lookup(url: str, payload: dict, cache: bool, cache_only: bool):
+    """Return (cache, key, cached_value) for a request payload."""
+    # Keep responses from other endpoints (e.g. the local stub) apart from real Groq ones
+    extra = {} if url.startswith(DEFAULT_GROQ_BASE_URL + "/") else {"url": url}
+    key = payload_cache_key(payload, **extra)
+    store = get_cache() if (cache or cache_only) else None
+    if store is None:
+        if cache_only:
+            raise CacheMiss("LLM cache is disabled")
+        return None, key, None
+    cached = store.get(key)
+    if cached is None and cache_only:
+        raise CacheMiss(f"No cached response for {payload['model']} request {key[:12]}")
+    return store, key, cached
+
+
+def groq_chat(api_key: str, messages: list, model: str = None, temperature: float = 0.2, max_tokens: int = 600,
+              cache: bool = True, cache_only: bool = False, deadline=None, policy: RetryPolicy | None = None,
+              base_url: str | None = None, stop=None, response_format: dict | None = None, n: int = 1,
+              seed: int | None = None, dispatch: DispatchTag | None = None) -> str | list:
+    """Minimal Groq chat-completions helper returning assistant content as text.
+
+    Token-optimized: enforce a single model (llama-3.1-8b-instant) with no fallbacks.
+    Responses are served from the persistent LLM cache when available; pass
+    `cache=False` to bypass it or `cache_only=True` to raise `CacheMiss` instead of calling Groq.
+    Concurrent identical requests on the same key are coalesced into one HTTP call.
+    `deadline` (seconds, or a `Deadline`) bounds the whole call including retries;
+    `policy` overrides the default `GROQ_POLICY`; `base_url` (or GROQ_BASE_URL) points
+    the call at another OpenAI-compatible endpoint such as `utils.groq_stub`.
+    With an active cassette (`utils.cassette`) calls are recorded or replayed instead.
+    `stop` and `response_format` (e.g. `{"type": "json_object"}`) are sent as given; if
+    Groq rejects a JSON-mode generation as invalid, the call is repeated once without it.
+    With `n` > 1 the endpoint is asked for `n` choices and a list of texts is returned
+    (see `chat_variants` for endpoints that only allow n=1); `seed` is sent as given.
+    `dispatch` sets the call's priority class and fair-share user (see `utils.dispatcher`).
+    """
+    # One budget for the whole call: JSON-mode retries and continuations must not restart it
+    deadline = Deadline.coerce(deadline)
+    cassette = get_cassette()
+    replaying = cassette is not None and cassette.replaying
+    url, headers, payload = _groq_request(api_key, messages, model, temperature, max_tokens,
+                                          require_key=not (cache_only or replaying), base_url=base_url,
+                                          stop=stop, response_format=response_format, n=n, seed=seed)
+    site = resolve_call_site()
+    dispatch = dispatch or current_dispatch()
+    with track_llm_call(payload["model"], site=site) as event:
+        event.priority = dispatch.priority
+        if replaying:
+            event.cache = "replay"
+            content = cassette.replay(payload)
+            _estimate_usage(event, payload, content)
+            return _choices(content, n)
+        # While recording, skip cache reads so every call reaches the wire and lands on the cassette
+        store, key, cached = _cache_lookup(url, payload, cache and cassette is None, cache_only)
+        if cached is not None:
+            event.cache = "hit"
+            _estimate_usage(event, payload, cached)
+            return _choices(cached, n)
+        event.cache = "coalesced"
+
+        def _fetch() -> str:
+            event.cache = "miss" if store is not None else "bypass"
+            start = time.perf_counter()
+            # Cache and cassette keys keep the caller's cap; the wire carries the learned one.
+            # JSON replies are never capped below the caller's limit: continued JSON would not parse.
+            sized = n == 1 and "response_format" not in payload
+            sizer, prompt_est, wire = _sized_payload(payload, site) if sized else (None, 0, payload)
+            event.max_tokens = wire["max_tokens"]
+            try:
+                resp = _post_with_retries(url, headers, wire, api_key=api_key, deadline=deadline, policy=policy,
+                                          event=event, dispatch=dispatch)
+            except requests.HTTPError as e:
+                if "response_format" not in wire or "json_validate_failed" not in str(e):
+                    raise
+                # JSON mode generation failed validation: let the caller's own parsing handle free text
+                wire = {k: v for k, v in wire.items() if k != "response_format"}
+                resp = _post_with_retries(url, headers, wire, api_key=api_key, deadline=deadline, policy=policy,
+                                          event=event, dispatch=dispatch)
+            event.ttfb_s = resp.elapsed.total_seconds()
+            data = resp.json()
+            usage = data.get("usage") or {}
+            event.prompt_tokens = int(usage.get("prompt_tokens") or 0)
+            event.completion_tokens = int(usage.get("completion_tokens") or 0)
+            _refund_unused(api_key, wire, event.completion_tokens)
             try:
-                msg = resp.text or ""
-                m = re.search(r"try again in\s([\d\.]+)s", msg)
-                if m:
-                    wait_s = min(max(float(m.group(1)) * 1.2, 2.0), 8.0)
+                content = data["choices"][0]["message"]["content"]
             except Exception:
-                pass
-            time.sleep(wait_s)
-            attempts += 1
-            last_err = resp
-            continue
-        if 500 <= resp.status_code < 600:
-            # transient server error
-            time.sleep(1.5 * (attempts + 1))
-            attempts += 1
-            last_err = resp
-            continue
-        if resp.status_code >= 400:
-            raise requests.HTTPError(f"{resp.status_code} {resp.reason}: {resp.text}")
+                return json.dumps(data)
+            event.finish_reason = data["choices"][0].get("finish_reason")
+            if n > 1:
+                # Several choices are cached and recorded as one JSON list
+                content = json.dumps([(c.get("message") or {}).get("content") or "" for c in data["choices"]])
+            elif "response_format" not in payload:
+                content = _continue_truncated(url, headers, wire, payload["max_tokens"], content, event,
+                                              api_key=api_key, deadline=deadline, policy=policy, dispatch=dispatch)
+            if sizer is not None:
+                sizer.record(site, prompt_est, event.completion_tokens or count_tokens(content, payload["model"]))
+            usage = {"prompt_tokens": event.prompt_tokens, "completion_tokens": event.completion_tokens}
+            if store is not None:
+                store.set(key, content, payload["model"])
+            if cassette is not None:
+                cassette.record(payload, content, time.perf_counter() - start, usage=usage)
+            return content
+
+        content = INFLIGHT.do(f"{key_id(api_key)}:{key}", _fetch, deadline=deadline)
+        _estimate_usage(event, payload, content)
+        return _choices(content, n)
+
+
+def _choices(content: str, n: int) -> str | list:
+    """The text for n=1, or the list of choice texts stored as JSON for n > 1."""
+    if n <= 1:
+        return content
+    try:
+        texts = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        return [content]
+    return [str(t) for t in texts] if isinstance(texts, list) else [content]
+
+
+def _refund_unused(api_key: str | None, wire: dict, completion_tokens: int) -> None:
+    """Give the rate limiter back the part of `wire`'s max_tokens reservation the reply did not use."""
+    limiter = get_rate_limiter()
+    if limiter is not None and completion_tokens:
+        limiter.refund(api_key, int(wire.get("max_tokens") or 0) - completion_tokens)
+
+
+def _estimate_usage(event: LLMCallEvent, payload: dict, content: str) -> None:
+    """Fill token counts locally when the provider did not report usage (cache hits, replays)."""
+    if not event.prompt_tokens:
+        event.prompt_tokens = count_message_tokens(payload["messages"], payload["model"])
+    if not event.completion_tokens:
+        event.completion_tokens = count_tokens(content, payload["model"])
+
+
+def _sized_payload(payload: dict, site: str) -> tuple:
+    """(sizer, prompt token estimate, payload to send) with max_tokens lowered to the learned cap."""
+    sizer = get_output_sizer()
+    if sizer is None:
+        return None, 0, payload
+    prompt_est = count_message_tokens(payload["messages"], payload["model"])
+    sized = sizer.suggest(site, prompt_est, payload["max_tokens"])
+    return sizer, prompt_est, payload if sized == payload["max_tokens"] else {**payload, "max_tokens": sized}
+
+
+def _continuation(wire: dict, content: str, budget: int) -> dict:
+    """Payload asking the model to carry on from a reply cut off by max_tokens."""
+    follow = {k: v for k, v in wire.items() if k != "response_format"}
+    follow["messages"] = list(wire["messages"]) + [
+        {"role": "assistant", "content": content},
+        {"role": "user", "content": CONTINUE_PROMPT},
+    ]
+    follow["max_tokens"] = budget
+    return follow
+
+
+def _continue_truncated(url: str, headers: dict, wire: dict, ceiling: int, content: str, event: LLMCallEvent,
+                        api_key: str | None = None, deadline=None, policy: RetryPolicy | None = None,
+                        dispatch: DispatchTag | None = None) -> str:
+    """Continue a reply that stopped at the sent cap until it finishes or reaches the caller's `ceiling`."""
+    produced = event.completion_tokens or count_tokens(content, wire["model"])
+    while event.finish_reason == "length" and event.continuations < MAX_CONTINUATIONS:
+        budget = ceiling - produced
+        if budget < 32:
+            break
+        resp = _post_with_retries(url, headers, _continuation(wire, content, budget), api_key=api_key,
+                                  deadline=deadline, policy=policy, event=event, dispatch=dispatch)
         data = resp.json()
+        usage = data.get("usage") or {}
         try:
-            return data["choices"][0]["message"]["content"]
+            piece = data["choices"][0]["message"]["content"] or ""
         except Exception:
-            return json.dumps(data)
-    # if we exhausted retries
-    if last_err is not None:
-        raise requests.HTTPError(f"{last_err.status_code} {last_err.reason}: {last_err.text}")
-    raise RuntimeError("Groq request failed after retries")
+            break
+        event.continuations += 1
+        event.finish_reason = data["choices"][0].get("finish_reason")
+        event.prompt_tokens += int(usage.get("prompt_tokens") or 0)
+        _refund_unused(api_key, {"max_tokens": budget}, int(usage.get("completion_tokens") or 0))
+        added = int(usage.get("completion_tokens") or 0) or count_tokens(piece, wire["model"])
+        event.completion_tokens = produced = produced + added
+        content += piece
+    return content
+
+
+def iter_sse_deltas(resp: requests.Response, usage: dict | None = None, meta: dict | None = None):
+    """Yield content deltas from an OpenAI-compatible `text/event-stream` response.
+
+    Token usage reported in the stream (`usage` or Groq's `x_groq.usage`) is copied into `usage`,
+    and the choice's `finish_reason` into `meta`.
+    """
+    for raw in resp.iter_lines(decode_unicode=True):
+        if not raw or not raw.startswith("data:"):
+            continue
+        data = raw[len("data:"):].strip()
+        if data == "[DONE]":
+            break
+        try:
+            chunk = json.loads(data)
+        except json.JSONDecodeError:
+            continue
+        if chunk.get("error"):
+            raise requests.HTTPError(f"Groq stream error: {chunk['error']}")
+        reported = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage")
+        if usage is not None and reported:
+            usage.update(reported)
+        for choice in chunk.get("choices") or []:
+            if meta is not None and choice.get("finish_reason"):
+                meta["finish_reason"] = choice["finish_reason"]
+            delta = (choice.get("delta") or {}).get("content")
+            if delta:
+                yield delta
+
+
+def groq_chat_stream(api_key: str, messages: list, model: str = None, temperature: float = 0.2, max_tokens: int = 600,
+                     cache: bool = True, cache_only: bool = False, deadline=None, policy: RetryPolicy | None = None,
+                     base_url: str | None = None, stop=None, response_format: dict | None = None,
+                     dispatch: DispatchTag | None = None):
+    """Streaming variant of `groq_chat` yielding content tokens as they arrive.
+
+    Retries only apply before the first byte; once tokens are flowing, errors propagate.
+    A cached response is yielded as a single chunk; completed streams are cached.
+    JSON mode is not available for streams, so `response_format` is not sent; a JSON reply is
+    still streamed under the caller's full cap and never continued, as in `groq_chat`.
+    """
+    # Resolve the call site and dispatch tag now: the generator body runs later, from the consumer's stack
+    return _chat_stream(resolve_call_site(), api_key, messages, model, temperature, max_tokens,
+                        cache, cache_only, deadline, policy, base_url, stop, dispatch or current_dispatch(),
+                        json_reply=response_format is not None)
+
+
+def _chat_stream(site, api_key, messages, model, temperature, max_tokens, cache, cache_only, deadline, policy, base_url,
+                 stop=None, dispatch=None, json_reply=False):
+    # One budget for the whole stream, continuations included
+    deadline = Deadline.coerce(deadline)
+    cassette = get_cassette()
+    replaying = cassette is not None and cassette.replaying
+    url, headers, payload = _groq_request(api_key, messages, model, temperature, max_tokens,
+                                          require_key=not (cache_only or replaying), base_url=base_url, stop=stop)
+    with track_llm_call(payload["model"], stream=True, site=site) as event:
+        event.priority = dispatch.priority if dispatch is not None else "standard"
+        start = time.perf_counter()
+        if replaying:
+            event.cache = "replay"
+            chunks = []
+            for delta in cassette.replay_stream(payload):
+                if not chunks:
+                    event.ttfb_s = time.perf_counter() - start
+                chunks.append(delta)
+                yield delta
+            _estimate_usage(event, payload, "".join(chunks))
+            return
+        store, key, cached = _cache_lookup(url, payload, cache and cassette is None, cache_only)
+        if cached is not None:
+            event.cache = "hit"
+            _estimate_usage(event, payload, cached)
+            yield cached
+            return
+        event.cache = "miss" if store is not None else "bypass"
+        payload["stream"] = True
+        # JSON replies keep the caller's cap: a continuation glued onto a cut-off object would not parse
+        sizer, prompt_est, wire = _sized_payload(payload, site) if not json_reply else (None, 0, payload)
+        event.max_tokens = wire["max_tokens"]
+        chunks = []
+        timings = []
+        while True:
+            resp = _post_with_retries(url, headers, wire, stream=True, api_key=api_key, deadline=deadline,
+                                      policy=policy, event=event, dispatch=dispatch)
+            usage, meta, pieces = {}, {}, []
+            try:
+                for delta in iter_sse_deltas(resp, usage, meta):
+                    chunks.append(delta)
+                    pieces.append(delta)
+                    timings.append(time.perf_counter() - start)
+                    if len(timings) == 1:
+                        event.ttfb_s = timings[0]
+                    yield delta
+            finally:
+                resp.close()
+            event.finish_reason = meta.get("finish_reason")
+            event.prompt_tokens += int(usage.get("prompt_tokens") or 0)
+            _refund_unused(api_key, wire, int(usage.get("completion_tokens") or 0))
+            event.completion_tokens += (int(usage.get("completion_tokens") or 0)
+                                        or count_tokens("".join(pieces), payload["model"]))
+            # Cut off at the learned cap: keep streaming the rest, up to the caller's cap
+            budget = payload["max_tokens"] - event.completion_tokens
+            if (json_reply or event.finish_reason != "length" or event.continuations >= MAX_CONTINUATIONS
+                    or budget < 32):
+                break
+            event.continuations += 1
+            wire = _continuation(wire, "".join(chunks), budget)
+        _estimate_usage(event, payload, "".join(chunks))
+        if sizer is not None and chunks:
+            sizer.record(site, prompt_est, event.completion_tokens)
+        usage = {"prompt_tokens": event.prompt_tokens, "completion_tokens": event.completion_tokens}
+        if store is not None and chunks:
+            store.set(key, "".join(chunks), payload["model"])
+        if cassette is not None and chunks:
+            cassette.record(payload, "".join(chunks), time.perf_counter() - start, ttfb_s=timings[0],
+                            chunks=list(zip(timings, chunks)), usage=usage)
+
+
+async def agroq_chat(api_key: str, messages: list, model: str = None, temperature: float = 0.2, max_tokens: int = 600,
+                     **kwargs) -> str:
+    """Async variant of `groq_chat`.
+
+    Runs the blocking request on a worker thread so retries, backoff, caching and
+    the shared session behave exactly as in the synchronous helper. Extra keyword
+    arguments are passed through to `groq_chat`.
+    """
+    return await asyncio.to_thread(groq_chat, api_key, messages, model, temperature, max_tokens, **kwargs)
+
+
+async def gather_chat(chat_requests: list, max_concurrency: int = 4, return_exceptions: bool = True,
+                      site: str | None = None, chat_fn=None) -> list:
+    """Run several independent chat requests concurrently.
+
+    Args:
+        chat_requests: List of keyword-argument dicts accepted by `groq_chat`
+        max_concurrency: Maximum number of requests in flight at once
+        return_exceptions: Return exceptions in place of results instead of raising
+        site: Telemetry call site for the requests (defaults to the caller)
+        chat_fn: Blocking chat function to run per request (defaults to `groq_chat`, e.g. `LLMRouter.chat`)
+
+    Returns:
+        Results in the same order as `chat_requests`
+    """
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency or 1)))
+    site = site or resolve_call_site()
+
+    async def _one(req: dict):
+        async with semaphore:
+            with call_site(site):
+                if chat_fn is not None:
+                    return await asyncio.to_thread(chat_fn, **req)
+                return await agroq_chat(**req)
+
+    return await asyncio.gather(*(_one(r) for r in chat_requests), return_exceptions=return_exceptions)
+
+
+def chat_parallel(chat_requests: list, max_concurrency: int = 4, return_exceptions: bool = True,
+                  chat_fn=None) -> list:
+    """Synchronous entry point for `gather_chat`, usable from Streamlit and FastAPI code."""
+    if not chat_requests:
+        return []
+    coro = gather_chat(chat_requests, max_concurrency=max_concurrency, return_exceptions=return_exceptions,
+                       site=resolve_call_site(), chat_fn=chat_fn)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Already inside an event loop (e.g. an async route): run on a helper thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+# Endpoints that rejected `n` > 1 (Groq currently allows only n=1)
+_N_UNSUPPORTED = set()
+
+
+def chat_variants(chat_fn, messages: list, n: int, endpoint: str | None = None, max_concurrency: int | None = None,
+                  **kwargs) -> list:
+    """`n` alternative completions of one prompt in a single round trip.
+
+    Args:
+        chat_fn: Chat callable accepting `messages`, `n` and `seed` (e.g. a bound `groq_chat` or `LLMRouter.chat`)
+        messages: Chat messages
+        n: Number of variants
+        endpoint: Base URL used to remember endpoints that reject `n`
+        max_concurrency: Parallel requests when `n` is not supported (defaults to `n`)
+        **kwargs: Passed to `chat_fn`
+
+    Returns:
+        Up to `n` texts; variants whose fallback request failed are left out
+    """
+    endpoint = groq_base_url(endpoint)
+    if n > 1 and endpoint not in _N_UNSUPPORTED:
+        try:
+            return chat_fn(messages=messages, n=n, **kwargs)
+        except requests.HTTPError as e:
+            resp = getattr(e, "response", None)
+            if resp is None or resp.status_code not in (400, 422):
+                raise
+            _N_UNSUPPORTED.add(endpoint)
+    if n <= 1:
+        return [chat_fn(messages=messages, **kwargs)]
+    # One completion per request, issued concurrently; distinct seeds keep cached variants apart
+    requests_ = [{"messages": messages, "seed": i, **kwargs} for i in range(n)]
+    results = chat_parallel(requests_, max_concurrency=max_concurrency or n, chat_fn=chat_fn)
+    texts = [r for r in results if not isinstance(r, Exception)]
+    if not texts:
+        raise results[0]
+    return texts
 
 
 # Ollama support removed per project configuration.
@@ -0,0 +1,273 @@
+"""Multi-key, multi-model router for Groq calls.
+
+A deployment serving many users from shared server keys hits per-key rate
+limits long before CPU limits. The router holds a pool of (API key, model)
+routes with weights, picks one per call weighted by the key's remaining
+rate-limit headroom (from `utils.rate_limiter`), and fails over to another
+key - or, when every key for the requested model is saturated or failing, to
+another model in the pool.
+
+Configuration from the environment:
+
+- GROQ_API_KEYS: comma-separated server keys, optionally weighted (`gsk_a:2,gsk_b`)
+- GROQ_MODEL_POOL: failover models, optionally weighted (`openai/gpt-oss-20b:3,llama-3.3-70b-versatile`)
+
+GROQ_API_KEY is always part of the key pool when set.
+"""
+
+import os
+import time
+import random
+import threading
+from dataclasses import dataclass
+
+import requests
+
+from .llm_providers import groq_chat, groq_chat_stream
+from .rate_limiter import get_rate_limiter, key_id
+from .retry_policy import GROQ_POLICY, CircuitOpenError, Deadline, RetryPolicy, DeadlineExceeded
+
+
+@dataclass
+class Route:
+    """One API key + model combination."""
+
+    api_key: str
+    model: str
+    weight: float = 1.0
+    calls: int = 0
+    failures: int = 0
+    cooldown_until: float = 0.0
+    last_error: str = ""
+
+    @property
+    def id(self) -> str:
+        return f"{key_id(self.api_key)}/{self.model}"
+
+
+def parse_weighted(value: str | None) -> dict:
+    """Parse 'a:2,b,c:0.5' into {'a': 2.0, 'b': 1.0, 'c': 0.5}."""
+    out = {}
+    for item in (value or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, weight = item, 1.0
+        head, sep, tail = item.rpartition(":")
+        if sep and head:
+            try:
+                name, weight = head, float(tail)
+            except ValueError:
+                pass
+        out[name] = weight
+    return out
+
+
+def _should_fail_over(err: Exception) -> bool:
+    """Errors that another key or model may not have (limits, outages, bad key, missing model)."""
+    if isinstance(err, DeadlineExceeded):
+        return False
+    if isinstance(err, (CircuitOpenError, requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(err, requests.HTTPError):
+        resp = getattr(err, "response", None)
+        if resp is None:
+            return True
+        return resp.status_code in (401, 403, 404, 429) or resp.status_code >= 500
+    return False
+
+
+def _cooldown_for(err: Exception) -> float:
+    resp = getattr(err, "response", None)
+    status = getattr(resp, "status_code", None)
+    if status in (401, 403):
+        return GROQ_POLICY.negative_ttl
+    if status == 404:
+        return 600.0
+    if status == 429:
+        hint = GROQ_POLICY.server_hint(resp)
+        return min(hint if hint is not None else 5.0, 60.0)
+    return 10.0
+
+
+class LLMRouter:
+    """Spread calls over weighted key/model routes and fail over on saturation or errors."""
+
+    def __init__(self, keys: dict, models: dict | None = None, base_url: str | None = None,
+                 failover_policy: RetryPolicy | None = None):
+        """
+        Args:
+            keys: Mapping of API key to weight
+            models: Mapping of model to weight; the first is the default model
+            base_url: Optional OpenAI-compatible endpoint for every route
+            failover_policy: Policy for attempts that still have another route to fall back to
+        """
+        if not keys:
+            raise ValueError("LLMRouter needs at least one API key")
+        self.keys = dict(keys)
+        self.models = dict(models or {})
+        self.base_url = base_url
+        # One quick attempt per route; the router itself is the retry. The last route gets the full policy.
+        # Breakers are shared with GROQ_POLICY so failures on any route count against that key everywhere.
+        self.failover_policy = failover_policy or RetryPolicy(max_attempts=1, read_timeout=GROQ_POLICY.read_timeout,
+                                                              _breakers=GROQ_POLICY._breakers, _lock=GROQ_POLICY._lock)
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def _route(self, api_key: str, model: str) -> Route:
+        with self._lock:
+            rid = f"{key_id(api_key)}/{model}"
+            route = self._routes.get(rid)
+            if route is None:
+                weight = self.keys.get(api_key, 1.0) * self.models.get(model, 1.0)
+                route = Route(api_key=api_key, model=model, weight=weight)
+                self._routes[rid] = route
+            return route
+
+    def candidates(self, model: str | None = None) -> list:
+        """Routes in failover tiers: the requested model on every key, then the other pool models."""
+        primary = model or next(iter(self.models), None)
+        if not primary:
+            raise ValueError("No model requested and no GROQ_MODEL_POOL configured")
+        tiers = [[self._route(k, primary) for k in self.keys]]
+        others = [m for m in self.models if m != primary]
+        if others:
+            tiers.append([self._route(k, m) for m in others for k in self.keys])
+        return tiers
+
+    def _score(self, route: Route, now: float) -> float:
+        if route.cooldown_until > now:
+            return 0.0
+        limiter = get_rate_limiter()
+        headroom = limiter.headroom(route.api_key) if limiter is not None else 1.0
+        breaker = GROQ_POLICY.breaker(f"groq:{key_id(route.api_key)}")
+        if breaker.state == "open":
+            return 0.0
+        return route.weight * max(headroom, 0.0)
+
+    def pick(self, tiers: list, tried: set) -> Route | None:
+        """Weighted-random route by headroom from the first tier that has a usable one."""
+        now = time.monotonic()
+        for tier in tiers:
+            pool = [r for r in tier if r.id not in tried]
+            scored = [(r, self._score(r, now)) for r in pool]
+            usable = [(r, s) for r, s in scored if s > 0]
+            if usable:
+                total = sum(s for _, s in usable)
+                point = random.uniform(0, total)
+                for route, score in usable:
+                    point -= score
+                    if point <= 0:
+                        return route
+                return usable[-1][0]
+        # Everything is saturated or cooling down: try whichever recovers first rather than failing untried
+        remaining = [r for tier in tiers for r in tier if r.id not in tried]
+        return min(remaining, key=lambda r: r.cooldown_until) if remaining else None
+
+    def _record(self, route: Route, err: Exception | None) -> None:
+        with self._lock:
+            route.calls += 1
+            if err is None:
+                route.cooldown_until = 0.0
+                return
+            route.failures += 1
+            route.last_error = f"{type(err).__name__}: {err}"[:200]
+            route.cooldown_until = time.monotonic() + _cooldown_for(err)
+
+    def _attempts(self, model: str | None):
+        """Yield (route, policy) pairs until the caller stops or routes run out."""
+        tiers = self.candidates(model)
+        total = sum(len(t) for t in tiers)
+        tried = set()
+        while len(tried) < total:
+            route = self.pick(tiers, tried)
+            if route is None:
+                return
+            tried.add(route.id)
+            yield route, (GROQ_POLICY if len(tried) == total else self.failover_policy)
+
+    def chat(self, messages: list, model: str | None = None, temperature: float = 0.2, max_tokens: int = 600,
+             **kwargs) -> str:
+        """`groq_chat` over the pool; extra keyword arguments are passed through."""
+        # Every route spends from the caller's one budget
+        kwargs["deadline"] = Deadline.coerce(kwargs.get("deadline"))
+        last_err = None
+        for route, policy in self._attempts(model):
+            try:
+                result = groq_chat(route.api_key, messages, route.model, temperature, max_tokens,
+                                   policy=policy, base_url=self.base_url, **kwargs)
+            except Exception as e:
+                if not _should_fail_over(e):
+                    raise
+                self._record(route, e)
+                last_err = e
+                continue
+            self._record(route, None)
+            return result
+        raise last_err or RuntimeError("No LLM route available")
+
+    def chat_stream(self, messages: list, model: str | None = None, temperature: float = 0.2, max_tokens: int = 600,
+                    **kwargs):
+        """Streaming `chat`; fails over only before the first token arrives."""
+        kwargs["deadline"] = Deadline.coerce(kwargs.get("deadline"))
+        last_err = None
+        for route, policy in self._attempts(model):
+            stream = groq_chat_stream(route.api_key, messages, route.model, temperature, max_tokens,
+                                      policy=policy, base_url=self.base_url, **kwargs)
+            try:
+                first = next(stream, None)
+            except Exception as e:
+                if not _should_fail_over(e):
+                    raise
+                self._record(route, e)
+                last_err = e
+                continue
+            self._record(route, None)
+            if first is not None:
+                yield first
+            yield from stream
+            return
+        raise last_err or RuntimeError("No LLM route available")
+
+    def stats(self) -> list:
+        """Per-route calls, failures, cooldown and current headroom."""
+        now = time.monotonic()
+        limiter = get_rate_limiter()
+        with self._lock:
+            routes = list(self._routes.values())
+        return [
+            {
+                "route": r.id,
+                "model": r.model,
+                "weight": r.weight,
+                "calls": r.calls,
+                "failures": r.failures,
+                "cooldown_s": round(max(0.0, r.cooldown_until - now), 1),
+                "headroom": round(limiter.headroom(r.api_key), 3) if limiter is not None else None,
+                "last_error": r.last_error,
+            }
+            for r in routes
+        ]
+
+
+_ROUTER = None
+_ROUTER_LOCK = threading.Lock()
+_ROUTER_BUILT = False
+
+
+def get_router() -> LLMRouter | None:
+    """Process-wide router from GROQ_API_KEYS / GROQ_MODEL_POOL, or None when there is nothing to route."""
+    global _ROUTER, _ROUTER_BUILT
+    if _ROUTER_BUILT:
+        return _ROUTER
+    with _ROUTER_LOCK:
+        if not _ROUTER_BUILT:
+            keys = parse_weighted(os.getenv("GROQ_API_KEYS"))
+            server_key = os.getenv("GROQ_API_KEY")
+            if server_key and server_key not in keys:
+                keys[server_key] = 1.0
+            models = parse_weighted(os.getenv("GROQ_MODEL_POOL"))
+            if keys and (len(keys) > 1 or len(models) > 1):
+                _ROUTER = LLMRouter(keys, models)
+            _ROUTER_BUILT = True
+    return _ROUTER
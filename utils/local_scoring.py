@@ -0,0 +1,148 @@
+"""Zero-LLM skill scoring from lexical and embedding evidence.
+
+Used by the analyzer's `intensity="local"` mode: instant first results, a
+fallback when no API key is usable or the upstream circuit is open, and a
+cheap pre-filter for bulk screening. Two kinds of evidence are combined:
+
+- lexical: mentions of the skill or any taxonomy alias, per resume section.
+  Spellings that are everyday words or very short ("Next", "Shell", "Torch",
+  "TS") only count when written with a capital, as in `CAPITALIZED_ONLY`. A mention under Experience/Projects (or in a resume without recognizable
+  headings) counts as applied use; one under Skills/Summary only as a listing.
+- semantic: the best cosine similarity between the skill's embedding and any
+  resume chunk, mapped linearly from [low, high] onto 0-10.
+
+Scores land on the same 0-10 scale as the LLM scorer: a listing alone scores
+6, applied use 7-9, both together one more; strong semantic similarity adds a
+point to a mentioned skill. Semantic evidence alone is capped at
+`SEMANTIC_ONLY_MAX`, the analyzer's missing-skill cutoff (scores of 5 and
+below), so a skill the resume never names is always reported as missing.
+
+Configuration from the environment:
+
+- LOCAL_SCORE_SIM_LOW / LOCAL_SCORE_SIM_HIGH: cosine similarities mapped to 0 and 10 (default 0.60 / 0.85)
+"""
+
+import os
+import re
+
+import numpy as np
+
+from .skill_matcher import CAPITALIZED_ONLY, SkillMatcher
+from .skill_taxonomy import get_taxonomy
+
+APPLIED_SECTIONS = frozenset({"experience", "projects", "other"})
+SEMANTIC_ONLY_MAX = 5
+
+# Skill spellings that are also everyday words; like CAPITALIZED_ONLY, only matched when capitalized.
+# Alphabetic spellings of three letters or fewer ("py", "ts", "ux") are treated the same way.
+COMMON_WORD_SPELLINGS = frozenset({
+    "next", "shell", "express", "node", "torch", "mongo", "spring", "rails", "swift", "rust", "ruby", "dart",
+    "lambda", "oracle", "apache", "slack", "jest", "mocha", "hive", "parcel", "vim", "eclipse", "pulsar",
+    "presto", "flutter", "ionic", "bootstrap", "insomnia", "jasmine", "cypress", "transformers", "unity",
+})
+
+_SECTION_WORDS = {
+    "skills": "skills", "technologies": "skills", "competencies": "skills", "expertise": "skills",
+    "experience": "experience", "employment": "experience", "history": "experience",
+    "projects": "projects", "project": "projects",
+    "education": "education",
+    "certifications": "certifications", "certification": "certifications", "certificates": "certifications",
+    "summary": "summary", "profile": "summary", "objective": "summary", "about": "summary",
+}
+_HEADING_RE = re.compile(r"^[#*\s]*([A-Za-z][A-Za-z &/-]{2,40}?)[\s:*#]*$")
+
+
+def split_sections(text: str) -> list:
+    """(section, text) segments split at heading lines ("Work Experience", "SKILLS:").
+
+    Text before the first heading is "summary"; a resume without any recognizable
+    heading is a single "other" segment.
+    """
+    segments, current, lines = [], None, []
+    for line in (text or "").splitlines():
+        m = _HEADING_RE.match(line)
+        section = None
+        if m and len(m.group(1).split()) <= 4:
+            words = re.findall(r"[a-z]+", m.group(1).lower())
+            section = next((_SECTION_WORDS[w] for w in reversed(words) if w in _SECTION_WORDS), None)
+        if section:
+            if lines:
+                segments.append((current or "summary", "\n".join(lines)))
+            current, lines = section, []
+        else:
+            lines.append(line)
+    if lines:
+        segments.append((current or "summary", "\n".join(lines)))
+    if current is None:
+        return [("other", text or "")]
+    return segments
+
+
+def lexical_evidence(text: str, skills: list) -> dict:
+    """Mentions of each skill (canonical name or any alias) per section: {skill: {section: count}}."""
+    taxonomy = get_taxonomy()
+    owner = {}
+    for skill in skills:
+        entry = taxonomy.lookup(skill)
+        spellings = (entry.name,) + entry.aliases if entry else (re.sub(r"\s*\(.*\)\s*$", "", skill),)
+        for spelling in spellings:
+            owner.setdefault(spelling.strip().lower(), skill)
+    protected = {t for t in owner if t in CAPITALIZED_ONLY or t in COMMON_WORD_SPELLINGS
+                 or (t.isalpha() and len(t) <= 3)}
+    matcher = SkillMatcher(owner, protected)
+    hits = {skill: {} for skill in skills}
+    for section, segment in split_sections(text):
+        for term, _, _ in matcher.finditer(segment):
+            counts = hits[owner[term]]
+            counts[section] = counts.get(section, 0) + 1
+    return hits
+
+
+def calibrate(similarity: float, low: float, high: float) -> float:
+    """Map a cosine similarity onto 0-10 (`low` and below -> 0, `high` and above -> 10)."""
+    return float(np.clip((similarity - low) / max(high - low, 1e-6), 0.0, 1.0) * 10)
+
+
+def _lexical_score(sections: dict) -> int:
+    applied = sum(n for s, n in sections.items() if s in APPLIED_SECTIONS)
+    listed = sum(sections.values()) - applied
+    if not applied:
+        return 6 if listed else 0
+    return min(9, 6 + applied) + (1 if listed else 0)
+
+
+def score_skills(resume_text: str, skills: list, best_similarity=None,
+                 low: float | None = None, high: float | None = None) -> list:
+    """Score each skill 0-10 without an LLM.
+
+    Args:
+        resume_text: Full resume text
+        skills: Skill names, in output order
+        best_similarity: Highest skill-to-resume-chunk cosine similarity per skill
+            (`EvidenceMatrix.best_similarity()`), or None for lexical evidence only
+        low: Similarity that maps to 0 (LOCAL_SCORE_SIM_LOW, default 0.60)
+        high: Similarity that maps to 10 (LOCAL_SCORE_SIM_HIGH, default 0.85)
+
+    Returns:
+        (skill, score, reasoning) tuples
+    """
+    low = low if low is not None else float(os.getenv("LOCAL_SCORE_SIM_LOW") or 0.60)
+    high = high if high is not None else float(os.getenv("LOCAL_SCORE_SIM_HIGH") or 0.85)
+    hits = lexical_evidence(resume_text, skills)
+    best = np.asarray(best_similarity, dtype=np.float32) if best_similarity is not None else None
+
+    out = []
+    for i, skill in enumerate(skills):
+        sections = hits[skill]
+        lexical = _lexical_score(sections)
+        semantic = calibrate(float(best[i]), low, high) if best is not None else 0.0
+        if lexical:
+            score = min(10, lexical + (1 if semantic >= 7 else 0))
+            where = ", ".join(f"{s} x{n}" for s, n in sorted(sections.items(), key=lambda kv: -kv[1]))
+            reasoning = f"Mentioned in resume ({where})."
+        else:
+            score = int(round(min(semantic, SEMANTIC_ONLY_MAX)))
+            reasoning = "Not mentioned by name"
+            reasoning += f"; closest resume passage similarity {float(best[i]):.2f}." if best is not None else "."
+        out.append((skill, score, reasoning))
+    return out
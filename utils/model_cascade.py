@@ -0,0 +1,245 @@
+"""Model cascade: run a task on a small, fast model and escalate only on bad output.
+
+`cascade_chat` tries the configured models in order (smallest first). Each
+reply is checked by a validator: a callable taking the text and returning None
+when it is acceptable, or a short reason when it is not. The next, larger
+model is tried only when validation fails or the call errors. The last tier is
+the model the user selected and its reply is returned as-is, so a cascade never
+does worse than calling that model directly.
+
+Validators for the common checks are built with `json_object`, `covers`,
+`min_length` and `all_of`. Escalation rates, reasons and estimated latency
+savings per call site are kept in `get_cascade_stats()`.
+
+Configuration: LLM_CASCADE_MODELS, a comma-separated list ordered small to large
+(e.g. `llama-3.1-8b-instant,openai/gpt-oss-20b,openai/gpt-oss-120b`); unset
+disables cascading.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+from collections import defaultdict, Counter
+
+from .retry_policy import DeadlineExceeded
+from .telemetry import call_site, resolve_call_site
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]+?)\s*```")
+
+
+def cascade_models_from_env() -> list:
+    """Models from LLM_CASCADE_MODELS, smallest first (empty when cascading is off)."""
+    return [m.strip() for m in (os.getenv("LLM_CASCADE_MODELS") or "").split(",") if m.strip()]
+
+
+def cascade_tiers(cascade: list, model: str | None) -> list:
+    """Cascade models up to the selected model, which is always the final tier.
+
+    The selected model is the quality ceiling: larger cascade models are not used,
+    and a model outside the cascade is appended after it.
+    """
+    tiers = list(dict.fromkeys(cascade))
+    if not model:
+        return tiers
+    if model in tiers:
+        return tiers[:tiers.index(model) + 1]
+    return tiers + [model]
+
+
+def load_json(text: str):
+    """Parse a JSON reply, tolerating code fences and surrounding prose; None if it is not JSON."""
+    if not text:
+        return None
+    candidates = [text.strip()]
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        candidates.insert(0, fenced.group(1))
+    for open_ch, close_ch in (("{", "}"), ("[", "]")):
+        start, end = text.find(open_ch), text.rfind(close_ch)
+        if 0 <= start < end:
+            candidates.append(text[start:end + 1])
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except (json.JSONDecodeError, ValueError):
+            continue
+    return None
+
+
+def json_object(required: tuple = (), min_items: dict | None = None):
+    """Validator: reply is a JSON object with the `required` keys.
+
+    `min_items` maps a key to the minimum length of its (list or dict) value.
+    """
+    def _validate(text: str):
+        data = load_json(text)
+        if not isinstance(data, dict):
+            return "not a JSON object"
+        missing = [k for k in required if k not in data]
+        if missing:
+            return f"missing keys: {', '.join(missing)}"
+        for key, count in (min_items or {}).items():
+            value = data.get(key)
+            if not isinstance(value, (list, dict)) or len(value) < count:
+                return f"{key}: fewer than {count} items"
+        return None
+    return _validate
+
+
+def covers(items: list, key: str | None = None, min_ratio: float = 1.0):
+    """Validator: the reply mentions at least `min_ratio` of `items`.
+
+    With `key`, the items are matched against the keys of that JSON object
+    (or of the top-level object when `key` is "") instead of the raw text.
+    """
+    wanted = [str(i).strip().lower() for i in items if str(i).strip()]
+
+    def _validate(text: str):
+        if not wanted:
+            return None
+        if key is None:
+            haystack = (text or "").lower()
+            found = [w for w in wanted if w in haystack]
+        else:
+            data = load_json(text)
+            if isinstance(data, dict) and key:
+                data = data.get(key)
+            keys = {str(k).strip().lower() for k in data} if isinstance(data, dict) else set()
+            found = [w for w in wanted if w in keys]
+        if len(found) < min_ratio * len(wanted):
+            return f"covers {len(found)}/{len(wanted)} items"
+        return None
+    return _validate
+
+
+def min_length(chars: int):
+    """Validator: the stripped reply has at least `chars` characters."""
+    def _validate(text: str):
+        n = len((text or "").strip())
+        return f"too short ({n} < {chars} chars)" if n < chars else None
+    return _validate
+
+
+def all_of(*validators):
+    """Validator: every validator passes; the first failure reason is returned."""
+    def _validate(text: str):
+        for validator in validators:
+            reason = validator(text)
+            if reason:
+                return reason
+        return None
+    return _validate
+
+
+class CascadeStats:
+    """Per call site escalation counts, reasons and latency."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sites = defaultdict(lambda: {
+            "calls": 0,
+            "escalated": 0,
+            "latency_s": 0.0,
+            "answered_by": Counter(),
+            "reasons": Counter(),
+        })
+        # (site, model) -> [attempts, total latency]
+        self._model_latency = defaultdict(lambda: [0, 0.0])
+
+    def record(self, site: str, attempts: list, top_model: str) -> None:
+        """Record one cascade run.
+
+        Args:
+            site: Call site
+            attempts: (model, latency_s, failure reason or None) per model tried
+            top_model: Largest model of the cascade, used to estimate latency savings
+        """
+        with self._lock:
+            stats = self._sites[site]
+            stats["calls"] += 1
+            stats["escalated"] += 1 if len(attempts) > 1 else 0
+            stats["latency_s"] += sum(latency for _, latency, _ in attempts)
+            stats["answered_by"][attempts[-1][0]] += 1
+            stats["top_model"] = top_model
+            for model, latency, reason in attempts:
+                entry = self._model_latency[(site, model)]
+                entry[0] += 1
+                entry[1] += latency
+                if reason:
+                    stats["reasons"][reason.split(":")[0].split("(")[0].strip()] += 1
+
+    def report(self) -> dict:
+        """Per call site: calls, escalation rate, answering models, failure reasons and latency.
+
+        `est_saved_s` is the latency of sending every call straight to the top model (at its
+        observed average) minus the actual cascade latency; None until the top model has run.
+        """
+        out = {}
+        with self._lock:
+            for site, stats in self._sites.items():
+                avg = {m: round(v[1] / v[0], 4) for (s, m), v in self._model_latency.items() if s == site and v[0]}
+                top = stats.get("top_model")
+                saved = round(stats["calls"] * avg[top] - stats["latency_s"], 3) if top in avg else None
+                out[site] = {
+                    "calls": stats["calls"],
+                    "escalation_rate": round(stats["escalated"] / stats["calls"], 3),
+                    "answered_by": dict(stats["answered_by"]),
+                    "reasons": dict(stats["reasons"]),
+                    "avg_latency_s": round(stats["latency_s"] / stats["calls"], 4),
+                    "avg_model_latency_s": avg,
+                    "est_saved_s": saved,
+                }
+        return out
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sites.clear()
+            self._model_latency.clear()
+
+
+_STATS = CascadeStats()
+
+
+def get_cascade_stats() -> CascadeStats:
+    """Process-wide cascade statistics."""
+    return _STATS
+
+
+def cascade_chat(chat, messages: list, models: list, validate, site: str | None = None, **kwargs) -> str:
+    """Run `chat` on each model in turn until a reply passes `validate`.
+
+    Args:
+        chat: Callable `(messages, model=..., **kwargs) -> str`, e.g. `LLMRouter.chat`
+        messages: Chat messages
+        models: Models ordered small to large
+        validate: Callable `(text) -> None | reason`
+        site: Call site for telemetry and cascade stats (defaults to the caller)
+        **kwargs: Passed to `chat` (temperature, max_tokens, response_format, ...)
+
+    Returns:
+        The first valid reply, or the last model's reply when none validates
+    """
+    if not models:
+        raise ValueError("cascade_chat needs at least one model")
+    site = site or resolve_call_site()
+    attempts = []
+    with call_site(site):
+        for i, model in enumerate(models):
+            last = i == len(models) - 1
+            start = time.perf_counter()
+            try:
+                text = chat(messages, model=model, **kwargs)
+            except Exception as e:
+                attempts.append((model, time.perf_counter() - start, f"error: {type(e).__name__}"))
+                # A spent deadline applies to every tier, so escalating cannot help
+                if last or isinstance(e, DeadlineExceeded):
+                    _STATS.record(site, attempts, models[-1])
+                    raise
+                continue
+            reason = None if last else validate(text)
+            attempts.append((model, time.perf_counter() - start, reason))
+            if reason is None:
+                _STATS.record(site, attempts, models[-1])
+                return text
@@ -0,0 +1,112 @@
+"""Adaptive max_tokens sizing learned from observed completion lengths.
+
+Fixed caps such as 4000 tokens for a resume rewrite are reserved in full
+against the per-key tokens-per-minute budget (see `utils.rate_limiter`) even
+though most replies are far shorter. The sizer records the completion length
+of every generated reply per call site and input-size bucket, and once a
+bucket has enough samples suggests its p99 plus a margin, rounded up to a
+fixed step so cache and rate-limit behaviour stays stable.
+
+The caller's `max_tokens` remains the ceiling: `groq_chat` sends the smaller
+suggested cap and, if the reply is cut off (`finish_reason == "length"`),
+continues the generation until it finishes or reaches that ceiling.
+
+Set LLM_ADAPTIVE_MAX_TOKENS=0 to always send the caller's cap.
+"""
+
+import os
+import threading
+from collections import defaultdict, deque
+
+# Suggested caps are rounded up to one of these
+SIZE_STEPS = (64, 128, 192, 256, 384, 512, 768, 1024, 1536, 2048, 3072, 4096, 6144, 8192, 12288, 16384)
+
+# Follow-up calls allowed for a reply cut off at the suggested cap
+MAX_CONTINUATIONS = 2
+
+CONTINUE_PROMPT = "Continue exactly where you stopped. Do not repeat anything already written."
+
+
+def input_bucket(prompt_tokens: int) -> int:
+    """Upper bound of the power-of-two prompt size bucket (256, 512, 1024, ...)."""
+    bound = 256
+    while bound < prompt_tokens:
+        bound *= 2
+    return bound
+
+
+def _quantile(sorted_values: list, q: float) -> float:
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class OutputSizer:
+    """Completion-length samples per (call site, input bucket) and the caps derived from them."""
+
+    def __init__(self, quantile: float = 0.99, margin: float = 1.15, min_samples: int = 20, window: int = 200):
+        """
+        Args:
+            quantile: Completion length quantile to cover
+            margin: Multiplier applied on top of the quantile
+            min_samples: Samples needed in a bucket before the caller's cap is lowered
+            window: Most recent samples kept per bucket
+        """
+        self.quantile = quantile
+        self.margin = margin
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=window))
+
+    def record(self, site: str, prompt_tokens: int, completion_tokens: int) -> None:
+        """Add one finished reply's length (including any continuations)."""
+        if completion_tokens <= 0:
+            return
+        with self._lock:
+            self._samples[(site, input_bucket(prompt_tokens))].append(int(completion_tokens))
+
+    def _target(self, samples: list) -> int:
+        needed = _quantile(sorted(samples), self.quantile) * self.margin + 16
+        return next((step for step in SIZE_STEPS if step >= needed), SIZE_STEPS[-1])
+
+    def suggest(self, site: str, prompt_tokens: int, ceiling: int) -> int:
+        """max_tokens to send for a call whose caller allows up to `ceiling`."""
+        with self._lock:
+            samples = list(self._samples.get((site, input_bucket(prompt_tokens))) or ())
+        if len(samples) < self.min_samples:
+            return ceiling
+        return min(ceiling, self._target(samples))
+
+    def report(self) -> dict:
+        """Per "site/bucket": sample count, p50/p99 completion tokens and the suggested cap."""
+        with self._lock:
+            items = {key: sorted(values) for key, values in self._samples.items()}
+        return {
+            f"{site}/{bucket}": {
+                "samples": len(values),
+                "p50_tokens": _quantile(values, 0.5),
+                "p99_tokens": _quantile(values, 0.99),
+                "suggested_max_tokens": self._target(values) if len(values) >= self.min_samples else None,
+            }
+            for (site, bucket), values in sorted(items.items())
+            if values
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+_SIZER = None
+_SIZER_LOCK = threading.Lock()
+
+
+def get_output_sizer() -> OutputSizer | None:
+    """Process-wide sizer, or None when LLM_ADAPTIVE_MAX_TOKENS is off."""
+    global _SIZER
+    if (os.getenv("LLM_ADAPTIVE_MAX_TOKENS") or "1").strip().lower() in ("0", "false", "no"):
+        return None
+    if _SIZER is None:
+        with _SIZER_LOCK:
+            if _SIZER is None:
+                _SIZER = OutputSizer()
+    return _SIZER
@@ -0,0 +1,159 @@
+"""Token-accurate prompt budgeting.
+
+Replaces character clamping with tiktoken-based counting: given a model's
+context window and the output size to reserve, the budget is split across the
+named parts of a prompt (resume, JD, history, weaknesses...) and each part is
+trimmed on token boundaries. Groq models are not in tiktoken's registry, so the
+closest OpenAI encoding is used; if no encoding can be loaded (e.g. offline
+without cached BPE files) counts fall back to ~4 characters per token.
+"""
+
+import os
+import math
+from functools import lru_cache
+
+try:
+    import tiktoken
+except Exception:
+    tiktoken = None
+
+# Context windows (tokens) for the models we expose
+MODEL_CONTEXT_WINDOWS = {
+    "openai/gpt-oss-20b": 131072,
+    "openai/gpt-oss-120b": 131072,
+    "llama-3.3-70b-versatile": 131072,
+    "llama-3.1-8b-instant": 131072,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Upper bound on prompt tokens per call; keeps single calls well inside per-key TPM budgets
+MAX_PROMPT_TOKENS = int(os.getenv("LLM_MAX_PROMPT_TOKENS") or 3000)
+
+# Allowance for chat-format framing and tokenizer drift between providers
+SAFETY_TOKENS = 64
+
+CHARS_PER_TOKEN = 4
+
+
+def _encoding_name(model: str | None) -> str:
+    name = (model or "").lower()
+    if "gpt-oss" in name or "gpt-4o" in name or name.startswith("o1") or name.startswith("o3"):
+        return "o200k_base"
+    return "cl100k_base"
+
+
+@lru_cache(maxsize=8)
+def _load_encoding(name: str):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        print(f"tiktoken encoding '{name}' unavailable, using character estimate: {e}")
+        return None
+
+
+def get_encoder(model: str | None = None):
+    """Cached tiktoken encoder for `model`, or None when unavailable."""
+    return _load_encoding(_encoding_name(model))
+
+
+def context_window(model: str | None) -> int:
+    """Context window size in tokens for `model`."""
+    return MODEL_CONTEXT_WINDOWS.get(model or "", DEFAULT_CONTEXT_WINDOW)
+
+
+def count_tokens(text: str | None, model: str | None = None) -> int:
+    """Number of tokens in `text` for `model`."""
+    if not text:
+        return 0
+    enc = get_encoder(model)
+    if enc is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(enc.encode(text, disallowed_special=()))
+
+
+def count_message_tokens(messages: list, model: str | None = None) -> int:
+    """Tokens for a chat message list, including per-message framing."""
+    total = 3
+    for m in messages or []:
+        total += 4 + count_tokens(str(m.get("content") or ""), model)
+    return total
+
+
+def trim_to_tokens(text: str | None, max_tokens: int, model: str | None = None) -> str:
+    """Trim `text` to at most `max_tokens` tokens, cutting on a token boundary."""
+    if not text or max_tokens <= 0:
+        return ""
+    enc = get_encoder(model)
+    if enc is None:
+        limit = max_tokens * CHARS_PER_TOKEN
+        return text if len(text) <= limit else text[:limit]
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return enc.decode(tokens[:max_tokens])
+
+
+def prompt_budget(model: str | None, reserve_output: int, fixed_tokens: int = 0, limit: int | None = None) -> int:
+    """Tokens available for variable prompt parts.
+
+    Args:
+        model: Model name used to look up the context window
+        reserve_output: Tokens reserved for the completion (the call's max_tokens)
+        fixed_tokens: Tokens already used by the fixed instruction text
+        limit: Optional cap on total prompt tokens (defaults to MAX_PROMPT_TOKENS)
+    """
+    by_window = context_window(model) - int(reserve_output or 0) - fixed_tokens - SAFETY_TOKENS
+    by_limit = int(limit or MAX_PROMPT_TOKENS) - fixed_tokens
+    return max(0, min(by_window, by_limit))
+
+
+def allocate(sizes: dict, budget: int, weights: dict | None = None) -> dict:
+    """Split `budget` across parts by weight, giving unused share from short parts to longer ones."""
+    weights = weights or {}
+
+    def _w(name):
+        return max(float(weights.get(name, 1.0)), 0.0) or 1.0
+
+    alloc = {name: 0 for name in sizes}
+    pending = {name: size for name, size in sizes.items() if size > 0}
+    remaining = budget
+    while pending and remaining > 0:
+        total_w = sum(_w(n) for n in pending)
+        satisfied = {n: size for n, size in pending.items() if size <= remaining * _w(n) / total_w}
+        if not satisfied:
+            # Every part needs more than its share: hand out the shares and stop
+            for name in pending:
+                alloc[name] = int(remaining * _w(name) / total_w)
+            break
+        for name, size in satisfied.items():
+            alloc[name] = size
+            remaining -= size
+            del pending[name]
+    return alloc
+
+
+def fit_prompt_parts(parts: dict, model: str | None = None, reserve_output: int = 600, fixed_text: str = "",
+                     weights: dict | None = None, limit: int | None = None) -> dict:
+    """Trim named prompt parts so the whole prompt fits the model budget.
+
+    Args:
+        parts: Mapping of part name to text (None is treated as empty)
+        model: Model the prompt is for
+        reserve_output: Tokens reserved for the completion
+        fixed_text: Instruction text sent alongside the parts (counted, never trimmed)
+        weights: Relative share per part when the budget is tight (default 1.0 each)
+        limit: Optional cap on total prompt tokens for this call site
+
+    Returns:
+        Mapping of part name to (possibly trimmed) text
+    """
+    texts = {name: (text or "") for name, text in parts.items()}
+    sizes = {name: count_tokens(text, model) for name, text in texts.items()}
+    budget = prompt_budget(model, reserve_output, count_tokens(fixed_text, model), limit)
+    if sum(sizes.values()) <= budget:
+        return texts
+    alloc = allocate(sizes, budget, weights)
+    return {name: trim_to_tokens(text, alloc[name], model) if sizes[name] > alloc[name] else text
+            for name, text in texts.items()}
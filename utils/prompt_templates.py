@@ -0,0 +1,99 @@
+"""Prompt templates: minified once at import, rendered with a stable shared prefix.
+
+Inline f-string prompts carry their source indentation and blank lines into
+every request, and interleave fixed instructions with per-call data so no two
+requests share a prefix. A `PromptTemplate` instead:
+
+- is compiled once when defined (`string.Template`, so JSON examples need no
+  brace escaping) with indentation and redundant whitespace stripped
+- renders to a system message holding only the fixed instructions, followed by
+  a user message that starts with the shared context (resume, skills) and ends
+  with the per-call task, so repeated calls share the longest possible prefix
+  for provider-side prompt caching
+- records the token count of every rendered prompt
+
+`template_report()` lists each template's version, static size before and
+after minification and rendered token counts.
+"""
+
+import re
+import textwrap
+import threading
+from string import Template
+
+from .prompt_budget import count_message_tokens, count_tokens
+
+_SPACES_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+def minify(text: str) -> str:
+    """Drop indentation, trailing spaces and repeated blank lines from static prompt text."""
+    lines = [line.strip() for line in textwrap.dedent(text or "").splitlines()]
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+def squeeze(text) -> str:
+    """Collapse runs of spaces/tabs and blank lines in inserted values, keeping line structure."""
+    lines = [_SPACES_RE.sub(" ", line).rstrip() for line in str(text if text is not None else "").splitlines()]
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+class PromptTemplate:
+    """A versioned prompt: fixed system instructions plus a `$placeholder` user template."""
+
+    def __init__(self, name: str, version: str, system: str, user: str):
+        self.name = name
+        self.version = version
+        self.raw_static = (system or "") + (user or "")
+        self.system = minify(system)
+        self.user = Template(minify(user))
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.total_tokens = 0
+        self.last_tokens = 0
+
+    def render(self, **values) -> list:
+        """Chat messages for `values`; every placeholder must be supplied."""
+        content = self.user.substitute({k: squeeze(v) for k, v in values.items()})
+        messages = [{"role": "user", "content": _BLANK_LINES_RE.sub("\n\n", content).strip()}]
+        if self.system:
+            messages.insert(0, {"role": "system", "content": self.system})
+        tokens = count_message_tokens(messages)
+        with self._lock:
+            self.renders += 1
+            self.total_tokens += tokens
+            self.last_tokens = tokens
+        return messages
+
+    def report(self) -> dict:
+        with self._lock:
+            renders, total, last = self.renders, self.total_tokens, self.last_tokens
+        return {
+            "version": self.version,
+            "static_tokens_raw": count_tokens(self.raw_static),
+            "static_tokens": count_tokens(self.system + self.user.template),
+            "prefix_tokens": count_tokens(self.system),
+            "renders": renders,
+            "avg_tokens": round(total / renders, 1) if renders else 0.0,
+            "last_tokens": last,
+        }
+
+
+TEMPLATES = {}
+
+
+def register_template(name: str, version: str, system: str, user: str) -> PromptTemplate:
+    """Compile and register a template (replacing any earlier one with the same name)."""
+    template = PromptTemplate(name, version, system, user)
+    TEMPLATES[name] = template
+    return template
+
+
+def get_template(name: str) -> PromptTemplate:
+    return TEMPLATES[name]
+
+
+def template_report() -> dict:
+    """Per template: version, static tokens before/after minification, prefix size and rendered sizes."""
+    return {name: template.report() for name, template in TEMPLATES.items()}
@@ -0,0 +1,275 @@
+"""Client-side rate limiting for Groq calls.
+
+Keeps a requests-per-minute and tokens-per-minute token bucket per API key and
+paces calls before they are sent instead of reacting to 429s. Budgets start
+from GROQ_RPM / GROQ_TPM and are corrected from the `x-ratelimit-*` response
+headers Groq returns on every call:
+
+- x-ratelimit-limit-tokens / x-ratelimit-remaining-tokens: tokens per minute
+- x-ratelimit-remaining-requests / x-ratelimit-reset-requests: daily request budget
+
+The defaults, 30 RPM and 6000 TPM, are Groq's free-tier limits for the default
+model (llama-3.1-8b-instant): the tightest budget a key is likely to have, so
+an unconfigured deployment paces conservatively rather than into 429s. Paid
+tiers and larger models should set GROQ_RPM / GROQ_TPM; the TPM is replaced by
+x-ratelimit-limit-tokens after the first response in any case.
+
+Each call reserves its prompt plus its `max_tokens` (already lowered to the
+learned cap by `utils.output_sizing` when one exists). Once the reply's usage is
+known, `refund()` returns the unused part of the completion reservation, so a
+4096-token cap does not hold 4096 tokens of a 6000-token minute for a
+300-token answer. A failed request refunds its whole completion reservation.
+
+All state is guarded by one condition variable, so the limiter is safe to share
+across Streamlit session threads.
+"""
+
+import os
+import re
+import time
+import hashlib
+import threading
+
+from .prompt_budget import count_message_tokens
+
+_DURATION_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_duration(value) -> float | None:
+    """Parse Groq reset durations such as '2m59.56s', '7.66s' or '250ms' into seconds."""
+    if value is None:
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    total = 0.0
+    matched = False
+    for amount, unit in _DURATION_RE.findall(text):
+        matched = True
+        amount = float(amount)
+        if unit == "h":
+            total += amount * 3600
+        elif unit == "m":
+            total += amount * 60
+        elif unit == "ms":
+            total += amount / 1000
+        else:
+            total += amount
+    return total if matched else None
+
+
+def estimate_tokens(messages: list, max_tokens: int = 0, model: str | None = None) -> int:
+    """Token estimate for the prompt plus the requested completion."""
+    return count_message_tokens(messages, model) + int(max_tokens or 0)
+
+
+def key_id(api_key: str | None) -> str:
+    """Short, non-reversible identifier for an API key (safe to log/expose)."""
+    return hashlib.sha256((api_key or "").encode("utf-8")).hexdigest()[:12]
+
+
+class _Bucket:
+    """Continuous-refill token bucket."""
+
+    def __init__(self, capacity: float, period_s: float = 60.0):
+        self.capacity = float(capacity)
+        self.period_s = period_s
+        self.level = float(capacity)
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        rate = self.capacity / self.period_s
+        self.level = min(self.capacity, self.level + (now - self.updated) * rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if available now)."""
+        if self.level >= amount:
+            return 0.0
+        rate = self.capacity / self.period_s
+        return (amount - self.level) / rate if rate > 0 else 60.0
+
+
+class _KeyState:
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = _Bucket(rpm)
+        self.tokens = _Bucket(tpm)
+        self.blocked_until = 0.0
+        self.daily_remaining = None
+        self.daily_reset_at = 0.0
+        self.waiting = 0
+
+
+class RateLimiter:
+    """Per-key RPM/TPM pacing with header-driven corrections."""
+
+    def __init__(self, rpm: int | None = None, tpm: int | None = None, max_wait_s: float | None = None):
+        self.default_rpm = int(rpm or os.getenv("GROQ_RPM") or 30)
+        self.default_tpm = int(tpm or os.getenv("GROQ_TPM") or 6000)
+        self.max_wait_s = float(max_wait_s if max_wait_s is not None else os.getenv("GROQ_RATE_MAX_WAIT") or 60)
+        self._cond = threading.Condition()
+        self._keys = {}
+        self._queue_depth = 0
+        self._acquired = 0
+        self._waits = 0
+        self._total_wait_s = 0.0
+        self._max_wait_seen_s = 0.0
+        self._refunded = 0
+
+    def _state(self, api_key: str | None) -> _KeyState:
+        kid = key_id(api_key)
+        state = self._keys.get(kid)
+        if state is None:
+            state = _KeyState(self.default_rpm, self.default_tpm)
+            self._keys[kid] = state
+        return state
+
+    def acquire(self, api_key: str | None, tokens: int = 0, max_wait_s: float | None = None) -> float:
+        """Block until the key has budget for one request of `tokens`; returns seconds waited.
+
+        Waiting is capped at `max_wait_s` (default: the limiter's own cap, e.g. lowered
+        to a caller's remaining deadline); after that the call is let through and
+        the server-side limit (and retry policy) takes over.
+        """
+        start = time.monotonic()
+        cap = self.max_wait_s if max_wait_s is None else max(0.0, min(self.max_wait_s, max_wait_s))
+        with self._cond:
+            state = self._state(api_key)
+            self._queue_depth += 1
+            state.waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    state.requests.refill(now)
+                    state.tokens.refill(now)
+                    need_tokens = min(float(tokens or 0), state.tokens.capacity)
+                    delay = max(
+                        state.blocked_until - now,
+                        state.requests.wait_for(1),
+                        state.tokens.wait_for(need_tokens),
+                    )
+                    if state.daily_remaining is not None and state.daily_remaining <= 0:
+                        delay = max(delay, state.daily_reset_at - now)
+                    if delay <= 0 or now - start >= cap:
+                        state.requests.level = max(0.0, state.requests.level - 1)
+                        state.tokens.level = max(0.0, state.tokens.level - need_tokens)
+                        if state.daily_remaining is not None:
+                            state.daily_remaining -= 1
+                        break
+                    self._cond.wait(timeout=min(delay, cap - (now - start)))
+            finally:
+                self._queue_depth -= 1
+                state.waiting -= 1
+                waited = time.monotonic() - start
+                self._acquired += 1
+                if waited > 0.001:
+                    self._waits += 1
+                    self._total_wait_s += waited
+                    self._max_wait_seen_s = max(self._max_wait_seen_s, waited)
+        return waited
+
+    def update_from_headers(self, api_key: str | None, headers) -> None:
+        """Reconcile the key's budgets with Groq's `x-ratelimit-*` response headers."""
+        if not headers:
+            return
+        get = headers.get
+        with self._cond:
+            state = self._state(api_key)
+            now = time.monotonic()
+            try:
+                limit_tokens = get("x-ratelimit-limit-tokens")
+                if limit_tokens:
+                    state.tokens.refill(now)
+                    state.tokens.capacity = float(limit_tokens)
+                remaining_tokens = get("x-ratelimit-remaining-tokens")
+                if remaining_tokens is not None:
+                    state.tokens.level = min(state.tokens.capacity, float(remaining_tokens))
+                    state.tokens.updated = now
+                remaining_requests = get("x-ratelimit-remaining-requests")
+                if remaining_requests is not None:
+                    state.daily_remaining = int(float(remaining_requests))
+                    reset = parse_duration(get("x-ratelimit-reset-requests"))
+                    state.daily_reset_at = now + (reset or 0.0)
+            except (TypeError, ValueError):
+                pass
+            self._cond.notify_all()
+
+    def refund(self, api_key: str | None, tokens: int) -> None:
+        """Return `tokens` reserved by `acquire` but not used (e.g. max_tokens minus actual completion tokens)."""
+        if not tokens or tokens <= 0:
+            return
+        with self._cond:
+            state = self._state(api_key)
+            state.tokens.refill(time.monotonic())
+            state.tokens.level = min(state.tokens.capacity, state.tokens.level + float(tokens))
+            self._refunded += int(tokens)
+            self._cond.notify_all()
+
+    def penalize(self, api_key: str | None, seconds: float) -> None:
+        """Hold back all calls on a key for `seconds` (e.g. after a 429 with Retry-After)."""
+        with self._cond:
+            state = self._state(api_key)
+            state.blocked_until = max(state.blocked_until, time.monotonic() + max(0.0, float(seconds)))
+            self._cond.notify_all()
+
+    def headroom(self, api_key: str | None) -> float:
+        """Fraction (0-1) of the key's per-minute budget currently available."""
+        with self._cond:
+            state = self._state(api_key)
+            now = time.monotonic()
+            if state.blocked_until > now:
+                return 0.0
+            if state.daily_remaining is not None and state.daily_remaining <= 0 and state.daily_reset_at > now:
+                return 0.0
+            state.requests.refill(now)
+            state.tokens.refill(now)
+            req = state.requests.level / state.requests.capacity if state.requests.capacity else 0.0
+            tok = state.tokens.level / state.tokens.capacity if state.tokens.capacity else 0.0
+            return max(0.0, min(req, tok))
+
+    def stats(self) -> dict:
+        """Saturation metrics: queue depth and time spent waiting for budget."""
+        with self._cond:
+            now = time.monotonic()
+            keys = {}
+            for kid, state in self._keys.items():
+                state.requests.refill(now)
+                state.tokens.refill(now)
+                keys[kid] = {
+                    "waiting": state.waiting,
+                    "requests_available": round(state.requests.level, 2),
+                    "tokens_available": round(state.tokens.level, 1),
+                    "tokens_per_minute": state.tokens.capacity,
+                    "daily_requests_remaining": state.daily_remaining,
+                    "blocked_for_s": round(max(0.0, state.blocked_until - now), 2),
+                }
+            return {
+                "queue_depth": self._queue_depth,
+                "acquired": self._acquired,
+                "waits": self._waits,
+                "total_wait_s": round(self._total_wait_s, 3),
+                "avg_wait_s": round(self._total_wait_s / self._waits, 3) if self._waits else 0.0,
+                "max_wait_s": round(self._max_wait_seen_s, 3),
+                "tokens_refunded": self._refunded,
+                "keys": keys,
+            }
+
+
+_LIMITER = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter | None:
+    """Process-wide limiter, or None when GROQ_RATE_LIMIT_DISABLED is set."""
+    global _LIMITER
+    if (os.getenv("GROQ_RATE_LIMIT_DISABLED") or "").strip().lower() in ("1", "true", "yes"):
+        return None
+    if _LIMITER is None:
+        with _LIMITER_LOCK:
+            if _LIMITER is None:
+                _LIMITER = RateLimiter()
+    return _LIMITER
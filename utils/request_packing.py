@@ -0,0 +1,127 @@
+"""Request packing: answer many small prompts that share context in one LLM call.
+
+Per-item loops (model answers per interview question, per-skill scoring) send
+the same resume excerpt once per item. `run_packed` sends the shared context
+once with a numbered list of items, asks for a JSON object keyed by item
+number, splits the reply back per item and falls back to individual calls only
+for items that are missing or fail to parse.
+"""
+
+import re
+import json
+
+_FENCE_RE = re.compile(r"```(?:json)?\s*([\s\S]+?)\s*```")
+
+
+def build_packed_prompt(items: list, context: str, task: str, item_label: str = "Item",
+                        answer_format: str = '"<answer>"') -> str:
+    """Prompt asking for one answer per numbered item, returned as a JSON object."""
+    numbered = "\n".join(f"{i}. {item}" for i, item in enumerate(items, 1))
+    example = ", ".join(f'"{i}": {answer_format}' for i in range(1, min(len(items), 2) + 1))
+    return (
+        f"{task}\n\n"
+        + (f"{context}\n\n" if context else "")
+        + f"{item_label}s:\n{numbered}\n\n"
+        f"Answer every {item_label.lower()} independently. Return ONLY a JSON object keyed by the "
+        f"{item_label.lower()} number, e.g. {{{example}}}, with exactly {len(items)} keys and no other text."
+    )
+
+
+def parse_packed_response(text: str, count: int) -> dict:
+    """Map 0-based item index to its raw JSON value; missing items are simply absent."""
+    if not text:
+        return {}
+    candidates = [text.strip()]
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        candidates.insert(0, fenced.group(1))
+    start, end = text.find("{"), text.rfind("}")
+    if 0 <= start < end:
+        candidates.append(text[start:end + 1])
+
+    data = None
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+            break
+        except (json.JSONDecodeError, ValueError):
+            continue
+    if isinstance(data, dict) and isinstance(data.get("answers"), (list, dict)):
+        data = data["answers"]
+
+    out = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            m = re.search(r"\d+", str(key))
+            if m and 1 <= int(m.group(0)) <= count:
+                out[int(m.group(0)) - 1] = value
+    elif isinstance(data, list):
+        for i, value in enumerate(data[:count]):
+            if isinstance(value, dict) and "id" in value:
+                try:
+                    idx = int(value["id"]) - 1
+                except (TypeError, ValueError):
+                    idx = i
+                if 0 <= idx < count:
+                    out[idx] = value.get("answer", value)
+            else:
+                out[i] = value
+    return out
+
+
+def run_packed(chat_many, items: list, context: str, task: str, parse_item=None, fallback=None,
+               item_label: str = "Item", answer_format: str = '"<answer>"', max_items: int = 8,
+               tokens_per_item: int = 250) -> list:
+    """Answer `items` in packed calls of up to `max_items`, falling back per item on parse failures.
+
+    Args:
+        chat_many: Callable taking a list of `{"messages", "max_tokens", "profile"}` dicts and returning
+            responses (or exceptions) in order, e.g. `ResumeAnalyzer.llm_chat_many`
+        items: Item texts (questions, skill names...)
+        context: Shared context sent once per pack
+        task: Instruction for the whole pack
+        parse_item: Callable `(index, raw_value) -> result`; raise or return None to reject
+        fallback: Callable taking the list of failed indices and returning results for them
+        item_label: Noun used for items in the prompt
+        answer_format: JSON shape of one answer shown to the model
+        max_items: Maximum items per packed call
+        tokens_per_item: Completion tokens reserved per item
+
+    Returns:
+        One result per item (None for items that neither the pack nor the fallback produced)
+    """
+    if not items:
+        return []
+    parse_item = parse_item or (lambda _i, value: (str(value).strip() or None) if value is not None else None)
+    max_items = max(1, int(max_items))
+    chunks = [list(range(i, min(i + max_items, len(items)))) for i in range(0, len(items), max_items)]
+
+    requests = []
+    for chunk in chunks:
+        prompt = build_packed_prompt([items[i] for i in chunk], context, task, item_label, answer_format)
+        requests.append({
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": tokens_per_item * len(chunk) + 32,
+            "profile": "packed_json",
+        })
+    responses = chat_many(requests)
+
+    results = [None] * len(items)
+    for chunk, response in zip(chunks, responses):
+        if isinstance(response, Exception):
+            continue
+        values = parse_packed_response(response, len(chunk))
+        for local, idx in enumerate(chunk):
+            if local not in values:
+                continue
+            try:
+                results[idx] = parse_item(idx, values[local])
+            except Exception:
+                results[idx] = None
+
+    failed = [i for i, r in enumerate(results) if r is None]
+    if failed and fallback is not None:
+        for idx, result in zip(failed, fallback(failed)):
+            results[idx] = result
+    return results
+
@@ -0,0 +1,281 @@
+"""Retry policy, deadlines and circuit breakers for outbound HTTP calls.
+
+`RetryPolicy.execute` wraps a `send(timeout)` callable and handles:
+
+- exponential backoff with jitter, honouring `Retry-After`, Groq's
+  `x-ratelimit-reset-*` headers and "try again in Xs" messages up to
+  `max_delay`; a server asking for a longer wait (an exhausted daily budget,
+  say) fails the call at once instead of parking the thread
+- an overall per-call deadline passed down from the caller
+- a per-key circuit breaker that fails fast after repeated server errors and
+  caches negative results such as a rejected API key
+
+The same policy objects are shared by the Groq transport and `JobAgent`.
+"""
+
+import os
+import re
+import time
+import random
+import threading
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from .rate_limiter import parse_duration
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling upstream while a key's circuit breaker is open."""
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a call cannot complete (or retry) within its deadline."""
+
+
+class Deadline:
+    """Absolute deadline on the monotonic clock."""
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + float(seconds)
+
+    @staticmethod
+    def coerce(value) -> "Deadline | None":
+        """Accept a Deadline, a number of seconds from now, or None."""
+        if value is None or isinstance(value, Deadline):
+            return value
+        return Deadline(float(value))
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures; half-open after `reset_timeout`."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.open_until = 0.0
+        self.reason = ""
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.open_until and time.monotonic() < self.open_until:
+            return "open"
+        if self.open_until:
+            return "half_open"
+        return "closed"
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError if calls should not go upstream right now."""
+        with self._lock:
+            now = time.monotonic()
+            if self.open_until and now < self.open_until:
+                raise CircuitOpenError(f"Circuit open for {self.open_until - now:.0f}s: {self.reason}")
+            if self.open_until:
+                # Half-open: let exactly one probe through
+                if self.probing:
+                    raise CircuitOpenError(f"Circuit half-open, probe in flight: {self.reason}")
+                self.probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.open_until = 0.0
+            self.reason = ""
+            self.probing = False
+
+    def record_failure(self, reason: str) -> None:
+        with self._lock:
+            self.failures += 1
+            self.reason = reason
+            if self.probing or self.failures >= self.failure_threshold:
+                self.open_until = time.monotonic() + self.reset_timeout
+            self.probing = False
+
+    def trip(self, reason: str, ttl: float) -> None:
+        """Open immediately for `ttl` seconds (negative caching of a permanent failure)."""
+        with self._lock:
+            self.reason = reason
+            self.open_until = time.monotonic() + ttl
+            self.probing = False
+
+    def release_probe(self) -> None:
+        """End a half-open probe that finished without a success/failure verdict."""
+        with self._lock:
+            self.probing = False
+
+
+def _http_error(resp, note: str = "") -> requests.HTTPError:
+    return requests.HTTPError(f"{resp.status_code} {resp.reason}: {resp.text}{note}", response=resp)
+
+
+@dataclass
+class RetryPolicy:
+    """Backoff, timeout and circuit-breaker settings for one upstream."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    jitter: float = 0.5
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    retry_statuses: tuple = (429, 500, 502, 503, 504)
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    negative_ttl: float = 300.0
+    _breakers: dict = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @staticmethod
+    def from_env(prefix: str, **defaults) -> "RetryPolicy":
+        """Build a policy from `<PREFIX>_MAX_ATTEMPTS`, `<PREFIX>_TIMEOUT` and `<PREFIX>_MAX_BACKOFF`."""
+        policy = RetryPolicy(**defaults)
+        policy.max_attempts = int(os.getenv(f"{prefix}_MAX_ATTEMPTS") or policy.max_attempts)
+        policy.read_timeout = float(os.getenv(f"{prefix}_TIMEOUT") or policy.read_timeout)
+        policy.max_delay = float(os.getenv(f"{prefix}_MAX_BACKOFF") or policy.max_delay)
+        return policy
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        with self._lock:
+            br = self._breakers.get(key)
+            if br is None:
+                br = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._breakers[key] = br
+            return br
+
+    def breaker_states(self) -> dict:
+        """Current state per breaker key."""
+        with self._lock:
+            return {k: {"state": b.state, "failures": b.failures, "reason": b.reason} for k, b in self._breakers.items()}
+
+    def server_hint(self, resp) -> float | None:
+        """Wait suggested by the server via headers or error text, in seconds."""
+        if resp is None:
+            return None
+        headers = resp.headers or {}
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                try:
+                    return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                except Exception:
+                    pass
+        hints = []
+        if str(headers.get("x-ratelimit-remaining-tokens", "")).strip() in ("0", "0.0"):
+            hints.append(parse_duration(headers.get("x-ratelimit-reset-tokens")))
+        if str(headers.get("x-ratelimit-remaining-requests", "")).strip() in ("0", "0.0"):
+            hints.append(parse_duration(headers.get("x-ratelimit-reset-requests")))
+        hints = [h for h in hints if h is not None]
+        if hints:
+            return max(hints)
+        try:
+            m = re.search(r"try again in\s([\d\.]+m?s)", resp.text or "")
+            if m:
+                return parse_duration(m.group(1))
+        except Exception:
+            pass
+        return None
+
+    def backoff(self, attempt: int, resp=None) -> float:
+        """Delay before retry number `attempt` (0-based); a server hint is honoured up to `max_delay`."""
+        exp = min(self.max_delay, self.base_delay * (2 ** attempt))
+        delay = random.uniform(exp * (1 - self.jitter), exp)
+        hint = self.server_hint(resp)
+        if hint is not None:
+            # Honour the server, plus a little jitter so waiting threads do not stampede
+            delay = min(hint, self.max_delay) + random.uniform(0, self.base_delay * self.jitter)
+        return delay
+
+    def execute(self, send, breaker_key: str | None = None, deadline=None, on_retry=None):
+        """Call `send(timeout)` until it returns a non-error response or the policy gives up.
+
+        Args:
+            send: Callable taking a `(connect, read)` timeout tuple and returning a response
+            breaker_key: Circuit-breaker key (e.g. per API key or per upstream)
+            deadline: Overall deadline (seconds from now or a `Deadline`)
+            on_retry: Optional callback `(response_or_None, delay_s)` before each retry sleep
+
+        Returns:
+            The successful response
+
+        Raises:
+            requests.HTTPError, CircuitOpenError, DeadlineExceeded or the last connection error
+        """
+        deadline = Deadline.coerce(deadline)
+        breaker = self.breaker(breaker_key) if breaker_key else None
+        if breaker is not None:
+            breaker.before_call()
+
+        try:
+            for attempt in range(max(1, self.max_attempts)):
+                read_timeout = self.read_timeout
+                if deadline is not None:
+                    remaining = deadline.remaining()
+                    if remaining <= 0:
+                        raise DeadlineExceeded("Deadline exceeded before request could be sent")
+                    read_timeout = min(read_timeout, remaining)
+                timeout = (min(self.connect_timeout, read_timeout), read_timeout)
+
+                last_attempt = attempt >= self.max_attempts - 1
+                resp = None
+                try:
+                    resp = send(timeout)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    if breaker is not None:
+                        breaker.record_failure(f"{type(e).__name__}: {e}")
+                    if last_attempt:
+                        raise
+                    delay = self.backoff(attempt)
+                else:
+                    status = resp.status_code
+                    if status < 400:
+                        if breaker is not None:
+                            breaker.record_success()
+                        return resp
+                    if status in (401, 403):
+                        err = _http_error(resp)
+                        if breaker is not None:
+                            # A rejected key will not start working on its own: fail fast for a while
+                            breaker.trip(f"credentials rejected ({status})", self.negative_ttl)
+                        raise err
+                    if status not in self.retry_statuses:
+                        raise _http_error(resp)
+                    if status >= 500 and breaker is not None:
+                        breaker.record_failure(f"HTTP {status}")
+                    if last_attempt:
+                        raise _http_error(resp)
+                    hint = self.server_hint(resp)
+                    if hint is not None and hint > self.max_delay:
+                        # Sleeping for minutes or hours would hold a worker thread hostage
+                        raise _http_error(resp, f" (server asks to wait {hint:.0f}s, over the "
+                                                f"{self.max_delay:.0f}s retry limit)")
+                    delay = self.backoff(attempt, resp)
+
+                if deadline is not None and deadline.remaining() < delay:
+                    last = f"HTTP {resp.status_code}" if resp is not None else "connection error"
+                    raise DeadlineExceeded(f"Deadline too short to retry after {last} (needed {delay:.1f}s)")
+                if on_retry is not None:
+                    on_retry(resp, delay)
+                if resp is not None:
+                    resp.close()
+                time.sleep(delay)
+        finally:
+            if breaker is not None:
+                breaker.release_probe()
+        raise RuntimeError("Request failed after retries")
+
+
+# Shared policies: Groq chat completions and the job-board APIs
+GROQ_POLICY = RetryPolicy.from_env("GROQ")
+JOB_API_POLICY = RetryPolicy.from_env("JOB_API", max_attempts=2, read_timeout=30.0, max_delay=4.0)
@@ -0,0 +1,187 @@
+"""Semantic answer cache for resume Q&A.
+
+Users often ask the same thing in different words ("what are my weaknesses" /
+"what are the weak points"). The cache stores each answer under a scope (the
+resume hash, a fingerprint of the analysis and of any short chat history) with
+the embedding of the normalized question. A new question whose embedding is
+at least `threshold` cosine-similar to a cached one in the same scope gets the
+cached answer without an LLM call.
+
+Scopes are kept per resume with LRU eviction inside each resume and across
+resumes. A changed resume or analysis produces a new scope, so stale answers
+are never served; `invalidate(resume_hash)` drops them eagerly.
+
+Configuration from the environment:
+
+- LLM_SEMANTIC_CACHE_DISABLED: 1/true turns the cache off
+- LLM_SEMANTIC_CACHE_THRESHOLD: cosine similarity for a hit (default 0.9)
+- LLM_SEMANTIC_CACHE_SHORT_THRESHOLD: similarity for a hit on questions of four words or fewer (default 0.97)
+"""
+
+import os
+import re
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .text_utils import compute_hash
+
+_WORD_RE = re.compile(r"[a-z0-9+#]+")
+_FILLER = {"please", "can", "could", "you", "tell", "me", "hey", "hi", "the", "a", "an", "my", "of", "in", "on"}
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase words without punctuation or common filler ("can you tell me", "please")."""
+    words = _WORD_RE.findall((question or "").lower())
+    kept = [w for w in words if w not in _FILLER]
+    return " ".join(kept or words)
+
+
+def scope_key(resume_hash: str, analysis=None, history: list | None = None, kind: str = "") -> str:
+    """Cache scope: resume plus fingerprints of the analysis and of the chat history.
+
+    `kind` separates questions whose prompts differ (e.g. weakness vs strength insights), so
+    near-identical wordings of different questions never share an answer.
+    """
+    parts = [
+        resume_hash or "",
+        kind or "",
+        compute_hash(json.dumps(analysis, sort_keys=True, default=str)) if analysis else "",
+        compute_hash(json.dumps([[m.get("role"), m.get("content")] for m in history or []])) if history else "",
+    ]
+    return "|".join(parts)
+
+
+class SemanticCache:
+    """Embedding-keyed answer cache, LRU-bounded per resume and across resumes."""
+
+    def __init__(self, threshold: float = 0.9, max_entries: int = 64, max_resumes: int = 32,
+                 max_history: int = 2, short_threshold: float = 0.97, short_words: int = 4):
+        """
+        Args:
+            threshold: Minimum cosine similarity between question embeddings for a hit
+            short_threshold: Stricter similarity for short questions, where one word changes the meaning
+            short_words: Normalized questions with at most this many words count as short
+            max_entries: Answers kept per resume
+            max_resumes: Resumes kept before the least recently used one is dropped
+            max_history: Longest chat history (messages) that is still cacheable
+        """
+        self.threshold = threshold
+        self.short_threshold = max(threshold, short_threshold)
+        self.short_words = short_words
+        self.max_entries = max_entries
+        self.max_resumes = max_resumes
+        self.max_history = max_history
+        self._lock = threading.Lock()
+        # resume_hash -> OrderedDict[(scope, normalized question)] -> (unit vector, answer)
+        self._resumes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def cacheable(self, history: list | None) -> bool:
+        """Answers depending on a long conversation are not worth reusing."""
+        return len(history or []) <= self.max_history
+
+    @staticmethod
+    def _unit(vector) -> np.ndarray:
+        v = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(v))
+        return v / norm if norm else v
+
+    def get(self, resume_hash: str, scope: str, question: str, embed) -> tuple:
+        """Look up an answer.
+
+        Args:
+            resume_hash: Resume the question is about
+            scope: Key from `scope_key`
+            question: Raw question
+            embed: Callable mapping text to an embedding vector (e.g. FastEmbed's `embed_query`)
+
+        Returns:
+            (answer or None, unit vector of the question or None); pass the vector to `put`
+            so the question is embedded only once
+        """
+        norm = normalize_question(question)
+        with self._lock:
+            entries = self._resumes.get(resume_hash)
+            if entries is not None:
+                self._resumes.move_to_end(resume_hash)
+                exact = entries.get((scope, norm))
+                if exact is not None:
+                    entries.move_to_end((scope, norm))
+                    self.hits += 1
+                    return exact[1], exact[0]
+                candidates = [(key, vec) for key, (vec, _) in entries.items() if key[0] == scope]
+            else:
+                candidates = []
+
+        vector = self._unit(embed(norm))
+        if candidates:
+            sims = np.stack([vec for _, vec in candidates]) @ vector
+            best = int(np.argmax(sims))
+            threshold = self.short_threshold if len(norm.split()) <= self.short_words else self.threshold
+            if float(sims[best]) >= threshold:
+                key = candidates[best][0]
+                with self._lock:
+                    entries = self._resumes.get(resume_hash)
+                    hit = entries.get(key) if entries is not None else None
+                    if hit is not None:
+                        entries.move_to_end(key)
+                        self.hits += 1
+                        return hit[1], vector
+        with self._lock:
+            self.misses += 1
+        return None, vector
+
+    def put(self, resume_hash: str, scope: str, question: str, answer: str, vector) -> None:
+        """Store an answer; evicts the least recently used entries and resumes past the limits."""
+        if not answer or vector is None:
+            return
+        norm = normalize_question(question)
+        with self._lock:
+            entries = self._resumes.setdefault(resume_hash, OrderedDict())
+            self._resumes.move_to_end(resume_hash)
+            entries[(scope, norm)] = (self._unit(vector), answer)
+            entries.move_to_end((scope, norm))
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+            while len(self._resumes) > self.max_resumes:
+                self._resumes.popitem(last=False)
+
+    def invalidate(self, resume_hash: str | None = None) -> None:
+        """Drop cached answers for one resume, or all of them."""
+        with self._lock:
+            if resume_hash is None:
+                self._resumes.clear()
+            else:
+                self._resumes.pop(resume_hash, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "resumes": len(self._resumes),
+                "entries": sum(len(e) for e in self._resumes.values()),
+            }
+
+
+_SEMANTIC_CACHE = None
+_SEMANTIC_CACHE_LOCK = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache | None:
+    """Process-wide semantic cache, or None when disabled."""
+    global _SEMANTIC_CACHE
+    if (os.getenv("LLM_SEMANTIC_CACHE_DISABLED") or "").strip().lower() in ("1", "true", "yes"):
+        return None
+    if _SEMANTIC_CACHE is None:
+        with _SEMANTIC_CACHE_LOCK:
+            if _SEMANTIC_CACHE is None:
+                _SEMANTIC_CACHE = SemanticCache(
+                    threshold=float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD") or 0.9),
+                    short_threshold=float(os.getenv("LLM_SEMANTIC_CACHE_SHORT_THRESHOLD") or 0.97),
+                )
+    return _SEMANTIC_CACHE
@@ -0,0 +1,68 @@
+"""Single-flight coalescing of identical in-flight calls.
+
+When a call for a key is already running, later callers wait on the same
+future instead of starting their own. The result (or exception) fans out to
+every waiter. A follower waits at most until its own deadline; the leader's
+call keeps running for the others.
+"""
+
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+from .retry_policy import Deadline, DeadlineExceeded
+
+
+class SingleFlight:
+    """Deduplicate concurrent calls that share a key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn, deadline=None):
+        """Run `fn()` once per key at a time; concurrent callers share its outcome.
+
+        Args:
+            key: Coalescing key
+            fn: Zero-argument call made by the leader
+            deadline: Follower wait budget (Deadline or seconds); None waits for the leader
+
+        Raises:
+            DeadlineExceeded: A follower's deadline expired before the leader finished
+        """
+        deadline = Deadline.coerce(deadline)
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.leaders += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            timeout = None if deadline is None else max(0.0, deadline.remaining())
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeout:
+                raise DeadlineExceeded(f"Deadline exceeded waiting for in-flight call {key!r}") from None
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self) -> dict:
+        """In-flight keys and how many calls were coalesced."""
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self.leaders, "coalesced": self.coalesced}
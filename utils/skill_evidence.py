@@ -0,0 +1,88 @@
+"""Skills x resume-chunks similarity matrix for evidence retrieval.
+
+Scoring and weakness prompts need the few resume chunks most relevant to each
+skill. Asking a retriever once per skill embeds every skill separately and
+runs one index search each. `EvidenceMatrix` takes all skill embeddings (one
+batch) and all chunk embeddings at once, computes the full cosine matrix with
+one matrix multiply, and selects the top-k chunks of every row with
+`argpartition`, so 30 skills cost one multiply instead of 30 embed-and-search
+round trips.
+"""
+
+import numpy as np
+
+
+def unit_rows(vectors) -> np.ndarray:
+    """float32 copy of `vectors` with every row scaled to unit length (zero rows left as is)."""
+    matrix = np.asarray(vectors, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class EvidenceMatrix:
+    """Cosine similarity of every skill to every chunk, with per-skill top-k chunks."""
+
+    def __init__(self, skills: list, chunks: list, skill_vectors, chunk_vectors):
+        """
+        Args:
+            skills: Skill names, one per row of `skill_vectors`
+            chunks: Chunk texts, one per row of `chunk_vectors`
+            skill_vectors: Skill embeddings (len(skills) x d)
+            chunk_vectors: Chunk embeddings (len(chunks) x d)
+        """
+        self.skills = list(skills)
+        self.chunks = list(chunks)
+        self.skill_vectors = unit_rows(skill_vectors) if self.skills else np.zeros((0, 0), dtype=np.float32)
+        self.chunk_vectors = unit_rows(chunk_vectors) if self.chunks else np.zeros((0, 0), dtype=np.float32)
+        if self.skills and self.chunks:
+            self.similarity = self.skill_vectors @ self.chunk_vectors.T
+        else:
+            self.similarity = np.zeros((len(self.skills), len(self.chunks)), dtype=np.float32)
+        self._rows = {}
+        for i, skill in enumerate(self.skills):
+            self._rows.setdefault(skill, i)
+        self._top = {}
+
+    def top_indices(self, k: int = 3) -> np.ndarray:
+        """Chunk indices of the `k` best chunks per skill, best first (len(skills) x min(k, len(chunks)))."""
+        k = max(0, min(k, len(self.chunks)))
+        top = self._top.get(k)
+        if top is None:
+            if k == 0:
+                top = np.zeros((len(self.skills), 0), dtype=np.intp)
+            else:
+                # Unordered top-k per row in linear time, then sort only those k columns
+                part = np.argpartition(-self.similarity, k - 1, axis=1)[:, :k]
+                order = np.argsort(-np.take_along_axis(self.similarity, part, axis=1), axis=1)
+                top = np.take_along_axis(part, order, axis=1)
+            self._top[k] = top
+        return top
+
+    def top_k(self, skill: str, k: int = 3) -> list:
+        """(chunk text, similarity) of the `k` best chunks for `skill`, best first; [] for unknown skills."""
+        row = self._rows.get(skill)
+        if row is None:
+            return []
+        return [(self.chunks[j], float(self.similarity[row, j])) for j in self.top_indices(k)[row]]
+
+    def context(self, skill: str, k: int = 3) -> list:
+        """Texts of the `k` best chunks for `skill`."""
+        return [text for text, _ in self.top_k(skill, k)]
+
+    def pooled(self, skills: list | None = None, k: int = 3) -> list:
+        """Distinct top-k chunks of several skills, in skill order (shared context for packed prompts)."""
+        seen, out = set(), []
+        for skill in self.skills if skills is None else skills:
+            for text in self.context(skill, k):
+                if text not in seen:
+                    seen.add(text)
+                    out.append(text)
+        return out
+
+    def best_similarity(self) -> np.ndarray:
+        """Highest chunk similarity per skill (0 when there are no chunks)."""
+        if not self.chunks:
+            return np.zeros(len(self.skills), dtype=np.float32)
+        return self.similarity.max(axis=1)
@@ -0,0 +1,178 @@
+"""Compiled skill-term matcher for LLM-free (quick mode) skill extraction.
+
+The vocabulary is compiled once at import into a character trie, and the trie
+into a single regular expression (nested alternations, one branch per trie
+edge), so `scan()` is one pass of the C regex engine over the text however
+large the vocabulary grows. At each word start the longest term that ends on a
+word boundary wins: "go" no longer matches "good", "r" no longer matches "for"
+and "node.js" wins over "node". Matches come back in order of first
+occurrence, recorded during the same pass.
+
+Terms that are also ordinary English words or single letters ("C", "R", "Go",
+"REST") only match when written with a capital letter.
+"""
+
+import re
+from bisect import bisect_right
+
+SKILL_VOCABULARY = (
+    # Programming Languages
+    "python", "java", "javascript", "typescript", "c", "c++", "c#", "go", "golang", "rust", "kotlin", "swift",
+    "ruby", "php", "scala", "r", "matlab", "perl", "dart", "lua",
+    # Web/Frontend
+    "react", "next.js", "nextjs", "angular", "vue", "svelte", "html", "css", "html5", "css3", "sass", "scss", "less",
+    "tailwind", "bootstrap", "redux", "graphql", "webpack", "vite", "parcel", "gulp", "npm", "yarn", "pnpm",
+    # Backend/Frameworks
+    "node", "node.js", "express", "django", "flask", "fastapi", "spring", "spring boot", ".net", "dotnet", "asp.net",
+    "grpc", "rest", "restful", "microservices", "soap", "laravel", "rails", "ruby on rails",
+    # Databases
+    "sql", "mysql", "postgresql", "postgres", "mongodb", "redis", "elasticsearch", "cassandra", "dynamodb", "mariadb",
+    "oracle", "sqlite", "neo4j", "couchdb", "firestore",
+    # Message Queue/Streaming
+    "kafka", "rabbitmq", "activemq", "zeromq", "nats", "pulsar", "kinesis",
+    # Big Data/Analytics
+    "spark", "hadoop", "hive", "airflow", "databricks", "etl", "data warehouse", "snowflake", "bigquery", "redshift",
+    "presto", "flink",
+    # Machine Learning/AI
+    "machine learning", "deep learning", "ml", "dl", "nlp", "natural language processing", "computer vision", "cv",
+    "pandas", "numpy", "scikit-learn", "sklearn", "tensorflow", "pytorch", "keras", "transformers", "hugging face",
+    "bert", "gpt", "llm", "generative ai", "langchain", "llama", "rag",
+    # DevOps/Cloud
+    "docker", "kubernetes", "k8s", "terraform", "ansible", "puppet", "chef", "jenkins", "gitlab", "github actions",
+    "ci/cd", "cicd", "git", "github", "bitbucket", "linux", "unix", "bash", "shell", "aws", "azure", "gcp",
+    "google cloud", "cloud", "heroku", "vercel", "netlify", "cloudflare",
+    # AWS Services
+    "ec2", "s3", "lambda", "rds", "cloudformation", "ecs", "eks", "sqs", "sns", "cloudwatch", "iam", "vpc", "route53",
+    "api gateway",
+    # Azure Services
+    "azure functions", "azure sql", "blob storage", "cosmos db", "aks", "azure devops",
+    # GCP Services
+    "compute engine", "cloud storage", "cloud functions", "cloud run", "gke", "pub/sub",
+    # Mobile
+    "android", "ios", "react native", "flutter", "swiftui", "xamarin", "ionic",
+    # Testing/QA
+    "pytest", "unittest", "selenium", "cypress", "playwright", "junit", "jest", "mocha", "jasmine", "testng", "postman",
+    "jmeter", "loadrunner",
+    # Methodologies
+    "agile", "scrum", "kanban", "waterfall", "devops", "tdd", "test driven development", "bdd",
+    "behavior driven development",
+    # Soft Skills
+    "leadership", "communication", "teamwork", "problem solving", "analytical", "critical thinking",
+    "project management", "time management",
+    # Tools
+    "jira", "confluence", "slack", "trello", "asana", "figma", "sketch", "insomnia", "datadog", "new relic", "splunk",
+    "prometheus", "grafana", "tableau", "power bi", "excel", "jupyter", "vscode", "intellij", "eclipse", "vim",
+    # Security
+    "oauth", "jwt", "ssl", "tls", "encryption", "authentication", "authorization", "security", "cybersecurity",
+    "penetration testing", "owasp",
+    # Other Tech
+    "api", "json", "xml", "yaml", "websocket", "protobuf", "openapi", "swagger", "nginx", "apache", "tomcat", "iis",
+    "solr", "memcached",
+)
+
+# Terms that are also everyday words or letters: only matched when capitalized in the text
+CAPITALIZED_ONLY = frozenset({"c", "r", "go", "rest", "less", "cv", "ml", "dl", "chef", "puppet", "spark", "sketch"})
+
+# Display forms that plain capitalization gets wrong
+_UPPER_TERMS = frozenset({"sql", "aws", "gcp", "nlp", "cv", "ci/cd", "cicd", "c#", "c++"})
+
+_ACRONYM_RE = re.compile(r"\b([A-Z]{2,5})\b")
+_SPACE_RE = re.compile(r"\s+")
+
+_END = None  # trie key holding the term that ends at a node
+
+
+def _trie_pattern(node: dict) -> str:
+    """Regex for the terms below a trie node; a term ending here makes the rest optional (greedy = longest)."""
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items(), key=lambda kv: str(kv[0]))
+                if ch is not _END]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    return f"(?:{body})?" if _END in node else body
+
+
+class SkillMatcher:
+    """Word-boundary-aware longest-match scanner over a fixed term list."""
+
+    def __init__(self, terms, capitalized_only=frozenset()):
+        """
+        Args:
+            terms: Lowercase skill terms (single or multi-word)
+            capitalized_only: Terms that only count when their first letter is capitalized in the text
+        """
+        self.capitalized_only = frozenset(capitalized_only)
+        root = {}
+        self.terms = tuple(dict.fromkeys(t.strip().lower() for t in terms if t and t.strip()))
+        for term in self.terms:
+            node = root
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[_END] = term
+        # Word boundaries are letters/digits only, so "c++", ".net" and "ci/cd" still match inside punctuation
+        self._pattern = re.compile(r"(?<![^\W_])(?:" + (_trie_pattern(root) or "(?!)") + r")(?![^\W_])")
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def finditer(self, text: str):
+        """Yield (term, start, end) for every match, left to right.
+
+        Offsets refer to `text` with runs of whitespace collapsed to single spaces.
+        """
+        original = _SPACE_RE.sub(" ", text or "")
+        lowered = original.lower()
+        # Case checks need aligned offsets; a few non-ASCII characters change length when lowercased
+        cased = original if len(original) == len(lowered) else lowered
+        for m in self._pattern.finditer(lowered):
+            term, start, end = m.group(), m.start(), m.end()
+            if term in self.capitalized_only:
+                # "R&D" and "C-level" are not skills
+                if not cased[start].isupper() or (len(term) == 1 and cased[end:end + 1] in ("&", "-")):
+                    continue
+            yield term, start, end
+
+    def scan(self, text: str) -> list:
+        """(term, offset of first occurrence) pairs in order of appearance."""
+        seen = {}
+        for term, start, _ in self.finditer(text):
+            seen.setdefault(term, start)
+        return list(seen.items())
+
+
+def display_name(term: str) -> str:
+    """Readable form of a matched term ("machine learning" -> "Machine Learning", "aws" -> "AWS")."""
+    if term.isupper():
+        return term
+    if " " in term:
+        return " ".join(w.capitalize() for w in term.split())
+    if term in _UPPER_TERMS:
+        return term.upper()
+    return term.capitalize()
+
+
+SKILL_MATCHER = SkillMatcher(SKILL_VOCABULARY, CAPITALIZED_ONLY)
+
+
+def extract_skills(text: str, matcher: SkillMatcher | None = None) -> list:
+    """Vocabulary skills plus other capitalized acronyms (2-5 letters) in order of first appearance.
+
+    A skill keeps the casing it was written with ("PostgreSQL", "FastAPI") unless it was all lowercase.
+    """
+    matcher = matcher or SKILL_MATCHER
+    normalized = _SPACE_RE.sub(" ", text or "")
+    aligned = len(normalized) == len(normalized.lower())
+    found, starts, ends = {}, [], []
+    for term, start, end in matcher.finditer(normalized):
+        starts.append(start)
+        ends.append(end)
+        if term not in found:
+            surface = normalized[start:end] if aligned else term
+            found[term] = (start, surface if surface != surface.lower() else display_name(term))
+    for m in _ACRONYM_RE.finditer(normalized):
+        # Skip pieces of matched terms ("CI" in "CI/CD", "NET" in ".NET")
+        i = bisect_right(starts, m.start()) - 1
+        if i >= 0 and m.start() < ends[i]:
+            continue
+        found.setdefault(m.group(1).lower(), (m.start(), m.group(1)))
+    return [name for _, name in sorted(found.values())]
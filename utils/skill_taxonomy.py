@@ -0,0 +1,172 @@
+"""Skill taxonomy: canonical IDs, aliases and categories for free-form skill names.
+
+Skills reach the analyzer as free text from three places (the LLM extractor,
+the quick-mode matcher and the role presets), so "node" / "Node.js",
+"k8s" / "Kubernetes" and "sklearn" / "Scikit-learn" used to be scored,
+hashed and cached as different skills. The taxonomy maps every known spelling
+to one canonical skill with a single dict lookup:
+
+- the data file (utils/data/skill_taxonomy.json) is versioned; each entry has
+  an `id`, display `name`, `category` and `aliases`
+- aliases are exact synonyms only ("k8s" for Kubernetes); ordinary words
+  ("next", "shell") and neighbouring tools (Plotly vs Matplotlib) are not
+  aliases, since every alias is treated as the skill itself
+- names are keyed by `skill_key()`: lowercase letters, digits, "+" and "#"
+  only, so "Node.js", "nodejs" and "node js" share a key
+- unknown skills pass through unchanged, deduplicated by the same key
+- embeddings of the canonical names are computed once per taxonomy version
+  and embedding model, stored under SKILL_EMBEDDINGS_DIR, and loaded from
+  there afterwards
+
+Configuration from the environment:
+
+- SKILL_TAXONOMY_PATH: taxonomy file (default utils/data/skill_taxonomy.json)
+- SKILL_EMBEDDINGS_DIR: where embedding matrices are kept (default .cache/skills)
+"""
+
+import os
+import re
+import json
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from .text_utils import compute_hash
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "data", "skill_taxonomy.json")
+
+_KEY_DROP_RE = re.compile(r"[^a-z0-9+#]+")
+_PAREN_RE = re.compile(r"\s*\(.*\)\s*$")
+
+
+def skill_key(name: str) -> str:
+    """Spelling-insensitive lookup key ("Node.js" -> "nodejs", "CI/CD" -> "cicd", "C++" -> "c++")."""
+    return _KEY_DROP_RE.sub("", str(name or "").lower().replace("&", " and "))
+
+
+@dataclass(frozen=True)
+class Skill:
+    """One canonical skill; `index` is its row in the taxonomy's embedding matrix."""
+
+    id: str
+    name: str
+    category: str
+    aliases: tuple = ()
+    index: int = 0
+
+
+class SkillTaxonomy:
+    """Alias index over a versioned skill list."""
+
+    def __init__(self, entries: list, version: str = "0"):
+        """
+        Args:
+            entries: Dicts with id, name, category and optional aliases
+            version: Taxonomy version (part of the embedding cache key)
+
+        Raises:
+            ValueError: Two skills share an ID or a spelling
+        """
+        self.version = str(version)
+        skills, index = [], {}
+        for entry in entries:
+            skill = Skill(id=entry["id"], name=entry["name"], category=entry.get("category", "other"),
+                          aliases=tuple(entry.get("aliases") or ()), index=len(skills))
+            skills.append(skill)
+            for spelling in (skill.id, skill.name) + skill.aliases:
+                key = skill_key(spelling)
+                owner = index.setdefault(key, skill)
+                if key and owner is not skill:
+                    raise ValueError(f"Skill spelling {spelling!r} maps to both {owner.id!r} and {skill.id!r}")
+        if len({s.id for s in skills}) != len(skills):
+            raise ValueError("Duplicate skill IDs in taxonomy")
+        self.skills = tuple(skills)
+        self._index = index
+        self._lock = threading.Lock()
+        self._embeddings = {}
+
+    @classmethod
+    def load(cls, path: str | None = None) -> "SkillTaxonomy":
+        """Read a taxonomy file ({"version": ..., "skills": [...]})."""
+        with open(path or DEFAULT_TAXONOMY_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("skills") or [], version=data.get("version", "0"))
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def lookup(self, name: str) -> Skill | None:
+        """Canonical skill for any known spelling, else None.
+
+        "Natural Language Processing (NLP)" falls back to the text before the parentheses.
+        """
+        skill = self._index.get(skill_key(name))
+        if skill is None and "(" in str(name or ""):
+            skill = self._index.get(skill_key(_PAREN_RE.sub("", str(name))))
+        return skill
+
+    def skill_id(self, name: str) -> str:
+        """Canonical ID of a known skill, else the spelling key of `name`."""
+        skill = self.lookup(name)
+        return skill.id if skill else skill_key(name)
+
+    def canonical(self, name: str) -> str:
+        """Display name of the canonical skill, else `name` with whitespace tidied."""
+        skill = self.lookup(name)
+        return skill.name if skill else " ".join(str(name or "").split())
+
+    def normalize(self, names) -> list:
+        """Canonical display names, first occurrence kept, duplicates and blanks dropped."""
+        seen, out = set(), []
+        for name in names or []:
+            display = self.canonical(name)
+            key = self.skill_id(display)
+            if display and key and key not in seen:
+                seen.add(key)
+                out.append(display)
+        return out
+
+    def embeddings(self, embed_documents, model: str = "default") -> np.ndarray:
+        """Unit-normalized embedding of every canonical name, rows in `Skill.index` order.
+
+        Computed with `embed_documents` (list of texts -> list of vectors) the first time a
+        taxonomy version is used with `model`, then read back from SKILL_EMBEDDINGS_DIR.
+        """
+        with self._lock:
+            matrix = self._embeddings.get(model)
+            if matrix is not None:
+                return matrix
+            directory = os.getenv("SKILL_EMBEDDINGS_DIR") or ".cache/skills"
+            path = os.path.join(directory, f"{skill_key(self.version)}-{compute_hash(model)[:12]}.npy")
+            try:
+                matrix = np.load(path)
+                if matrix.shape[0] != len(self.skills):
+                    matrix = None
+            except (OSError, ValueError):
+                matrix = None
+            if matrix is None:
+                matrix = np.asarray(embed_documents([s.name for s in self.skills]), dtype=np.float32)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                matrix = matrix / np.where(norms == 0, 1.0, norms)
+                try:
+                    os.makedirs(directory, exist_ok=True)
+                    np.save(path, matrix)
+                except OSError:
+                    pass
+            self._embeddings[model] = matrix
+            return matrix
+
+
+_TAXONOMY = None
+_TAXONOMY_LOCK = threading.Lock()
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Process-wide taxonomy loaded from SKILL_TAXONOMY_PATH."""
+    global _TAXONOMY
+    if _TAXONOMY is None:
+        with _TAXONOMY_LOCK:
+            if _TAXONOMY is None:
+                _TAXONOMY = SkillTaxonomy.load(os.getenv("SKILL_TAXONOMY_PATH"))
+    return _TAXONOMY
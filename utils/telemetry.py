@@ -0,0 +1,247 @@
+"""Per-call LLM telemetry.
+
+Every chat call through `utils.llm_providers` records an `LLMCallEvent`
+(call site, model, tokens, time to first byte, latency, retries, rate-limit
+and dispatch queue waits, priority class, cache outcome) into an in-process
+ring buffer. Exporters receive each
+event as it is recorded:
+
+- `JsonlExporter`: appends events to a JSONL file (LLM_TELEMETRY_JSONL)
+- `PrometheusExporter`: cumulative counters plus latency quantiles in the
+  Prometheus text format via `render()`
+
+`aggregate()` returns p50/p95 latency and token totals per call site. The call
+site is taken from `call_site(...)` when set, otherwise from the first caller
+frame outside the LLM plumbing (e.g. `semantic_skill_analysis`).
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import contextvars
+from collections import deque, defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+
+_CALL_SITE = contextvars.ContextVar("llm_call_site", default=None)
+
+# Frames skipped when inferring the call site
+_PLUMBING_MODULES = ("utils", "asyncio", "concurrent", "threading", "contextlib", "streamlit")
+_PLUMBING_FUNCS = ("llm_chat", "llm_chat_many", "llm_chat_variants", "_llm_chat", "_one", "_each",
+                   "<lambda>", "<genexpr>", "<listcomp>")
+
+
+@dataclass
+class LLMCallEvent:
+    """One LLM call as seen by the transport."""
+
+    call_site: str
+    model: str
+    stream: bool = False
+    cache: str = "miss"              # hit | miss | bypass | coalesced | replay | batch
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    ttfb_s: float = 0.0
+    latency_s: float = 0.0
+    retries: int = 0
+    rate_limit_wait_s: float = 0.0
+    priority: str = "standard"       # dispatch class (see `utils.dispatcher`)
+    queue_wait_s: float = 0.0        # time waiting for a dispatch slot
+    max_tokens: int = 0              # cap actually sent (see `utils.output_sizing`)
+    finish_reason: str | None = None
+    continuations: int = 0
+    ok: bool = True
+    error: str | None = None
+    ts: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@contextmanager
+def call_site(name: str):
+    """Label LLM calls made inside this block (propagates to asyncio.to_thread workers)."""
+    token = _CALL_SITE.set(name)
+    try:
+        yield
+    finally:
+        _CALL_SITE.reset(token)
+
+
+def resolve_call_site() -> str:
+    """Explicit call site if set, else the first non-plumbing caller's function name."""
+    site = _CALL_SITE.get()
+    if site:
+        return site
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = (frame.f_globals.get("__name__") or "").split(".")[0]
+        name = frame.f_code.co_name
+        if module not in _PLUMBING_MODULES and name not in _PLUMBING_FUNCS:
+            return name
+        frame = frame.f_back
+    return "unknown"
+
+
+def _quantile(sorted_values: list, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class JsonlExporter:
+    """Append each event as one JSON line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, event: LLMCallEvent) -> None:
+        line = json.dumps(event.to_dict(), ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class PrometheusExporter:
+    """Cumulative counters per call site/model, rendered in the Prometheus text format."""
+
+    def __init__(self, telemetry: "Telemetry | None" = None):
+        self.telemetry = telemetry
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+
+    def export(self, event: LLMCallEvent) -> None:
+        labels = (event.call_site, event.model)
+        with self._lock:
+            self._counters[("llm_calls_total", labels + (event.cache, "ok" if event.ok else "error"))] += 1
+            self._counters[("llm_prompt_tokens_total", labels)] += event.prompt_tokens
+            self._counters[("llm_completion_tokens_total", labels)] += event.completion_tokens
+            self._counters[("llm_retries_total", labels)] += event.retries
+            self._counters[("llm_rate_limit_wait_seconds_total", labels)] += event.rate_limit_wait_s
+            self._counters[("llm_queue_wait_seconds_total", labels)] += event.queue_wait_s
+            self._counters[("llm_latency_seconds_sum", labels)] += event.latency_s
+
+    def render(self) -> str:
+        """Prometheus exposition text."""
+        lines = []
+        with self._lock:
+            items = sorted(self._counters.items())
+        seen = set()
+        for (metric, labels), value in items:
+            if metric not in seen:
+                seen.add(metric)
+                lines.append(f"# TYPE {metric} counter")
+            names = ("call_site", "model", "cache", "status")[:len(labels)]
+            label_text = ",".join(f'{n}="{v}"' for n, v in zip(names, labels))
+            lines.append(f"{metric}{{{label_text}}} {value:g}")
+        if self.telemetry is not None:
+            lines.append("# TYPE llm_latency_seconds summary")
+            for site, agg in sorted(self.telemetry.aggregate().items()):
+                for q, key in ((0.5, "p50_latency_s"), (0.95, "p95_latency_s")):
+                    lines.append(f'llm_latency_seconds{{call_site="{site}",quantile="{q}"}} {agg[key]:g}')
+        return "\n".join(lines) + "\n"
+
+
+class Telemetry:
+    """Ring buffer of recent LLM call events with pluggable exporters."""
+
+    def __init__(self, capacity: int = 2000, exporters: list | None = None):
+        self._events = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.exporters = list(exporters or [])
+
+    def add_exporter(self, exporter) -> None:
+        """Register an object with an `export(event)` method."""
+        self.exporters.append(exporter)
+
+    def record(self, event: LLMCallEvent) -> None:
+        with self._lock:
+            self._events.append(event)
+        for exporter in list(self.exporters):
+            try:
+                exporter.export(event)
+            except Exception as e:
+                # Telemetry must never break an LLM call
+                print(f"Telemetry exporter {type(exporter).__name__} failed: {e}")
+
+    def events(self, call_site: str | None = None) -> list:
+        with self._lock:
+            events = list(self._events)
+        return [e for e in events if call_site is None or e.call_site == call_site]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+    def aggregate(self) -> dict:
+        """Per call site: count, errors, p50/p95 latency and TTFB, tokens, retries and cache hit rate."""
+        groups = defaultdict(list)
+        for e in self.events():
+            groups[e.call_site].append(e)
+        out = {}
+        for site, events in groups.items():
+            latencies = sorted(e.latency_s for e in events)
+            ttfbs = sorted(e.ttfb_s for e in events if e.cache in ("miss", "bypass"))
+            out[site] = {
+                "calls": len(events),
+                "errors": sum(1 for e in events if not e.ok),
+                "p50_latency_s": round(_quantile(latencies, 0.5), 4),
+                "p95_latency_s": round(_quantile(latencies, 0.95), 4),
+                "p50_ttfb_s": round(_quantile(ttfbs, 0.5), 4),
+                "p95_ttfb_s": round(_quantile(ttfbs, 0.95), 4),
+                "prompt_tokens": sum(e.prompt_tokens for e in events),
+                "completion_tokens": sum(e.completion_tokens for e in events),
+                "avg_prompt_tokens": round(sum(e.prompt_tokens for e in events) / len(events), 1),
+                "retries": sum(e.retries for e in events),
+                "rate_limit_wait_s": round(sum(e.rate_limit_wait_s for e in events), 3),
+                "queue_wait_s": round(sum(e.queue_wait_s for e in events), 3),
+                "avg_max_tokens": round(sum(e.max_tokens for e in events) / len(events), 1),
+                "continuations": sum(e.continuations for e in events),
+                "cache_hit_rate": round(sum(1 for e in events if e.cache in ("hit", "coalesced")) / len(events), 3),
+            }
+        return out
+
+
+_TELEMETRY = None
+_TELEMETRY_LOCK = threading.Lock()
+
+
+def get_telemetry() -> Telemetry:
+    """Process-wide telemetry, with a JSONL exporter when LLM_TELEMETRY_JSONL is set."""
+    global _TELEMETRY
+    if _TELEMETRY is None:
+        with _TELEMETRY_LOCK:
+            if _TELEMETRY is None:
+                telemetry = Telemetry(capacity=int(os.getenv("LLM_TELEMETRY_BUFFER") or 2000))
+                path = os.getenv("LLM_TELEMETRY_JSONL")
+                if path:
+                    telemetry.add_exporter(JsonlExporter(path))
+                _TELEMETRY = telemetry
+    return _TELEMETRY
+
+
+@contextmanager
+def track_llm_call(model: str, stream: bool = False, site: str | None = None):
+    """Time one LLM call and record its event on exit; the block fills in the details."""
+    event = LLMCallEvent(call_site=site or resolve_call_site(), model=model, stream=stream)
+    start = time.perf_counter()
+    try:
+        yield event
+    except GeneratorExit:
+        event.ok, event.error = False, "cancelled"
+        raise
+    except BaseException as e:
+        event.ok, event.error = False, f"{type(e).__name__}: {e}"[:300]
+        raise
+    finally:
+        event.latency_s = time.perf_counter() - start
+        if not event.ttfb_s:
+            event.ttfb_s = event.latency_s
+        get_telemetry().record(event)